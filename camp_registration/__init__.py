@@ -1,5 +1,27 @@
 """Camp registration package."""
 
-from .registry import CampRegistry, Camper
+__all__ = ["CampRegistry", "Camper", "DuplicateCamperError", "JournalStorage"]
 
-__all__ = ["CampRegistry", "Camper"]
+# Resolved on first access so that importing a submodule such as
+# camp_registration.cli does not load the registry.
+_EXPORTS = {
+    "CampRegistry": "registry",
+    "Camper": "registry",
+    "DuplicateCamperError": "registry",
+    "JournalStorage": "storage",
+}
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__)
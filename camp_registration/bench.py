@@ -0,0 +1,556 @@
+from __future__ import annotations
+
+import argparse
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+import functools
+import gc
+import http.server
+import json
+import os
+from pathlib import Path
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from typing import Callable, Iterable, Iterator
+
+from camp_registration.registry import CampRegistry, Camper, DEFAULT_SESSIONS
+
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+
+@dataclass(frozen=True)
+class _DictCamper:
+    # Camper as it was before it gained __slots__, kept for comparison.
+    name: str
+    age: int
+    session: str
+
+
+def synthetic_campers(count: int) -> Iterator[Camper]:
+    sessions = DEFAULT_SESSIONS
+    for index in range(count):
+        yield Camper(f"Camper {index:07d}", 7 + index % 11, sessions[index % len(sessions)])
+
+
+def _peak_bytes(operation: Callable[[], object]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        operation()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _timed(operation: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    operation()
+    return time.perf_counter() - started
+
+
+def _allocated_bytes(build: Callable[[], object]) -> tuple[int, object]:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return after - before, result
+
+
+@contextmanager
+def local_site(pages: dict[str, str]) -> Iterator[str]:
+    # Serves the given pages from a temporary directory on localhost.
+    with tempfile.TemporaryDirectory() as directory:
+        for name, html in pages.items():
+            (Path(directory) / name).write_text(html, encoding="utf-8")
+
+        class QuietHandler(http.server.SimpleHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+        server = http.server.ThreadingHTTPServer(
+            ("127.0.0.1", 0), functools.partial(QuietHandler, directory=directory)
+        )
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield f"http://127.0.0.1:{server.server_address[1]}"
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+FORM_PAGE = """<!doctype html>
+<form action="/thanks.html" method="get">
+  <input id="name" name="name">
+  <select id="session" name="session">
+    <option value="archery">Archery</option>
+    <option value="hiking">Hiking</option>
+  </select>
+  <button type="submit">Register</button>
+</form>
+"""
+THANKS_PAGE = '<p class="confirmation">Thanks!</p>'
+
+
+def memory_per_camper(args: argparse.Namespace) -> dict[str, object]:
+    from camp_registration.columnar import ColumnarCampers
+
+    count = args.count
+
+    def build_dict_list() -> list[_DictCamper]:
+        return [
+            _DictCamper(camper.name, camper.age, camper.session)
+            for camper in synthetic_campers(count)
+        ]
+
+    def build_list() -> list[Camper]:
+        return list(synthetic_campers(count))
+
+    def build_columnar() -> ColumnarCampers:
+        return ColumnarCampers(synthetic_campers(count))
+
+    dict_bytes, roster = _allocated_bytes(build_dict_list)
+    del roster
+    list_bytes, roster = _allocated_bytes(build_list)
+    del roster
+    columnar_bytes, roster = _allocated_bytes(build_columnar)
+    del roster
+    return {
+        "benchmark": "memory_per_camper",
+        "count": count,
+        "dataclass_bytes_per_camper": round(dict_bytes / count, 1),
+        "slots_bytes_per_camper": round(list_bytes / count, 1),
+        "columnar_bytes_per_camper": round(columnar_bytes / count, 1),
+    }
+
+
+def register_throughput(args: argparse.Namespace) -> dict[str, object]:
+    # One register_camper call per camper on an in-memory registry, so the
+    # numbers cover validation, duplicate checks and indexing but not fsync.
+    runs = []
+    for size in args.sizes:
+        registry = CampRegistry()
+        campers = list(synthetic_campers(size))
+        gc.collect()
+
+        def register_all() -> None:
+            for camper in campers:
+                registry.register_camper(camper.name, camper.age, camper.session)
+
+        seconds = _timed(register_all)
+        runs.append(
+            {
+                "campers": size,
+                "seconds": round(seconds, 3),
+                "campers_per_second": round(size / seconds),
+            }
+        )
+    return {"benchmark": "register_throughput", "runs": runs}
+
+
+def json_io(args: argparse.Namespace) -> dict[str, object]:
+    # Times export_json and load_from_json, then repeats each under
+    # tracemalloc for its peak allocation (tracing would skew the timings).
+    runs = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "campers.json"
+        for size in args.sizes:
+            registry = CampRegistry()
+            registry.seed(synthetic_campers(size))
+            export_seconds = _timed(lambda: registry.export_json(path))
+            loaded = CampRegistry()
+            load_seconds = _timed(lambda: loaded.load_from_json(path))
+            assert len(loaded.campers) == size
+            runs.append(
+                {
+                    "campers": size,
+                    "file_bytes": path.stat().st_size,
+                    "export_seconds": round(export_seconds, 3),
+                    "load_seconds": round(load_seconds, 3),
+                    "export_peak_bytes": _peak_bytes(lambda: registry.export_json(path)),
+                    "load_peak_bytes": _peak_bytes(
+                        lambda: CampRegistry().load_from_json(path)
+                    ),
+                }
+            )
+            del registry, loaded
+    return {"benchmark": "json_io", "runs": runs}
+
+
+def snapshot_load(args: argparse.Namespace) -> dict[str, object]:
+    # The same roster loaded from JSON and from a binary snapshot, plus how
+    # long opening the snapshot and reading its first camper takes.
+    from camp_registration.snapshot import open_snapshot
+
+    runs = []
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = Path(directory) / "campers.json"
+        snapshot_path = Path(directory) / "campers.snapshot"
+        for size in args.sizes:
+            registry = CampRegistry()
+            registry.seed(synthetic_campers(size))
+            registry.export_json(json_path)
+            registry.save_snapshot(snapshot_path)
+            del registry
+
+            json_seconds = _timed(lambda: CampRegistry().load_from_json(json_path))
+            snapshot_seconds = _timed(
+                lambda: CampRegistry().load_snapshot(snapshot_path)
+            )
+
+            def first_camper() -> None:
+                with open_snapshot(snapshot_path) as snapshot:
+                    snapshot[0]
+
+            runs.append(
+                {
+                    "campers": size,
+                    "json_bytes": json_path.stat().st_size,
+                    "snapshot_bytes": snapshot_path.stat().st_size,
+                    "json_load_seconds": round(json_seconds, 3),
+                    "snapshot_load_seconds": round(snapshot_seconds, 3),
+                    "first_camper_ms": round(_timed(first_camper) * 1000, 3),
+                }
+            )
+    return {"benchmark": "snapshot_load", "runs": runs}
+
+
+def cabin_assignment(args: argparse.Namespace) -> dict[str, object]:
+    # Splits each session into cabins of ten with a two-year age spread, with
+    # one keep-together pair per hundred campers.
+    from camp_registration.cabins import Cabin, CabinPlan, assign_cabins
+
+    runs = []
+    for size in args.sizes:
+        campers = list(synthetic_campers(size))
+        per_session = size // len(DEFAULT_SESSIONS) + 1
+        cabins = [
+            Cabin(f"{session} {index}", session, 10)
+            for session in DEFAULT_SESSIONS
+            for index in range(per_session // 10 + 1)
+        ]
+        # Same session and age: synthetic campers repeat both every 55.
+        together = [
+            [campers[index].name, campers[index + 55].name]
+            for index in range(0, size - 55, 100)
+        ]
+        plan = CabinPlan(cabins, max_age_spread=2, together=together)
+        gc.collect()
+        started = time.perf_counter()
+        assignment = assign_cabins(campers, plan)
+        seconds = time.perf_counter() - started
+        runs.append(
+            {
+                "campers": size,
+                "cabins": len(cabins),
+                "seconds": round(seconds, 3),
+                "unassigned": len(assignment.unassigned),
+            }
+        )
+    return {"benchmark": "cabin_assignment", "runs": runs}
+
+
+def cli_startup(args: argparse.Namespace) -> dict[str, object]:
+    # Wall time of a fresh `camp-registration list` process on an empty
+    # journal, run in-process and through a daemon, next to a bare
+    # interpreter start for reference.
+    with tempfile.TemporaryDirectory() as directory:
+        data = Path(directory) / "campers.journal"
+        env = dict(os.environ, PYTHONPATH=str(Path(__file__).resolve().parents[1]))
+        cli = [sys.executable, "-m", "camp_registration.cli", "--data", str(data)]
+        timings = {
+            **_startup_timings("interpreter", [sys.executable, "-c", "pass"], env, args.runs),
+            **_startup_timings("cli_list", [*cli, "list"], env, args.runs),
+        }
+        daemon = subprocess.Popen(
+            [*cli, "daemon"], env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+        try:
+            daemon.stdout.readline()  # "Serving ..." once the socket is bound
+            timings.update(
+                _startup_timings("cli_list_daemon", [*cli, "list"], env, args.runs)
+            )
+        finally:
+            daemon.terminate()
+            daemon.wait()
+    return {"benchmark": "cli_startup", "runs": args.runs, **timings}
+
+
+def _startup_timings(
+    label: str, command: list[str], env: dict[str, str], runs: int
+) -> dict[str, float]:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(command, check=True, env=env, stdout=subprocess.DEVNULL)
+        samples.append((time.perf_counter() - started) * 1000)
+    return {
+        f"{label}_median_ms": round(statistics.median(samples), 1),
+        f"{label}_min_ms": round(min(samples), 1),
+    }
+
+
+def form_submission_latency(args: argparse.Namespace) -> dict[str, object]:
+    # Per-submission latency of a full fill-and-submit against a local form
+    # (needs Playwright).
+    from camp_registration.web_form import FormConfig, FormField, SelectField, run_batch
+
+    pages = {"form.html": FORM_PAGE, "thanks.html": THANKS_PAGE}
+    with local_site(pages) as base_url:
+        config = FormConfig(
+            url=f"{base_url}/form.html",
+            fields=[FormField(selector="#name", value="Alex")],
+            selects=[SelectField(selector="#session", value="hiking")],
+            submit_selector="button[type='submit']",
+            success_selector=".confirmation",
+        )
+        results = run_batch([config] * args.submissions, concurrency=1)
+    failed = [result.error for result in results if not result.ok]
+    if failed:
+        raise RuntimeError(f"submission failed: {failed[0]}")
+    elapsed = sorted(result.elapsed_ms for result in results)
+    return {
+        "benchmark": "form_submission_latency",
+        "submissions": len(elapsed),
+        "median_ms": statistics.median(elapsed),
+        "p95_ms": elapsed[min(len(elapsed) - 1, round(0.95 * (len(elapsed) - 1)))],
+        "max_ms": elapsed[-1],
+    }
+
+
+def _median_elapsed(variants: dict, submissions: int) -> dict[str, float]:
+    from camp_registration.web_form import run_batch
+
+    timings = {}
+    for label, config in variants.items():
+        results = run_batch([config] * submissions, concurrency=1)
+        failed = [result.error for result in results if not result.ok]
+        if failed:
+            raise RuntimeError(f"{label} submission failed: {failed[0]}")
+        timings[label] = statistics.median(result.elapsed_ms for result in results)
+    return timings
+
+
+def form_wait_timing(args: argparse.Namespace) -> dict[str, object]:
+    # Compares a config that sleeps a fixed wait_after_submit_ms with one that
+    # waits for the confirmation element, against a local form (needs Playwright).
+    from camp_registration.web_form import FormConfig, FormField, SelectField
+
+    pages = {"form.html": FORM_PAGE, "thanks.html": THANKS_PAGE}
+    with local_site(pages) as base_url:
+        fixed = FormConfig(
+            url=f"{base_url}/form.html",
+            fields=[FormField(selector="#name", value="Alex")],
+            selects=[SelectField(selector="#session", value="hiking")],
+            submit_selector="button[type='submit']",
+            wait_after_submit_ms=args.wait_ms,
+        )
+        event_driven = replace(fixed, success_selector=".confirmation")
+
+        timings = _median_elapsed(
+            {"fixed_sleep": fixed, "event_driven": event_driven}, args.submissions
+        )
+
+    return {
+        "benchmark": "form_wait_timing",
+        "submissions": args.submissions,
+        "wait_after_submit_ms": args.wait_ms,
+        "fixed_sleep_median_ms": timings["fixed_sleep"],
+        "event_driven_median_ms": timings["event_driven"],
+    }
+
+
+def large_form(fields: int) -> str:
+    # A form with `fields` text inputs plus a checkbox and a select per ten.
+    rows = []
+    for index in range(fields):
+        rows.append(f'  <input id="field-{index}" name="field-{index}">')
+        if index % 10 == 0:
+            rows.append(f'  <input id="check-{index}" name="check-{index}" type="checkbox">')
+            rows.append(
+                f'  <select id="select-{index}" name="select-{index}">'
+                '<option value="a">A</option><option value="b">B</option></select>'
+            )
+    body = "\n".join(rows)
+    return (
+        f'<!doctype html>\n<form action="/thanks.html" method="get">\n{body}\n'
+        '  <button type="submit">Register</button>\n</form>\n'
+    )
+
+
+def form_fill_timing(args: argparse.Namespace) -> dict[str, object]:
+    # Compares one page call per element with a single fast-fill script on a
+    # large local form (needs Playwright).
+    from camp_registration.web_form import (
+        CheckboxField,
+        FormConfig,
+        FormField,
+        SelectField,
+    )
+
+    pages = {"form.html": large_form(args.fields), "thanks.html": THANKS_PAGE}
+    with local_site(pages) as base_url:
+        per_element = FormConfig(
+            url=f"{base_url}/form.html",
+            fields=[
+                FormField(selector=f"#field-{index}", value=f"value {index}")
+                for index in range(args.fields)
+            ],
+            checkboxes=[
+                CheckboxField(selector=f"#check-{index}") for index in range(0, args.fields, 10)
+            ],
+            selects=[
+                SelectField(selector=f"#select-{index}", value="b")
+                for index in range(0, args.fields, 10)
+            ],
+            submit_selector="button[type='submit']",
+            success_selector=".confirmation",
+        )
+        fast = replace(per_element, fast_fill=True)
+
+        timings = _median_elapsed(
+            {"per_element": per_element, "fast_fill": fast}, args.submissions
+        )
+
+    return {
+        "benchmark": "form_fill_timing",
+        "fields": args.fields,
+        "submissions": args.submissions,
+        "per_element_median_ms": timings["per_element"],
+        "fast_fill_median_ms": timings["fast_fill"],
+    }
+
+
+BENCHMARKS: dict[str, Callable[[argparse.Namespace], dict[str, object]]] = {
+    "register": register_throughput,
+    "io": json_io,
+    "snapshot": snapshot_load,
+    "memory": memory_per_camper,
+    "assign": cabin_assignment,
+    "startup": cli_startup,
+    "submission": form_submission_latency,
+    "waits": form_wait_timing,
+    "fill": form_fill_timing,
+}
+
+
+def run(names: Iterable[str], args: argparse.Namespace) -> list[dict[str, object]]:
+    results = []
+    for name in names:
+        try:
+            results.append(BENCHMARKS[name](args))
+        except ImportError as exc:
+            # Browser benchmarks need Playwright; report them instead of
+            # failing the whole suite.
+            results.append({"benchmark": name, "skipped": str(exc)})
+    return results
+
+
+def report(names: Iterable[str], args: argparse.Namespace) -> dict[str, object]:
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        package_version = version("camp-registration")
+    except PackageNotFoundError:
+        package_version = None
+    return {
+        "version": package_version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "results": run(names, args),
+    }
+
+
+def _sizes(value: str) -> list[int]:
+    try:
+        sizes = [int(size) for size in value.split(",") if size.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError("sizes must be comma-separated integers") from None
+    if not sizes or min(sizes) <= 0:
+        raise argparse.ArgumentTypeError("sizes must be positive")
+    return sizes
+
+
+def _benchmark_name(value: str) -> str:
+    # A type check rather than choices=, which argparse applies to the empty
+    # default list of a nargs="*" positional and rejects.
+    if value not in BENCHMARKS:
+        raise argparse.ArgumentTypeError(
+            f"unknown benchmark {value!r} (choose from {', '.join(BENCHMARKS)})"
+        )
+    return value
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "benchmarks",
+        nargs="*",
+        type=_benchmark_name,
+        default=list(BENCHMARKS),
+        help=f"Benchmarks to run: {', '.join(BENCHMARKS)} (default: all)",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=_sizes,
+        default=list(DEFAULT_SIZES),
+        help="Comma-separated roster sizes for register, io, snapshot and assign "
+        "(default: 10000,100000,1000000)",
+    )
+    parser.add_argument(
+        "--count", type=int, default=1_000_000, help="Roster size for memory"
+    )
+    parser.add_argument(
+        "--runs", type=int, default=10, help="Process starts for startup"
+    )
+    parser.add_argument(
+        "--submissions", type=int, default=5, help="Form submissions per variant"
+    )
+    parser.add_argument(
+        "--wait-ms",
+        type=int,
+        default=2000,
+        help="wait_after_submit_ms for the fixed-sleep variant",
+    )
+    parser.add_argument(
+        "--fields", type=int, default=200, help="Text inputs on the fill benchmark form"
+    )
+    parser.add_argument(
+        "--output", type=Path, help="Also write the JSON report to this file"
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Run camp registration benchmarks and print JSON results."
+    )
+    add_arguments(parser)
+    return parser
+
+
+def run_from_args(args: argparse.Namespace) -> int:
+    payload = json.dumps(report(args.benchmarks, args), indent=2)
+    print(payload)
+    if args.output is not None:
+        args.output.write_text(payload + "\n", encoding="utf-8")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    return run_from_args(build_parser().parse_args(argv))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
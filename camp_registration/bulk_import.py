@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from camp_registration.duplicates import DuplicateIndex
+from camp_registration.registry import (
+    CampRegistry,
+    Camper,
+    name_key,
+    possible_duplicate,
+    validate_camper,
+)
+
+
+REQUIRED_COLUMNS = ("name", "age", "session")
+
+
+@dataclass(frozen=True)
+class RejectedRow:
+    row: int
+    reason: str
+    name: str
+    age: str
+    session: str
+
+
+@dataclass
+class ImportResult:
+    imported: int = 0
+    rejects: list[RejectedRow] = field(default_factory=list)
+
+
+def iter_csv_rows(path: Path | str) -> Iterator[tuple[int, dict[str, str]]]:
+    with Path(path).open(newline="", encoding="utf-8-sig") as fp:
+        reader = csv.DictReader(fp)
+        columns = {
+            (column or "").strip().lower(): column for column in reader.fieldnames or []
+        }
+        missing = [column for column in REQUIRED_COLUMNS if column not in columns]
+        if missing:
+            raise ValueError(f"{path}: missing column(s): {', '.join(missing)}")
+        # Row numbers match what a spreadsheet shows, with the header on row 1.
+        for row_number, row in enumerate(reader, start=2):
+            yield row_number, {
+                column: (row.get(columns[column]) or "") for column in REQUIRED_COLUMNS
+            }
+
+
+def validate_rows(
+    rows: Iterable[tuple[int, dict[str, str]]], registry, allow_similar: bool = False
+) -> tuple[list[tuple[int, dict[str, str], Camper]], list[RejectedRow]]:
+    # Accepted rows come back as (row number, row, camper).
+    accepted: list[tuple[int, dict[str, str], Camper]] = []
+    rejects: list[RejectedRow] = []
+    seen: set[tuple[str, str]] = set()
+    allowed_sessions = frozenset(registry.allowed_sessions)
+    # Rows are checked for similar names, against the registry and each other,
+    # only when the registry itself checks registrations.
+    registered = None if allow_similar else getattr(registry, "duplicates", None)
+    similar = (
+        None
+        if registered is None
+        else DuplicateIndex(registered.threshold, registered.max_age_gap)
+    )
+
+    for row_number, row in rows:
+        try:
+            try:
+                age = int(row["age"].strip())
+            except ValueError:
+                raise ValueError("Camper age must be a whole number.") from None
+            camper = validate_camper(row["name"], age, row["session"], allowed_sessions)
+            key = (name_key(camper.name), camper.session)
+            if key in seen or registry.is_registered(camper.name, camper.session):
+                raise ValueError(
+                    f"Camper '{camper.name}' is already registered for {camper.session}."
+                )
+            if similar is not None:
+                matches = registered.matches(camper) or similar.matches(camper)
+                if matches:
+                    raise possible_duplicate(camper, matches[0].other)
+        except ValueError as exc:
+            rejects.append(_rejected(row_number, row, exc))
+            continue
+        seen.add(key)
+        if similar is not None:
+            similar.add(camper)
+        accepted.append((row_number, row, camper))
+
+    return accepted, rejects
+
+
+def import_csv(
+    registry, path: Path | str, allow_similar: bool = False
+) -> ImportResult:
+    accepted, rejects = validate_rows(iter_csv_rows(path), registry, allow_similar)
+    # One register_many call means one journal append (and one fsync) or one
+    # SQLite transaction for the whole file. It checks every camper again as
+    # it stores them, so one another writer registered since validation is
+    # rejected rather than stored twice.
+    # The SQLite registry only checks exact duplicates.
+    options = {}
+    if allow_similar and isinstance(registry, CampRegistry):
+        options["allow_similar"] = True
+    results = registry.register_many(
+        ((camper.name, camper.age, camper.session) for _, _, camper in accepted),
+        **options,
+    )
+    imported = 0
+    for (row_number, row, _), result in zip(accepted, results):
+        if isinstance(result, ValueError):
+            rejects.append(_rejected(row_number, row, result))
+        else:
+            imported += 1
+    rejects.sort(key=lambda reject: reject.row)
+    return ImportResult(imported=imported, rejects=rejects)
+
+
+def _rejected(row_number: int, row: dict[str, str], error: ValueError) -> RejectedRow:
+    return RejectedRow(row_number, str(error), row["name"], row["age"], row["session"])
+
+
+def write_rejects(path: Path | str, rejects: Iterable[RejectedRow]) -> None:
+    with Path(path).open("w", newline="", encoding="utf-8") as fp:
+        writer = csv.writer(fp)
+        writer.writerow(("row", "reason", "name", "age", "session"))
+        for reject in rejects:
+            writer.writerow(
+                (reject.row, reject.reason, reject.name, reject.age, reject.session)
+            )
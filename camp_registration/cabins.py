@@ -0,0 +1,340 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from itertools import chain
+import json
+import math
+from pathlib import Path
+from typing import Any, Iterable
+
+from camp_registration.registry import Camper, name_key
+
+
+@dataclass(frozen=True)
+class Cabin:
+    name: str
+    session: str
+    capacity: int
+
+
+@dataclass
+class CabinPlan:
+    cabins: list[Cabin]
+    # Oldest minus youngest camper allowed in one cabin; None for no limit.
+    max_age_spread: int | None = None
+    # Campers who must share a cabin, by name. A group only binds campers
+    # enrolled in the same session.
+    together: list[list[str]] = field(default_factory=list)
+
+
+@dataclass
+class CabinRoster:
+    cabin: Cabin
+    campers: list[Camper] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "cabin": self.cabin.name,
+            "session": self.cabin.session,
+            "capacity": self.cabin.capacity,
+            "campers": [camper.to_dict() for camper in self.campers],
+        }
+
+
+@dataclass
+class Assignment:
+    rosters: list[CabinRoster]
+    # Campers no cabin had room for, within the age spread.
+    unassigned: list[Camper] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "cabins": [roster.to_dict() for roster in self.rosters],
+            "unassigned": [camper.to_dict() for camper in self.unassigned],
+        }
+
+
+def load_plan(path: Path | str) -> CabinPlan:
+    # {"max_age_spread": 2,
+    #  "cabins": {"archery": {"Oak": 8, "Pine": 8}, ...},
+    #  "together": [["Alex Smith", "Sam Smith"], ...]}
+    with Path(path).open(encoding="utf-8") as fp:
+        data = json.load(fp)
+    if not isinstance(data, dict) or not isinstance(data.get("cabins"), dict):
+        raise ValueError(f"{path}: expected an object with a 'cabins' object.")
+
+    cabins = []
+    for session, session_cabins in data["cabins"].items():
+        if not isinstance(session_cabins, dict):
+            raise ValueError(
+                f"{path}: cabins for {session} must map cabin names to capacities."
+            )
+        for name, capacity in session_cabins.items():
+            if not _is_count(capacity) or capacity < 1:
+                raise ValueError(
+                    f"{path}: capacity of cabin {name} must be a positive integer."
+                )
+            cabins.append(Cabin(name, session.strip().lower(), capacity))
+
+    spread = data.get("max_age_spread")
+    if spread is not None and (not _is_count(spread) or spread < 0):
+        raise ValueError(f"{path}: max_age_spread must be a non-negative integer.")
+
+    together = data.get("together", [])
+    if not isinstance(together, list) or not all(
+        isinstance(group, list) and all(isinstance(name, str) for name in group)
+        for group in together
+    ):
+        raise ValueError(f"{path}: together must be a list of lists of camper names.")
+    return CabinPlan(cabins, spread, together)
+
+
+def assign_cabins(campers: Iterable[Camper], plan: CabinPlan) -> Assignment:
+    by_session: dict[str, list[Camper]] = {}
+    for camper in campers:
+        by_session.setdefault(camper.session, []).append(camper)
+
+    known = {
+        name_key(camper.name) for session in by_session.values() for camper in session
+    }
+    for group in plan.together:
+        for name in group:
+            if name_key(name) not in known:
+                raise ValueError(f"Keep-together camper '{name}' is not enrolled.")
+
+    rosters = {cabin: CabinRoster(cabin) for cabin in plan.cabins}
+    unassigned: list[Camper] = []
+    for session, session_campers in by_session.items():
+        buckets = [
+            _Bucket(rosters[cabin]) for cabin in plan.cabins if cabin.session == session
+        ]
+        units = _units(session_campers, plan.together)
+        unassigned.extend(_assign_session(units, buckets, plan.max_age_spread))
+
+    for roster in rosters.values():
+        roster.campers.sort(key=lambda camper: (camper.age, camper.name))
+    unassigned.sort(key=lambda camper: (camper.session, camper.age, camper.name))
+    return Assignment(list(rosters.values()), unassigned)
+
+
+@dataclass(slots=True, eq=False)
+class _Unit:
+    # Campers placed as one: a keep-together group or a single camper.
+    campers: list[Camper]
+    low: int
+    high: int
+
+
+class _Bucket:
+    __slots__ = ("roster", "capacity", "units", "size", "target", "low", "high")
+
+    def __init__(self, roster: CabinRoster) -> None:
+        self.roster = roster
+        self.capacity = roster.cabin.capacity
+        self.low = self.high = 0
+        self.clear()
+
+    def fits(self, unit: _Unit, limit: int, max_spread: int | None) -> bool:
+        if self.size + len(unit.campers) > limit:
+            return False
+        if max_spread is None:
+            return True
+        if not self.units:
+            return unit.high - unit.low <= max_spread
+        return max(self.high, unit.high) - min(self.low, unit.low) <= max_spread
+
+    def clear(self) -> None:
+        self.units: list[_Unit] = []
+        self.size = 0
+        self.target = self.capacity
+
+    def add(self, unit: _Unit) -> None:
+        if not self.units:
+            self.low, self.high = unit.low, unit.high
+        else:
+            self.low, self.high = min(self.low, unit.low), max(self.high, unit.high)
+        self.units.append(unit)
+        self.size += len(unit.campers)
+
+    def remove(self, unit: _Unit) -> None:
+        self.units.remove(unit)
+        self.size -= len(unit.campers)
+        if self.units:
+            self.low = min(other.low for other in self.units)
+            self.high = max(other.high for other in self.units)
+
+
+def _units(campers: list[Camper], together: list[list[str]]) -> list[_Unit]:
+    # Union-find over the session's campers, so overlapping requests merge.
+    keys = {name_key(camper.name): index for index, camper in enumerate(campers)}
+    parent = list(range(len(campers)))
+
+    def find(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    for group in together:
+        members = [keys[key] for key in map(name_key, group) if key in keys]
+        for member in members[1:]:
+            parent[find(member)] = find(members[0])
+
+    groups: dict[int, list[Camper]] = {}
+    for index, camper in enumerate(campers):
+        groups.setdefault(find(index), []).append(camper)
+    return [
+        _Unit(members, min(c.age for c in members), max(c.age for c in members))
+        for members in groups.values()
+    ]
+
+
+def _assign_session(
+    units: list[_Unit], buckets: list[_Bucket], max_spread: int | None
+) -> list[Camper]:
+    # Groups bigger than any cabin or wider than the age spread never fit.
+    largest = max((bucket.capacity for bucket in buckets), default=0)
+    placeable, unplaced = [], []
+    for unit in units:
+        too_wide = max_spread is not None and unit.high - unit.low > max_spread
+        if len(unit.campers) > largest or too_wide:
+            unplaced.append(unit)
+        else:
+            placeable.append(unit)
+    placeable.sort(key=lambda unit: (unit.low, unit.high, unit.campers[0].name))
+
+    # Balanced cabins first. If the age spread leaves campers out that way,
+    # packing each cabin to capacity may place them, and wins if it does.
+    best = None
+    for balanced in (True, False):
+        for bucket in buckets:
+            bucket.clear()
+        if balanced:
+            _set_targets(buckets, sum(len(unit.campers) for unit in placeable))
+        left = _fill(placeable, buckets, max_spread)
+        missing = sum(len(unit.campers) for unit in left)
+        if best is None or missing < best[0]:
+            best = (missing, left, [list(bucket.units) for bucket in buckets])
+        if not missing:
+            break
+
+    _, left, placed = best
+    for bucket, bucket_units in zip(buckets, placed):
+        for unit in bucket_units:
+            bucket.roster.campers.extend(unit.campers)
+    return [camper for unit in chain(unplaced, left) for camper in unit.campers]
+
+
+def _fill(
+    units: list[_Unit], buckets: list[_Bucket], max_spread: int | None
+) -> list[_Unit]:
+    # Units in age order fill the cabins in plan order, each up to its
+    # target, so cabins come out as age bands. Units that do not fit then go
+    # wherever there is room, moving single campers aside if that is what it
+    # takes to keep a group together. Returns the units left over.
+    leftover = []
+    position = 0
+    for unit in units:
+        for index in range(position, len(buckets)):
+            bucket = buckets[index]
+            limit = bucket.target if bucket.units else bucket.capacity
+            if bucket.fits(unit, limit, max_spread):
+                bucket.add(unit)
+                # A group that jumped ahead leaves the cabins it skipped to
+                # the campers after it.
+                if len(unit.campers) == 1:
+                    position = index
+                break
+        else:
+            leftover.append(unit)
+
+    left = []
+    for unit in sorted(leftover, key=lambda unit: -len(unit.campers)):
+        if _place(unit, buckets, max_spread) or _make_room(unit, buckets, max_spread):
+            continue
+        left.append(unit)
+    return left
+
+
+def _set_targets(buckets: list[_Bucket], total: int) -> None:
+    # Shares of the session proportional to capacity, rounded so they add
+    # up to the number of campers (largest remainders get the extra bed).
+    capacity = sum(bucket.capacity for bucket in buckets)
+    if total >= capacity:
+        for bucket in buckets:
+            bucket.target = bucket.capacity
+        return
+    exact = [bucket.capacity * total / capacity for bucket in buckets]
+    for bucket, share in zip(buckets, exact):
+        bucket.target = math.floor(share)
+    extra = total - sum(bucket.target for bucket in buckets)
+    by_remainder = sorted(
+        range(len(buckets)), key=lambda index: exact[index] - buckets[index].target
+    )
+    for index in by_remainder[len(buckets) - extra:]:
+        buckets[index].target += 1
+
+
+def _place(
+    unit: _Unit,
+    buckets: list[_Bucket],
+    max_spread: int | None,
+    skip: _Bucket | None = None,
+) -> bool:
+    # The emptiest cabin with room, nearest in age on ties.
+    candidates = [
+        bucket
+        for bucket in buckets
+        if bucket is not skip and bucket.fits(unit, bucket.capacity, max_spread)
+    ]
+    if not candidates:
+        return False
+    middle = unit.low + unit.high
+
+    def preference(bucket: _Bucket) -> tuple[int, int]:
+        distance = abs(bucket.low + bucket.high - middle) if bucket.units else 0
+        return bucket.size, distance
+
+    min(candidates, key=preference).add(unit)
+    return True
+
+
+def _make_room(unit: _Unit, buckets: list[_Bucket], max_spread: int | None) -> bool:
+    # Only a group can be helped: a camper who fits no cabin with a free bed
+    # would just displace someone else.
+    if len(unit.campers) == 1:
+        return False
+    free = sum(bucket.capacity - bucket.size for bucket in buckets)
+    for bucket in buckets:
+        if not bucket.fits(unit, math.inf, max_spread):
+            continue
+        needed = bucket.size + len(unit.campers) - bucket.capacity
+        if needed > free - (bucket.capacity - bucket.size):
+            continue
+        singles = [other for other in bucket.units if len(other.campers) == 1]
+        if needed > len(singles):
+            continue
+        # Move the campers furthest in age from the group first.
+        middle = unit.low + unit.high
+        singles.sort(key=lambda single: -abs(2 * single.low - middle))
+        moved = []
+        for single in singles:
+            if len(moved) == needed:
+                break
+            bucket.remove(single)
+            if _place(single, buckets, max_spread, skip=bucket):
+                moved.append(single)
+            else:
+                bucket.add(single)
+        if len(moved) == needed and bucket.fits(unit, bucket.capacity, max_spread):
+            bucket.add(unit)
+            return True
+        # Undo, so the cabin keeps the campers it had.
+        for single in moved:
+            next(other for other in buckets if single in other.units).remove(single)
+            bucket.add(single)
+    return False
+
+
+def _is_count(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
@@ -1,10 +1,53 @@
 from __future__ import annotations
 
 import argparse
+from itertools import chain
+import os
 from pathlib import Path
 import sys
+from typing import TYPE_CHECKING, Sequence
 
-from camp_registration.registry import CampRegistry, DEFAULT_SESSIONS
+from camp_registration.sessions import DEFAULT_SESSIONS
+
+if TYPE_CHECKING:
+    from camp_registration.registry import Camper
+    from camp_registration.snapshot import Snapshot
+
+# The registry and everything it pulls in are imported only once a command
+# needs them, so a call answered by the daemon never loads them.
+
+DEFAULT_DATA_PATH = "campers.journal"
+SQLITE_SUFFIXES = {".db", ".sqlite", ".sqlite3"}
+# Commands a running daemon can answer; the rest always run in-process.
+DAEMON_COMMANDS = {
+    "register", "cancel", "capacity", "import", "list", "export", "duplicates", "assign"
+}
+# Seconds to wait for the daemon to accept a connection, then to answer. A
+# daemon that does not accept counts as not running; one that accepts but
+# does not answer in time is reported as an error.
+DAEMON_CONNECT_TIMEOUT = 1.0
+DAEMON_TIMEOUT = 120.0
+# Commands that add campers, and so check them against similar names.
+CHECKED_COMMANDS = {"register", "import"}
+
+
+def open_registry(path: Path, metrics=None, check_duplicates: bool = False):
+    if path.suffix.lower() in SQLITE_SUFFIXES:
+        from camp_registration.sqlite_registry import SqliteCampRegistry
+
+        return SqliteCampRegistry(path)
+    from camp_registration.registry import CampRegistry
+
+    duplicates = None
+    if check_duplicates:
+        from camp_registration.duplicates import DuplicateIndex
+
+        duplicates = DuplicateIndex()
+    return CampRegistry.open(path, metrics=metrics, duplicates=duplicates)
+
+
+def default_socket_path(data: Path) -> Path:
+    return data.with_name(data.name + ".sock")
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -13,12 +56,114 @@ def build_parser() -> argparse.ArgumentParser:
         description="Camp registration program",
         epilog=f"Available sessions: {sessions}.",
     )
+    parser.add_argument(
+        "--data",
+        type=Path,
+        default=Path(os.environ.get("CAMP_REGISTRATION_DATA", DEFAULT_DATA_PATH)),
+        help="Registry journal file, or a SQLite database for .db/.sqlite paths "
+        f"(default: $CAMP_REGISTRATION_DATA or {DEFAULT_DATA_PATH})",
+    )
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        default=os.environ.get("CAMP_REGISTRATION_SOCKET"),
+        help="Daemon socket (default: $CAMP_REGISTRATION_SOCKET or <data>.sock). "
+        "Commands go to the daemon when one is listening there.",
+    )
+    parser.add_argument(
+        "--metrics",
+        metavar="TARGET",
+        help="Record registry operation timings: a .prom file (Prometheus text "
+        "format), a .json file, or '-' to log to stderr",
+    )
     subparsers = parser.add_subparsers(dest="command", required=True)
 
     register_parser = subparsers.add_parser("register", help="Register a camper")
     register_parser.add_argument("name")
     register_parser.add_argument("age", type=int)
     register_parser.add_argument("session")
+    register_parser.add_argument(
+        "--allow-similar",
+        action="store_true",
+        help="Register even if a camper with a similar name and age is already in "
+        "the session",
+    )
+
+    cancel_parser = subparsers.add_parser(
+        "cancel", help="Cancel a registration and promote from the waitlist"
+    )
+    cancel_parser.add_argument("name")
+    cancel_parser.add_argument("session")
+
+    capacity_parser = subparsers.add_parser(
+        "capacity", help="Set how many campers a session can enroll"
+    )
+    capacity_parser.add_argument("session")
+    capacity_parser.add_argument(
+        "capacity",
+        type=_capacity,
+        help="Maximum enrolled campers, or 'none' to remove the limit",
+    )
+
+    import_parser = subparsers.add_parser(
+        "import", help="Bulk-register campers from a CSV with name, age, session columns"
+    )
+    import_parser.add_argument("csv_path", type=Path, metavar="csv")
+    import_parser.add_argument(
+        "--rejects",
+        type=Path,
+        help="Where to write rejected rows (default: <csv>.rejects.csv)",
+    )
+    import_parser.add_argument(
+        "--allow-similar",
+        action="store_true",
+        help="Do not reject rows whose name looks like an existing or earlier camper's",
+    )
+
+    duplicates_parser = subparsers.add_parser(
+        "duplicates", help="Report campers whose names look like the same person"
+    )
+    duplicates_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.85,
+        help="Name similarity from 0 to 1 above which campers are reported "
+        "(default: 0.85)",
+    )
+    duplicates_parser.add_argument(
+        "--max-age-gap",
+        type=int,
+        default=0,
+        help="Also compare campers whose ages differ by up to this much (default: 0)",
+    )
+    duplicates_parser.add_argument(
+        "--format",
+        choices=("text", "json"),
+        default="text",
+        help="Output format",
+    )
+
+    assign_parser = subparsers.add_parser(
+        "assign", help="Split each session's enrolled campers into cabins"
+    )
+    assign_parser.add_argument(
+        "plan",
+        type=Path,
+        help="JSON file with cabin capacities per session, and optionally "
+        "max_age_spread and keep-together groups",
+    )
+    assign_parser.add_argument(
+        "--format",
+        choices=("text", "json"),
+        default="text",
+        help="Output format",
+    )
+
+    serve_parser = subparsers.add_parser(
+        "serve", help="Run the HTTP registration API on this registry"
+    )
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8080)
 
     list_parser = subparsers.add_parser("list", help="List campers")
     list_parser.add_argument(
@@ -28,38 +173,282 @@ def build_parser() -> argparse.ArgumentParser:
         help="Output format",
     )
 
-    export_parser = subparsers.add_parser("export", help="Export campers to JSON")
+    export_parser = subparsers.add_parser(
+        "export", help="Export campers to JSON (NDJSON for .ndjson/.jsonl paths)"
+    )
     export_parser.add_argument("path", type=Path)
+    export_parser.add_argument(
+        "--since",
+        type=int,
+        metavar="SEQ",
+        help="Export only the changes (registrations, waitlistings, promotions and "
+        "cancellations) after this sequence number",
+    )
+
+    subparsers.add_parser(
+        "daemon",
+        help="Keep the registry loaded and answer commands over a Unix socket",
+    )
+
+    # Its options belong to camp_registration.bench, which is only imported
+    # when the command runs; see `camp-registration bench --help`.
+    subparsers.add_parser(
+        "bench", help="Run performance benchmarks and print a JSON report", add_help=False
+    )
 
     return parser
 
 
 def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else list(argv)
     parser = build_parser()
-    args = parser.parse_args(argv)
+    args, extra = parser.parse_known_args(argv)
+
+    if args.command == "bench":
+        from camp_registration import bench
 
-    registry = CampRegistry()
+        return bench.main(extra)
+    if extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+
+    socket_path = args.socket or default_socket_path(args.data)
+    if args.command == "daemon":
+        from camp_registration.daemon import run_daemon
+
+        return run_daemon(args.data, socket_path, args.metrics)
+    if args.command in DAEMON_COMMANDS and args.metrics is None:
+        response = _ask_daemon(socket_path, argv, args.data)
+        if response is not None:
+            sys.stdout.write(response["stdout"])
+            sys.stderr.write(response["stderr"])
+            return response["exit"]
+
+    if args.command == "list" and args.metrics is None:
+        snapshot = _open_snapshot(args.data)
+        if snapshot is not None:
+            # Nothing was journaled since the last compaction, so the roster
+            # streams straight from the mapped snapshot, without a registry.
+            with snapshot:
+                waiting = snapshot.waitlists()
+                waitlists = {
+                    session: waiting.get(session, [])
+                    for session in sorted(DEFAULT_SESSIONS)
+                }
+                _print_roster(args.format, snapshot, waitlists, snapshot.capacities)
+            return 0
+
+    metrics = None
+    if args.metrics:
+        from camp_registration.metrics import sink_for_path
+
+        metrics = sink_for_path(args.metrics)
+    try:
+        registry = open_registry(
+            args.data, metrics, check_duplicates=args.command in CHECKED_COMMANDS
+        )
+        return run_command(parser, args, registry)
+    finally:
+        if metrics is not None:
+            metrics.flush()
+
+
+def _open_snapshot(data: Path) -> Snapshot | None:
+    if data.suffix.lower() in SQLITE_SUFFIXES:
+        return None
+    from camp_registration.storage import JournalStorage
+
+    return JournalStorage(data).open_snapshot()
+
+
+def _ask_daemon(socket_path: Path, argv: list[str], data: Path) -> dict | None:
+    # Returns None when no daemon accepts the connection, so the caller runs
+    # the command itself; the journal lock keeps that safe even if a daemon is
+    # starting. Once the request is sent the daemon may already be running
+    # it, so a missing answer is reported rather than run a second time.
+    if not socket_path.exists():
+        return None
+    import json
+    import socket
+
+    request = {"argv": argv, "cwd": os.getcwd(), "data": str(data.resolve())}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.settimeout(DAEMON_CONNECT_TIMEOUT)
+        try:
+            connection.connect(str(socket_path))
+        except OSError:
+            return None
+        connection.settimeout(DAEMON_TIMEOUT)
+        try:
+            connection.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            connection.shutdown(socket.SHUT_WR)
+            with connection.makefile("rb") as reader:
+                response = json.loads(reader.readline())
+        except TimeoutError:
+            problem = f"did not answer within {DAEMON_TIMEOUT:g} s"
+        except (OSError, ValueError) as exc:
+            problem = f"gave no usable answer ({exc or type(exc).__name__})"
+        else:
+            return response
+    return {
+        "stdout": "",
+        "stderr": f"The daemon on {socket_path} {problem}. The command may still "
+        "complete there; check before running it again.\n",
+        "exit": 1,
+    }
+
+
+def run_command(
+    parser: argparse.ArgumentParser, args: argparse.Namespace, registry
+) -> int:
+    from camp_registration.registry import (
+        CampRegistry,
+        ChangesUnavailableError,
+        PossibleDuplicateError,
+    )
+
+    waitlists = _waitlists(registry)
 
     if args.command == "register":
-        camper = registry.register_camper(args.name, args.age, args.session)
-        print(
-            f"Registered {camper.name} (age {camper.age}) for {camper.session} session."
+        # The SQLite registry does not check for similar names, so it takes
+        # no allow_similar option.
+        options = {}
+        if args.allow_similar and isinstance(registry, CampRegistry):
+            options["allow_similar"] = True
+        try:
+            camper = registry.register_camper(args.name, args.age, args.session, **options)
+        except PossibleDuplicateError as exc:
+            print(
+                f"{exc} Use --allow-similar if this is a different camper.",
+                file=sys.stderr,
+            )
+            return 1
+        except ValueError as exc:
+            # An exact duplicate, or a name, age or session that fails validation.
+            print(exc, file=sys.stderr)
+            return 1
+        position = (
+            registry.waitlist_position(camper.name, camper.session)
+            if isinstance(registry, CampRegistry)
+            else None
         )
-    elif args.command == "list":
-        if not registry.campers:
-            print("No campers registered yet.")
-            return 0
+        if position is None:
+            print(
+                f"Registered {camper.name} (age {camper.age}) for {camper.session} session."
+            )
+        else:
+            print(
+                f"The {camper.session} session is full; added {camper.name} "
+                f"(age {camper.age}) to the waitlist at position {position}."
+            )
+    elif args.command == "cancel":
+        try:
+            camper = registry.cancel_camper(args.name, args.session)
+        except ValueError as exc:
+            print(exc, file=sys.stderr)
+            return 1
+        print(f"Cancelled {camper.name} from the {camper.session} session.")
+    elif args.command == "capacity":
+        if not isinstance(registry, CampRegistry):
+            parser.error("session capacities require a journal data file")
+        try:
+            registry.set_capacity(args.session, args.capacity)
+        except ValueError as exc:
+            print(exc, file=sys.stderr)
+            return 1
+        limit = "unlimited" if args.capacity is None else args.capacity
+        print(f"Set {args.session.strip().lower()} capacity to {limit}.")
+    elif args.command == "import":
+        from camp_registration.bulk_import import import_csv, write_rejects
+
+        result = import_csv(registry, args.csv_path, args.allow_similar)
+        print(f"Imported {result.imported} campers from {args.csv_path}.")
+        if result.rejects:
+            rejects_path = args.rejects or args.csv_path.with_suffix(".rejects.csv")
+            write_rejects(rejects_path, result.rejects)
+            print(f"Rejected {len(result.rejects)} rows; see {rejects_path}.")
+    elif args.command == "duplicates":
+        from camp_registration.duplicates import find_duplicates
 
+        roster = [*registry.campers, *chain.from_iterable(waitlists.values())]
+        matches = find_duplicates(roster, args.threshold, args.max_age_gap)
         if args.format == "json":
             import json
 
-            print(json.dumps([c.__dict__ for c in registry.campers], indent=2))
+            print(json.dumps([match.to_dict() for match in matches], indent=2))
+        elif not matches:
+            print(f"No likely duplicates among {len(roster)} campers.")
         else:
-            for camper in registry.campers:
-                print(f"{camper.name} (age {camper.age}) - {camper.session}")
+            for match in matches:
+                print(
+                    f"{match.camper.name} (age {match.camper.age}) looks like "
+                    f"{match.other.name} (age {match.other.age}) in "
+                    f"{match.camper.session} ({match.score:.0%} similar)"
+                )
+            print(f"{len(matches)} likely duplicates among {len(roster)} campers.")
+    elif args.command == "assign":
+        from camp_registration.cabins import assign_cabins, load_plan
+
+        assignment = assign_cabins(registry.campers, load_plan(args.plan))
+        if args.format == "json":
+            import json
+
+            print(json.dumps(assignment.to_dict(), indent=2))
+            return 0
+        for roster in assignment.rosters:
+            cabin, size = roster.cabin, len(roster.campers)
+            line = f"{cabin.session} / {cabin.name}: {size}/{cabin.capacity}"
+            if roster.campers:
+                line += f", ages {roster.campers[0].age}-{roster.campers[-1].age}"
+            print(line)
+            for camper in roster.campers:
+                print(f"  {camper.name} (age {camper.age})")
+        if assignment.unassigned:
+            print("Unassigned:")
+            for camper in assignment.unassigned:
+                print(f"  {camper.name} (age {camper.age}) - {camper.session}")
+        assigned = len(registry.campers) - len(assignment.unassigned)
+        print(
+            f"Assigned {assigned} of {len(registry.campers)} campers to "
+            f"{len(assignment.rosters)} cabins."
+        )
+    elif args.command == "serve":
+        if not isinstance(registry, CampRegistry):
+            parser.error("the HTTP API requires a journal data file")
+        import asyncio
+
+        from camp_registration.server import serve
+
+        try:
+            asyncio.run(serve(registry, args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+    elif args.command == "list":
+        capacities = registry.capacities if isinstance(registry, CampRegistry) else None
+        _print_roster(args.format, registry.campers, waitlists, capacities)
     elif args.command == "export":
-        registry.export_json(args.path)
-        print(f"Exported {len(registry.campers)} campers to {args.path}.")
+        from camp_registration.streaming import is_ndjson, write_json_array, write_ndjson
+
+        if args.since is not None:
+            if not isinstance(registry, CampRegistry):
+                parser.error("change exports require a journal data file")
+            try:
+                changes = registry.changes_since(args.since)
+            except ChangesUnavailableError as exc:
+                parser.error(str(exc))
+            write = write_ndjson if is_ndjson(args.path) else write_json_array
+            write(args.path, (change.to_dict() for change in changes))
+            print(
+                f"Exported {len(changes)} changes since sequence {args.since} to "
+                f"{args.path}; now at sequence {registry.sequence}."
+            )
+            return 0
+        if is_ndjson(args.path):
+            registry.export_ndjson(args.path)
+        else:
+            registry.export_json(args.path)
+        sequence = getattr(registry, "sequence", None)
+        at = "" if sequence is None else f" at sequence {sequence}"
+        print(f"Exported {len(registry.campers)} campers to {args.path}{at}.")
     else:
         parser.print_help()
         return 1
@@ -67,5 +456,79 @@ def main(argv: list[str] | None = None) -> int:
     return 0
 
 
+def _capacity(value: str) -> int | None:
+    if value.strip().lower() == "none":
+        return None
+    try:
+        capacity = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "capacity must be a whole number or 'none'"
+        ) from None
+    if capacity < 0:
+        raise argparse.ArgumentTypeError("capacity cannot be negative")
+    return capacity
+
+
+def _waitlists(registry) -> dict[str, list[Camper]]:
+    from camp_registration.registry import CampRegistry
+
+    if not isinstance(registry, CampRegistry):
+        return {}
+    return {
+        session: registry.waitlist(session)
+        for session in sorted(registry.allowed_sessions)
+    }
+
+
+def _print_roster(
+    output_format: str,
+    campers: Sequence[Camper],
+    waitlists: dict[str, list[Camper]],
+    capacities: dict[str, int] | None,
+) -> None:
+    # Without capacities (a SQLite registry) there is no session summary.
+    if not campers and not any(waitlists.values()):
+        print("No campers registered yet.")
+        return
+
+    if output_format == "json":
+        import json
+
+        entries = [dict(c.to_dict(), status="enrolled") for c in campers]
+        for waiting in waitlists.values():
+            entries.extend(
+                dict(c.to_dict(), status="waitlisted", position=position)
+                for position, c in enumerate(waiting, start=1)
+            )
+        print(json.dumps(entries, indent=2))
+        return
+
+    enrolled: dict[str, int] = {}
+    for camper in campers:
+        enrolled[camper.session] = enrolled.get(camper.session, 0) + 1
+        print(f"{camper.name} (age {camper.age}) - {camper.session}")
+    if capacities is not None:
+        _print_session_summary(enrolled, capacities, waitlists)
+
+
+def _print_session_summary(
+    enrolled: dict[str, int],
+    capacities: dict[str, int],
+    waitlists: dict[str, list[Camper]],
+) -> None:
+    print()
+    for session in sorted(waitlists):
+        capacity = capacities.get(session)
+        line = f"{session}: {enrolled.get(session, 0)}"
+        line += "" if capacity is None else f"/{capacity}"
+        waiting = waitlists[session]
+        if waiting:
+            line += f", {len(waiting)} waitlisted"
+        print(line)
+        for position, camper in enumerate(waiting, start=1):
+            print(f"  {position}. {camper.name} (age {camper.age})")
+
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import MutableSequence
+from typing import Iterable, overload
+
+from camp_registration.registry import Camper
+
+
+class ColumnarCampers(MutableSequence):
+    # Stores campers column by column: session codes and ages in byte arrays and
+    # all names in one UTF-8 pool addressed by (start, length). Camper objects
+    # are only built when an entry is read, so a roster costs roughly
+    # 14 bytes plus the name length per camper instead of a full object each.
+
+    def __init__(self, campers: Iterable[Camper] = ()) -> None:
+        self._sessions: list[str] = []
+        self._session_codes: dict[str, int] = {}
+        self._session_column = array("B")
+        self._ages = array("B")
+        self._name_pool = bytearray()
+        self._name_starts = array("Q")
+        self._name_lengths = array("I")
+        self.extend(campers)
+
+    def __len__(self) -> int:
+        return len(self._ages)
+
+    @overload
+    def __getitem__(self, index: int) -> Camper: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Camper]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._camper(position) for position in range(*index.indices(len(self)))]
+        return self._camper(self._position(index))
+
+    def __setitem__(self, index: int, camper: Camper) -> None:
+        position = self._position(index)
+        start, length = self._store_name(camper.name)
+        self._session_column[position] = self._session_code(camper.session)
+        self._ages[position] = camper.age
+        self._name_starts[position] = start
+        self._name_lengths[position] = length
+
+    def __delitem__(self, index: int) -> None:
+        position = self._position(index)
+        # The name bytes stay in the pool; cancellations are rare enough that
+        # compacting it is not worth the copy.
+        del self._session_column[position]
+        del self._ages[position]
+        del self._name_starts[position]
+        del self._name_lengths[position]
+
+    def __iter__(self):
+        pool = self._name_pool
+        sessions = self._sessions
+        for code, age, start, length in zip(
+            self._session_column, self._ages, self._name_starts, self._name_lengths
+        ):
+            yield Camper(pool[start : start + length].decode("utf-8"), age, sessions[code])
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (ColumnarCampers, list)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"ColumnarCampers({len(self)} campers)"
+
+    def insert(self, index: int, camper: Camper) -> None:
+        index = min(max(index + len(self) if index < 0 else index, 0), len(self))
+        start, length = self._store_name(camper.name)
+        self._session_column.insert(index, self._session_code(camper.session))
+        self._ages.insert(index, camper.age)
+        self._name_starts.insert(index, start)
+        self._name_lengths.insert(index, length)
+
+    def append(self, camper: Camper) -> None:
+        start, length = self._store_name(camper.name)
+        self._session_column.append(self._session_code(camper.session))
+        self._ages.append(camper.age)
+        self._name_starts.append(start)
+        self._name_lengths.append(length)
+
+    def clear(self) -> None:
+        self.__init__()
+
+    def _camper(self, position: int) -> Camper:
+        start = self._name_starts[position]
+        name = self._name_pool[start : start + self._name_lengths[position]]
+        return Camper(
+            name.decode("utf-8"),
+            self._ages[position],
+            self._sessions[self._session_column[position]],
+        )
+
+    def _position(self, index: int) -> int:
+        position = index + len(self) if index < 0 else index
+        if not 0 <= position < len(self):
+            raise IndexError("camper index out of range")
+        return position
+
+    def _session_code(self, session: str) -> int:
+        code = self._session_codes.get(session)
+        if code is None:
+            if len(self._sessions) > 255:
+                raise ValueError("ColumnarCampers supports at most 256 sessions.")
+            code = len(self._sessions)
+            self._sessions.append(session)
+            self._session_codes[session] = code
+        return code
+
+    def _store_name(self, name: str) -> tuple[int, int]:
+        encoded = name.encode("utf-8")
+        start = len(self._name_pool)
+        self._name_pool += encoded
+        return start, len(encoded)
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from contextlib import redirect_stderr, redirect_stdout
+import io
+import json
+import os
+from pathlib import Path
+import signal
+import socket
+import socketserver
+import sys
+from typing import Any
+
+from camp_registration.cli import DAEMON_COMMANDS, build_parser, open_registry, run_command
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+        response = self.server.execute(request)
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class RegistryDaemon(socketserver.UnixStreamServer):
+    # Holds one loaded registry and runs CLI commands against it, one request
+    # at a time, so thin clients skip imports and the journal reload. Every
+    # command starts with a refresh, so writes made by other processes through
+    # the journal are still seen.
+
+    def __init__(self, socket_path: Path, registry, data_path: Path, metrics=None) -> None:
+        self.registry = registry
+        self.data_path = data_path
+        self.metrics = metrics
+        self.parser = build_parser()
+        super().__init__(str(socket_path), _Handler)
+        os.chmod(socket_path, 0o600)
+
+    def execute(self, request: dict[str, Any]) -> dict[str, Any]:
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                status = self._execute(request)
+            except SystemExit as exc:
+                # argparse usage errors, raised through parser.error().
+                status = exc.code if isinstance(exc.code, int) else 1
+            except Exception as exc:
+                print(f"{type(exc).__name__}: {exc}", file=sys.stderr)
+                status = 1
+        if self.metrics is not None:
+            self.metrics.flush()
+        return {"exit": status, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+    def _execute(self, request: dict[str, Any]) -> int:
+        args, extra = self.parser.parse_known_args(request["argv"])
+        if extra:
+            self.parser.error(f"unrecognized arguments: {' '.join(extra)}")
+        if args.command not in DAEMON_COMMANDS:
+            self.parser.error(f"'{args.command}' cannot run through the daemon")
+        if Path(request["data"]) != self.data_path:
+            self.parser.error(f"this daemon serves {self.data_path}, not {request['data']}")
+
+        cwd = Path(request["cwd"])
+        for key, value in vars(args).items():
+            if isinstance(value, Path) and not value.is_absolute():
+                setattr(args, key, cwd / value)
+        refresh = getattr(self.registry, "refresh", None)
+        if refresh is not None:
+            refresh()
+        return run_command(self.parser, args, self.registry)
+
+
+def run_daemon(data_path: Path, socket_path: Path, metrics_target: str | None = None) -> int:
+    metrics = None
+    if metrics_target:
+        from camp_registration.metrics import sink_for_path
+
+        metrics = sink_for_path(metrics_target)
+    if socket_path.exists():
+        if _is_listening(socket_path):
+            print(f"A daemon is already listening on {socket_path}.", file=sys.stderr)
+            return 1
+        # Left behind by a daemon that was killed.
+        socket_path.unlink()
+
+    # Checking registrations costs the daemon little once its index is built.
+    registry = open_registry(data_path, metrics, check_duplicates=True)
+    server = RegistryDaemon(socket_path, registry, data_path.resolve(), metrics)
+    signal.signal(signal.SIGTERM, _raise_interrupt)
+    print(f"Serving {data_path} on {socket_path}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        socket_path.unlink(missing_ok=True)
+    return 0
+
+
+def _is_listening(socket_path: Path) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(socket_path))
+        except OSError:
+            return False
+    return True
+
+
+def _raise_interrupt(signum, frame) -> None:
+    raise KeyboardInterrupt
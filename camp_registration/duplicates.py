@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+import functools
+import re
+import unicodedata
+from typing import Any, Iterable
+
+from camp_registration.registry import Camper
+
+
+DEFAULT_THRESHOLD = 0.85
+# Double submissions carry the same age; raise this to also catch ones that
+# straddle a birthday, at the cost of comparing against more campers.
+DEFAULT_MAX_AGE_GAP = 0
+_SOUNDEX_CODES = {
+    letter: digit
+    for letters, digit in (
+        ("bfpv", "1"), ("cgjkqsxz", "2"), ("dt", "3"), ("l", "4"), ("mn", "5"), ("r", "6"),
+    )
+    for letter in letters
+}
+_SEPARATORS = re.compile(r"[^\w]+|_")
+
+
+@dataclass(frozen=True, slots=True)
+class DuplicateMatch:
+    camper: Camper
+    other: Camper
+    score: float
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "camper": self.camper.to_dict(),
+            "other": self.other.to_dict(),
+            "score": round(self.score, 3),
+        }
+
+
+def name_tokens(name: str) -> list[str]:
+    # Case, accents, apostrophes and punctuation are not evidence of a
+    # different person: "Zoë O'Neil-Smith" -> ["zoe", "oneil", "smith"].
+    if not name.isascii():
+        decomposed = unicodedata.normalize("NFKD", name)
+        name = "".join(char for char in decomposed if not unicodedata.combining(char))
+    stripped = name.casefold().replace("'", "").replace("’", "")
+    return [token for token in _SEPARATORS.split(stripped) if token]
+
+
+# First and last names repeat across a roster far more than full names do.
+@functools.lru_cache(maxsize=65536)
+def soundex(token: str) -> str:
+    if not token[0].isalpha() or not token.isascii():
+        return token
+    code = token[0]
+    previous = _SOUNDEX_CODES.get(token[0], "")
+    for char in token[1:]:
+        digit = _SOUNDEX_CODES.get(char, "")
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        # h and w do not separate letters with the same code; vowels do.
+        if char not in "hw":
+            previous = digit
+    return code.ljust(4, "0")
+
+
+class DuplicateIndex:
+    # Blocking index for near-duplicate campers. A camper is only compared
+    # with campers that share a bucket, so a check costs a few dozen cheap
+    # comparisons whatever the roster size.
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        max_age_gap: int = DEFAULT_MAX_AGE_GAP,
+    ) -> None:
+        self.threshold = threshold
+        self.max_age_gap = max_age_gap
+        self._blocks: dict[tuple[Any, ...], list[_Entry]] = {}
+
+    def add(self, camper: Camper) -> None:
+        self._insert(_Entry.of(camper))
+
+    def remove(self, camper: Camper) -> None:
+        for key in _Entry.of(camper).keys(camper.age):
+            bucket = self._blocks.get(key, [])
+            for position, entry in enumerate(bucket):
+                if entry.camper == camper:
+                    del bucket[position]
+                    break
+            if not bucket:
+                self._blocks.pop(key, None)
+
+    def clear(self) -> None:
+        self._blocks.clear()
+
+    def matches(self, camper: Camper) -> list[DuplicateMatch]:
+        # Indexed campers that look like `camper`, best match first.
+        return self._matches(_Entry.of(camper))
+
+    def _insert(self, entry: _Entry) -> None:
+        for key in entry.keys(entry.camper.age):
+            self._blocks.setdefault(key, []).append(entry)
+
+    def _matches(self, probe: _Entry) -> list[DuplicateMatch]:
+        camper = probe.camper
+        # SequenceMatcher caches its analysis of the second sequence, so one
+        # matcher serves every candidate.
+        matcher = SequenceMatcher(None, b=probe.joined, autojunk=False)
+        sorted_matcher = None
+        seen: set[int] = set()
+        found = []
+        for age in range(camper.age - self.max_age_gap, camper.age + self.max_age_gap + 1):
+            for key in probe.keys(age):
+                for entry in self._blocks.get(key, ()):
+                    if (
+                        id(entry) in seen
+                        or entry.camper is camper
+                        or entry.numbers != probe.numbers
+                    ):
+                        continue
+                    seen.add(id(entry))
+                    score = _similarity(matcher, entry.joined, self.threshold)
+                    # Swapped names file under the same sorted codes.
+                    if (
+                        score < self.threshold
+                        and entry.sorted_codes == probe.sorted_codes
+                        and (
+                            entry.sorted_joined != entry.joined
+                            or probe.sorted_joined != probe.joined
+                        )
+                    ):
+                        if sorted_matcher is None:
+                            sorted_matcher = SequenceMatcher(
+                                None, b=probe.sorted_joined, autojunk=False
+                            )
+                        score = _similarity(sorted_matcher, entry.sorted_joined, self.threshold)
+                    if score >= self.threshold:
+                        found.append(DuplicateMatch(camper, entry.camper, score))
+        found.sort(key=lambda match: -match.score)
+        return found
+
+
+@dataclass(frozen=True, slots=True)
+class _Entry:
+    camper: Camper
+    joined: str
+    # Tokens in sorted order, so "Smith Alex" compares equal to "Alex Smith".
+    sorted_joined: str
+    codes: tuple[str, ...]
+    sorted_codes: tuple[str, ...]
+    # "Camper 1" and "Camper 12" are different records, however alike.
+    numbers: tuple[str, ...]
+
+    @classmethod
+    def of(cls, camper: Camper) -> _Entry:
+        tokens = name_tokens(camper.name)
+        codes = tuple(soundex(token) for token in tokens)
+        return cls(
+            camper,
+            " ".join(tokens),
+            " ".join(sorted(tokens)),
+            codes,
+            tuple(sorted(codes)),
+            tuple(token for token in tokens if token.isdigit()),
+        )
+
+    def keys(self, age: int) -> list[tuple[Any, ...]]:
+        # A single misspelling only changes one name, so a camper is filed
+        # under each of its first and last names' sound-alike codes, plus all
+        # codes sorted (for swapped first and last names). Age is part of
+        # every key; lookups try each age within max_age_gap.
+        if not self.codes:
+            return []
+        session = self.camper.session
+        return [
+            (session, age, "first", self.codes[0]),
+            (session, age, "last", self.codes[-1]),
+            (session, age, "all", *self.sorted_codes),
+        ]
+
+
+def find_duplicates(
+    campers: Iterable[Camper],
+    threshold: float = DEFAULT_THRESHOLD,
+    max_age_gap: int = DEFAULT_MAX_AGE_GAP,
+) -> list[DuplicateMatch]:
+    # Every pair of likely duplicates in one pass: each camper is matched
+    # against those before it, then indexed. Each pair is reported once, with
+    # the later camper first.
+    index = DuplicateIndex(threshold, max_age_gap)
+    report = []
+    for camper in campers:
+        entry = _Entry.of(camper)
+        report.extend(index._matches(entry))
+        index._insert(entry)
+    return report
+
+
+def _similarity(matcher: SequenceMatcher, other: str, threshold: float) -> float:
+    comparable = matcher.b
+    if other == comparable:
+        return 1.0
+    # ratio() is at most 2 * shorter / total length; most pairs in a bucket
+    # fail this or quick_ratio() before the full comparison.
+    if 2 * min(len(other), len(comparable)) < threshold * (len(other) + len(comparable)):
+        return 0.0
+    matcher.set_seq1(other)
+    if matcher.quick_ratio() < threshold:
+        return 0.0
+    return matcher.ratio()
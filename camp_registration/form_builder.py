@@ -1,15 +1,18 @@
 from __future__ import annotations
 
 import json
+import queue
 import sys
+import threading
 import tkinter as tk
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from tkinter import filedialog, messagebox, ttk
 
 if __package__ in {None, ""}:
     sys.path.append(str(Path(__file__).resolve().parents[1]))
 
+from camp_registration.form_discovery import DiscoveredElement, discover_file
 from camp_registration.web_form import (
     CheckboxField,
     FormConfig,
@@ -19,12 +22,39 @@ from camp_registration.web_form import (
 )
 
 
+IMPORT_POLL_MS = 50
+
+
 @dataclass
 class BuilderItem:
     kind: str
     selector: str
     value: str
     checked: bool
+    options: list[str] = field(default_factory=list)
+    label: str = ""
+    # Radios can only be checked; an unchecked one is left out of the config.
+    radio: bool = False
+
+    @classmethod
+    def from_discovered(cls, element: DiscoveredElement) -> BuilderItem:
+        return cls(
+            kind=element.kind,
+            selector=element.selector,
+            value=element.value,
+            checked=element.checked,
+            options=element.options,
+            label=element.label,
+            radio=element.radio,
+        )
+
+    def describe(self) -> str:
+        text = f"{self.kind}: {self.selector} -> {self.value or self.checked}"
+        if self.label:
+            text = f"{text}  ({self.label})"
+        if self.options:
+            text = f"{text}  [{', '.join(self.options)}]"
+        return text
 
 
 class FormBuilderApp:
@@ -83,14 +113,15 @@ class FormBuilderApp:
         self.selector_entry.grid(row=1, column=1, sticky=tk.EW, padx=8, pady=6)
 
         ttk.Label(entry_frame, text="Value").grid(row=2, column=0, sticky=tk.W, padx=8)
-        self.value_entry = ttk.Entry(entry_frame)
+        # Offers the options of an imported select; free text otherwise.
+        self.value_entry = ttk.Combobox(entry_frame)
         self.value_entry.grid(row=2, column=1, sticky=tk.EW, padx=8, pady=6)
 
         self.checked_value = tk.BooleanVar(value=True)
         checked = ttk.Checkbutton(entry_frame, text="Checked", variable=self.checked_value)
         checked.grid(row=3, column=1, sticky=tk.W, padx=8, pady=(0, 6))
 
-        add_button = ttk.Button(entry_frame, text="Add", command=self._add_item)
+        add_button = ttk.Button(entry_frame, text="Add / update", command=self._add_item)
         add_button.grid(row=4, column=0, columnspan=2, pady=(4, 8))
 
         entry_frame.columnconfigure(1, weight=1)
@@ -105,6 +136,7 @@ class FormBuilderApp:
         scrollbar.config(command=self.items_list.yview)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y, pady=8)
         self.items_list.config(yscrollcommand=scrollbar.set)
+        self.items_list.bind("<<ListboxSelect>>", lambda event: self._edit_selected())
 
         actions = ttk.Frame(self.root, padding=(16, 8))
         actions.pack(fill=tk.X)
@@ -112,6 +144,10 @@ class FormBuilderApp:
         ttk.Button(actions, text="Remove selected", command=self._remove_selected).pack(
             side=tk.LEFT, padx=4
         )
+        self.import_button = ttk.Button(
+            actions, text="Import from HTML", command=self._import_html
+        )
+        self.import_button.pack(side=tk.LEFT, padx=4)
         ttk.Button(actions, text="Save config", command=self._save_config).pack(
             side=tk.RIGHT, padx=4
         )
@@ -133,16 +169,39 @@ class FormBuilderApp:
             messagebox.showerror("Missing value", "Please provide a value.")
             return
 
-        item = BuilderItem(kind=kind, selector=selector, value=value, checked=checked)
-        self.items.append(item)
-        self.items_list.insert(
-            tk.END, f"{item.kind}: {item.selector} -> {item.value or item.checked}"
+        # A selector that is already listed is updated in place; configs may
+        # not list one selector twice with different values.
+        index = next(
+            (i for i, item in enumerate(self.items) if item.selector == selector), None
         )
+        if index is None:
+            item = BuilderItem(kind=kind, selector=selector, value=value, checked=checked)
+            self.items.append(item)
+            self.items_list.insert(tk.END, item.describe())
+        else:
+            item = self.items[index]
+            item.kind, item.value, item.checked = kind, value, checked
+            self.items_list.delete(index)
+            self.items_list.insert(index, item.describe())
         self.selector_entry.delete(0, tk.END)
         self.value_entry.delete(0, tk.END)
+        self.value_entry.config(values=())
         self.checked_value.set(True)
         self.selector_entry.focus_set()
 
+    def _edit_selected(self) -> None:
+        selection = self.items_list.curselection()
+        if not selection:
+            return
+        item = self.items[selection[0]]
+        self.kind_value.set(item.kind)
+        self.selector_entry.delete(0, tk.END)
+        self.selector_entry.insert(0, item.selector)
+        self.value_entry.config(values=item.options)
+        self.value_entry.delete(0, tk.END)
+        self.value_entry.insert(0, item.value)
+        self.checked_value.set(item.checked)
+
     def _remove_selected(self) -> None:
         selection = self.items_list.curselection()
         if not selection:
@@ -151,6 +210,52 @@ class FormBuilderApp:
         self.items_list.delete(index)
         self.items.pop(index)
 
+    def _import_html(self) -> None:
+        path = filedialog.askopenfilename(
+            title="Import form elements from a saved page",
+            filetypes=[("HTML files", "*.html *.htm"), ("All files", "*")],
+        )
+        if not path:
+            return
+
+        # Large saved pages take seconds to parse, so that happens on a worker
+        # thread; Tk is only touched from the main thread, which polls.
+        results: queue.Queue = queue.Queue(maxsize=1)
+        threading.Thread(
+            target=_discover_in_background, args=(path, results), daemon=True
+        ).start()
+        self.import_button.state(["disabled"])
+        self.status_value.set(f"Reading {Path(path).name}...")
+        self.root.after(IMPORT_POLL_MS, self._finish_import, results)
+
+    def _finish_import(self, results: queue.Queue) -> None:
+        try:
+            form, error = results.get_nowait()
+        except queue.Empty:
+            self.root.after(IMPORT_POLL_MS, self._finish_import, results)
+            return
+
+        self.import_button.state(["!disabled"])
+        if error is not None:
+            messagebox.showerror("Unable to import", str(error))
+            self.status_value.set("Ready")
+            return
+
+        known = {item.selector for item in self.items}
+        added = [
+            BuilderItem.from_discovered(element)
+            for element in form.elements
+            if element.selector not in known
+        ]
+        self.items.extend(added)
+        if added:
+            self.items_list.insert(tk.END, *(item.describe() for item in added))
+        if form.submit_selector and not self.submit_entry.get().strip():
+            self.submit_entry.insert(0, form.submit_selector)
+        self.status_value.set(
+            f"Imported {len(added)} form elements; select one to edit its value."
+        )
+
     def _save_config(self) -> None:
         url = self.url_entry.get().strip()
         if not url:
@@ -170,6 +275,8 @@ class FormBuilderApp:
             if item.kind == "field":
                 config.fields.append(FormField(selector=item.selector, value=item.value))
             elif item.kind == "checkbox":
+                if item.radio and not item.checked:
+                    continue
                 config.checkboxes.append(
                     CheckboxField(selector=item.selector, checked=item.checked)
                 )
@@ -194,6 +301,13 @@ class FormBuilderApp:
         self.status_value.set(f"Saved config to {path}.")
 
 
+def _discover_in_background(path: str, results: queue.Queue) -> None:
+    try:
+        results.put((discover_file(path), None))
+    except Exception as exc:
+        results.put((None, exc))
+
+
 def main() -> None:
     root = tk.Tk()
     style = ttk.Style(root)
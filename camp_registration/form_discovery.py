@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+import re
+from typing import Iterator
+
+from camp_registration.form_simulator import CHECKABLE_TYPES, Element, parse_html
+
+
+CHUNK_SIZE = 64 * 1024
+# Inputs a config has nothing to fill in for.
+SKIPPED_INPUT_TYPES = {"hidden", "submit", "button", "image", "reset", "file"}
+# Tried after id and name; these tend to survive page redesigns better than
+# document position.
+STABLE_ATTRS = ("data-testid", "data-test", "aria-label", "placeholder")
+# Label text never comes from these.
+NON_LABEL_TAGS = {"select", "option", "textarea", "script", "style"}
+_CSS_IDENTIFIER = re.compile(r"-?[A-Za-z_][\w-]*")
+
+
+@dataclass
+class DiscoveredElement:
+    kind: str  # "field", "checkbox" or "select", as in the config builder
+    selector: str
+    value: str = ""
+    checked: bool = False
+    options: list[str] = field(default_factory=list)
+    label: str = ""
+    radio: bool = False
+
+
+@dataclass
+class DiscoveredForm:
+    elements: list[DiscoveredElement]
+    submit_selector: str | None = None
+
+
+def read_chunks(path: Path | str, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    with open(path, encoding="utf-8", errors="replace") as handle:
+        yield from iter(partial(handle.read, chunk_size), "")
+
+
+def discover_file(path: Path | str) -> DiscoveredForm:
+    return discover_form(parse_html(read_chunks(path)))
+
+
+def discover_form(root: Element) -> DiscoveredForm:
+    # Every enabled input, textarea and select in document order, each with
+    # the shortest selector that matches it and nothing else on the page.
+    elements = list(_walk(root))
+    selectors = _SelectorBuilder(elements)
+    labels = {
+        element.attrs["for"]: _text(element)
+        for element in elements
+        if element.tag == "label" and "for" in element.attrs
+    }
+
+    discovered: list[DiscoveredElement] = []
+    submit_selector = None
+    for element in elements:
+        if element.disabled:
+            continue
+        if element.is_submit:
+            if submit_selector is None:
+                submit_selector = selectors.selector(element)
+            continue
+        kind = _kind(element)
+        if kind is None:
+            continue
+        item = DiscoveredElement(
+            kind=kind,
+            selector=selectors.selector(element),
+            label=_label(element, labels),
+        )
+        if kind == "select":
+            item.options = [option.option_value() for option in element.options()]
+            item.value = element.selected_value()
+        elif kind == "checkbox":
+            item.checked = element.checked
+            item.radio = element.input_type == "radio"
+        else:
+            item.value = element.value or element.text.strip()
+        discovered.append(item)
+    return DiscoveredForm(discovered, submit_selector)
+
+
+def _kind(element: Element) -> str | None:
+    if element.tag == "select":
+        return "select"
+    if element.tag == "textarea":
+        return "field"
+    if element.tag != "input" or element.input_type in SKIPPED_INPUT_TYPES:
+        return None
+    return "checkbox" if element.input_type in CHECKABLE_TYPES else "field"
+
+
+class _SelectorBuilder:
+    # Uniqueness is decided from counts taken in one pass over the page, so a
+    # multi-megabyte snapshot is never re-scanned per candidate selector.
+
+    def __init__(self, elements: list[Element]) -> None:
+        self.ids = Counter(
+            element.attrs["id"] for element in elements if "id" in element.attrs
+        )
+        self.attrs: Counter = Counter()
+        self.name_values: Counter = Counter()
+        for element in elements:
+            for name in ("name", *STABLE_ATTRS):
+                if name in element.attrs:
+                    self.attrs[element.tag, name, element.attrs[name]] += 1
+            if "name" in element.attrs and "value" in element.attrs:
+                self.name_values[
+                    element.tag, element.attrs["name"], element.attrs["value"]
+                ] += 1
+
+    def selector(self, element: Element) -> str:
+        element_id = element.attrs.get("id")
+        if element_id and self.ids[element_id] == 1:
+            if _CSS_IDENTIFIER.fullmatch(element_id):
+                return f"#{element_id}"
+            quoted = _quote(element_id)
+            if quoted:
+                return f"{element.tag}[id={quoted}]"
+        for name in ("name", *STABLE_ATTRS):
+            value = element.attrs.get(name)
+            if value and self.attrs[element.tag, name, value] == 1 and _quote(value):
+                return f"{element.tag}[{name}={_quote(value)}]"
+        # Checkbox and radio groups share a name; the value tells them apart.
+        name, value = element.attrs.get("name"), element.attrs.get("value")
+        if (
+            name
+            and value is not None
+            and self.name_values[element.tag, name, value] == 1
+            and _quote(name)
+            and _quote(value)
+        ):
+            return f"{element.tag}[name={_quote(name)}][value={_quote(value)}]"
+        return self._path(element)
+
+    def _path(self, element: Element) -> str:
+        # Child steps up to the nearest ancestor with a unique id, or to the
+        # top of the document.
+        parts = []
+        node = element
+        while node.parent is not None:
+            node_id = node.attrs.get("id")
+            if (
+                node is not element
+                and node_id
+                and self.ids[node_id] == 1
+                and _CSS_IDENTIFIER.fullmatch(node_id)
+            ):
+                parts.append(f"#{node_id}")
+                break
+            same_tag = [
+                sibling for sibling in node.parent.children if sibling.tag == node.tag
+            ]
+            if len(same_tag) == 1:
+                parts.append(node.tag)
+            else:
+                parts.append(f"{node.tag}:nth-of-type({same_tag.index(node) + 1})")
+            node = node.parent
+        return " > ".join(reversed(parts))
+
+
+def _quote(value: str) -> str | None:
+    # The selector engines disagree on escapes, so values needing one are
+    # left to the next candidate.
+    if "\\" in value or "\n" in value:
+        return None
+    if '"' not in value:
+        return f'"{value}"'
+    if "'" not in value:
+        return f"'{value}'"
+    return None
+
+
+def _label(element: Element, labels: dict[str, str]) -> str:
+    text = labels.get(element.attrs.get("id", ""))
+    if not text:
+        wrapping = element.closest("label")
+        text = _text(wrapping) if wrapping is not None else ""
+    return (
+        text
+        or element.attrs.get("aria-label")
+        or element.attrs.get("placeholder")
+        or element.attrs.get("name", "")
+    )
+
+
+def _text(element: Element) -> str:
+    parts, stack = [], [element]
+    while stack:
+        node = stack.pop()
+        if node.tag in NON_LABEL_TAGS:
+            continue
+        parts.append(node.text)
+        stack.extend(reversed(node.children))
+    return " ".join(" ".join(parts).split())
+
+
+def _walk(root: Element) -> Iterator[Element]:
+    # Iterative, so badly nested pages cannot hit the recursion limit.
+    stack = list(reversed(root.children))
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(reversed(node.children))
@@ -0,0 +1,505 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import functools
+from html.parser import HTMLParser
+import re
+from types import SimpleNamespace
+from typing import Iterable, Iterator
+
+
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+# Opening one of these closes an unfinished sibling of the same kind, the way
+# browsers treat a run of <option> or <li> tags without end tags.
+SELF_CLOSING_SIBLINGS = {"option", "li", "p", "tr", "td", "th"}
+# Browsers wrap rows written straight under <table> in an implicit <tbody>,
+# which selectors built from this tree have to include.
+TABLE_SECTIONS = {"thead", "tbody", "tfoot"}
+TEXT_INPUT_TYPES = {
+    "", "text", "email", "tel", "number", "password", "search", "url",
+    "date", "datetime-local", "month", "time", "week", "color", "range", "hidden",
+}
+CHECKABLE_TYPES = {"checkbox", "radio"}
+
+_SELECTOR_TOKEN = re.compile(
+    r"""
+    \s*(?P<combinator>[>+~])\s*
+    | (?P<space>\s+)
+    | (?P<tag>\*|[a-zA-Z][\w-]*)
+    | \#(?P<id>[\w-]+)
+    | \.(?P<cls>[\w-]+)
+    | \[\s*(?P<attr>[\w:-]+)\s*
+        (?:(?P<op>[~^$*|]?=)\s*
+           (?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<bare>[^\]\s]+))\s*)?
+      \]
+    | :(?P<pseudo>[\w-]+)(?:\(\s*(?P<nth>\d+)\s*\))?
+    """,
+    re.VERBOSE,
+)
+SUPPORTED_PSEUDOS = {"checked", "disabled", "enabled", "first-child", "last-child"}
+
+
+class UnsupportedSelector(ValueError):
+    pass
+
+
+@dataclass(eq=False)
+class Element:
+    tag: str
+    attrs: dict[str, str]
+    parent: Element | None = None
+    children: list[Element] = field(default_factory=list)
+    text: str = ""
+    value: str | None = None
+    checked: bool = False
+
+    def __post_init__(self) -> None:
+        if self.tag in ("input", "textarea"):
+            self.value = self.attrs.get("value", "")
+        self.checked = "checked" in self.attrs
+
+    @property
+    def input_type(self) -> str:
+        return self.attrs.get("type", "").lower()
+
+    @property
+    def disabled(self) -> bool:
+        return "disabled" in self.attrs
+
+    @property
+    def is_submit(self) -> bool:
+        if self.tag == "button":
+            return self.input_type in ("", "submit")
+        return self.tag == "input" and self.input_type in ("submit", "image")
+
+    def iter(self) -> Iterator[Element]:
+        for child in self.children:
+            yield child
+            yield from child.iter()
+
+    def closest(self, tag: str) -> Element | None:
+        node = self.parent
+        while node is not None and node.tag != tag:
+            node = node.parent
+        return node
+
+    def options(self) -> list[Element]:
+        return [node for node in self.iter() if node.tag == "option"]
+
+    def option_value(self) -> str:
+        return self.attrs.get("value", self.text.strip())
+
+    def selected_value(self) -> str:
+        options = self.options()
+        chosen = next((option for option in options if option.checked), None)
+        if chosen is None:
+            chosen = next((option for option in options if "selected" in option.attrs), None)
+        if chosen is None and options:
+            chosen = options[0]
+        return "" if chosen is None else chosen.option_value()
+
+    def describe(self) -> str:
+        if "id" in self.attrs:
+            return f"<{self.tag} id={self.attrs['id']!r}>"
+        if "name" in self.attrs:
+            return f"<{self.tag} name={self.attrs['name']!r}>"
+        return f"<{self.tag}>"
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.root = Element("#document", {})
+        self._stack = [self.root]
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in SELF_CLOSING_SIBLINGS and self._stack[-1].tag == tag:
+            self._stack.pop()
+        if tag in TABLE_SECTIONS and self._stack[-1].tag in TABLE_SECTIONS:
+            self._stack.pop()
+        if tag == "tr" and self._stack[-1].tag == "table":
+            self.handle_starttag("tbody", [])
+        parent = self._stack[-1]
+        element = Element(tag, {name: value or "" for name, value in attrs}, parent)
+        parent.children.append(element)
+        if tag not in VOID_TAGS:
+            self._stack.append(element)
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        parent = self._stack[-1]
+        element = Element(tag, {name: value or "" for name, value in attrs}, parent)
+        parent.children.append(element)
+
+    def handle_endtag(self, tag: str) -> None:
+        for depth in range(len(self._stack) - 1, 0, -1):
+            if self._stack[depth].tag == tag:
+                del self._stack[depth:]
+                return
+
+    def handle_data(self, data: str) -> None:
+        self._stack[-1].text += data
+
+
+def parse_html(html: str | Iterable[str]) -> Element:
+    # Accepts the whole page or an iterable of chunks, so large saved pages can
+    # be fed straight from the file.
+    builder = _TreeBuilder()
+    for chunk in (html,) if isinstance(html, str) else html:
+        builder.feed(chunk)
+    builder.close()
+    return builder.root
+
+
+@dataclass
+class _Compound:
+    tag: str | None = None
+    ids: list[str] = field(default_factory=list)
+    classes: list[str] = field(default_factory=list)
+    attrs: list[tuple[str, str | None, str | None]] = field(default_factory=list)
+    pseudos: list[str] = field(default_factory=list)
+
+    def matches(self, element: Element) -> bool:
+        if self.tag is not None and self.tag != element.tag:
+            return False
+        if any(element.attrs.get("id") != value for value in self.ids):
+            return False
+        classes = element.attrs.get("class", "").split()
+        if any(value not in classes for value in self.classes):
+            return False
+        for name, op, expected in self.attrs:
+            actual = element.attrs.get(name)
+            if actual is None or not _attr_matches(actual, op, expected):
+                return False
+        return all(_pseudo_matches(element, pseudo) for pseudo in self.pseudos)
+
+
+def _attr_matches(actual: str, op: str | None, expected: str | None) -> bool:
+    if op is None:
+        return True
+    if op == "=":
+        return actual == expected
+    if op == "~=":
+        return expected in actual.split()
+    if op == "^=":
+        return bool(expected) and actual.startswith(expected)
+    if op == "$=":
+        return bool(expected) and actual.endswith(expected)
+    if op == "*=":
+        return bool(expected) and expected in actual
+    return actual == expected or actual.startswith(f"{expected}-")
+
+
+def _pseudo_matches(element: Element, pseudo: str) -> bool:
+    if pseudo == "checked":
+        return element.checked
+    if pseudo == "disabled":
+        return element.disabled
+    if pseudo == "enabled":
+        return not element.disabled
+    siblings = element.parent.children if element.parent else [element]
+    if pseudo == "first-child":
+        return siblings[0] is element
+    if pseudo == "last-child":
+        return siblings[-1] is element
+    # nth-of-type(N), the only functional pseudo-class supported.
+    position = int(pseudo[len("nth-of-type(") : -1])
+    same_tag = [node for node in siblings if node.tag == element.tag]
+    return len(same_tag) >= position > 0 and same_tag[position - 1] is element
+
+
+# Roster runs validate the same template selectors for every camper, so each
+# distinct selector is parsed once.
+@functools.lru_cache(maxsize=1024)
+def compile_selector(selector: str) -> list[list[tuple[str | None, _Compound]]]:
+    # Supports the CSS subset registration configs use: type, #id, .class,
+    # attribute selectors, a few pseudo-classes (plus :nth-of-type(N)) and the
+    # four combinators.
+    # Playwright-only engines (text=, xpath=, >>, :has-text) raise.
+    if "=" in selector.split("[", 1)[0] or ">>" in selector or selector.startswith("//"):
+        raise UnsupportedSelector(f"Selector {selector!r} needs a browser to resolve.")
+
+    groups = []
+    for part in _split_groups(selector):
+        chain: list[tuple[str | None, _Compound]] = []
+        compound = _Compound()
+        combinator: str | None = None
+        position = 0
+        while position < len(part):
+            match = _SELECTOR_TOKEN.match(part, position)
+            if match is None or match.end() == position:
+                raise UnsupportedSelector(f"Cannot parse selector {selector!r}.")
+            position = match.end()
+            if match.group("combinator") or match.group("space"):
+                if compound == _Compound():
+                    raise UnsupportedSelector(f"Cannot parse selector {selector!r}.")
+                chain.append((combinator, compound))
+                compound = _Compound()
+                combinator = match.group("combinator") or " "
+                continue
+            if match.group("tag"):
+                tag = match.group("tag").lower()
+                compound.tag = None if tag == "*" else tag
+            elif match.group("id"):
+                compound.ids.append(match.group("id"))
+            elif match.group("cls"):
+                compound.classes.append(match.group("cls"))
+            elif match.group("attr"):
+                value = match.group("dq")
+                if value is None:
+                    value = match.group("sq")
+                if value is None:
+                    value = match.group("bare")
+                compound.attrs.append((match.group("attr").lower(), match.group("op"), value))
+            else:
+                pseudo = match.group("pseudo")
+                if pseudo == "nth-of-type" and match.group("nth") is not None:
+                    pseudo = f"nth-of-type({match.group('nth')})"
+                elif match.group("nth") is not None or pseudo not in SUPPORTED_PSEUDOS:
+                    raise UnsupportedSelector(
+                        f"Selector {selector!r} needs a browser to resolve."
+                    )
+                compound.pseudos.append(pseudo)
+        if compound == _Compound():
+            raise UnsupportedSelector(f"Cannot parse selector {selector!r}.")
+        chain.append((combinator, compound))
+        groups.append(chain)
+    return groups
+
+
+def _split_groups(selector: str) -> list[str]:
+    groups, depth, start = [], 0, 0
+    quote = None
+    for position, char in enumerate(selector):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            groups.append(selector[start:position].strip())
+            start = position + 1
+    groups.append(selector[start:].strip())
+    return groups
+
+
+def _chain_matches(element: Element, chain, index: int) -> bool:
+    combinator, compound = chain[index]
+    if not compound.matches(element):
+        return False
+    if index == 0:
+        return True
+    if combinator == ">":
+        parent = element.parent
+        return parent is not None and _chain_matches(parent, chain, index - 1)
+    if combinator == " ":
+        node = element.parent
+        while node is not None:
+            if _chain_matches(node, chain, index - 1):
+                return True
+            node = node.parent
+        return False
+    siblings = element.parent.children if element.parent else [element]
+    before = siblings[: siblings.index(element)]
+    if combinator == "+":
+        return bool(before) and _chain_matches(before[-1], chain, index - 1)
+    return any(_chain_matches(node, chain, index - 1) for node in before)
+
+
+def select_all(root: Element, selector: str) -> list[Element]:
+    groups = compile_selector(selector)
+    return [
+        element
+        for element in root.iter()
+        if any(_chain_matches(element, chain, len(chain) - 1) for chain in groups)
+    ]
+
+
+@dataclass
+class ValidationIssue:
+    action: str
+    selector: str | None
+    message: str
+    severity: str = "error"
+
+    def __str__(self) -> str:
+        target = f" {self.selector!r}" if self.selector else ""
+        return f"{self.severity}: {self.action}{target}: {self.message}"
+
+
+class SimulatedPage:
+    # Stands in for a Playwright page so _fill_form can drive a config against
+    # a saved copy of the form. Problems are collected rather than raised, so
+    # one pass reports every broken selector.
+
+    def __init__(self, html: str) -> None:
+        self.document = parse_html(html)
+        self.issues: list[ValidationIssue] = []
+        self.url: str | None = None
+
+    def goto(self, url: str, **kwargs) -> None:
+        self.url = url
+
+    def fill(self, selector: str, value: str, **kwargs) -> None:
+        element = self._resolve("fill", selector)
+        if element is None:
+            return
+        if element.tag == "textarea" or (
+            element.tag == "input" and element.input_type in TEXT_INPUT_TYPES
+        ):
+            element.value = value
+        else:
+            self._issue("fill", selector, f"{element.describe()} is not a text input.")
+
+    def check(self, selector: str, **kwargs) -> None:
+        self._set_checked("check", selector, True)
+
+    def uncheck(self, selector: str, **kwargs) -> None:
+        self._set_checked("uncheck", selector, False)
+
+    def select_option(self, selector: str, value: str, **kwargs) -> None:
+        element = self._resolve("select_option", selector)
+        if element is None:
+            return
+        if element.tag != "select":
+            self._issue("select_option", selector, f"{element.describe()} is not a <select>.")
+            return
+        options = element.options()
+        chosen = next(
+            (
+                option
+                for option in options
+                if value in (option.option_value(), option.text.strip())
+            ),
+            None,
+        )
+        if chosen is None:
+            available = ", ".join(repr(option.option_value()) for option in options)
+            self._issue(
+                "select_option",
+                selector,
+                f"No option with value or label {value!r} (options: {available or 'none'}).",
+            )
+            return
+        for option in options:
+            option.checked = option is chosen
+
+    def click(self, selector: str, **kwargs) -> None:
+        element = self._resolve("click", selector)
+        if element is not None and element.is_submit:
+            form = element.closest("form")
+            if form is not None:
+                self._check_required(form)
+
+    def evaluate(self, script: str, arg=None):
+        # Scripts are not run; reporting every fast-fill item as failed makes
+        # _form_steps fall back to the per-element calls checked above.
+        return list(range(len(arg))) if isinstance(arg, list) else None
+
+    @contextmanager
+    def expect_response(self, pattern: str, **kwargs):
+        yield SimpleNamespace(value=None)
+
+    def wait_for_timeout(self, timeout: float) -> None:
+        pass
+
+    def wait_for_selector(self, selector: str, **kwargs) -> None:
+        # Usually targets a later page (a confirmation message), so only the
+        # syntax can be checked here.
+        self._compile("wait_for_selector", selector)
+
+    def wait_for_url(self, url: str, **kwargs) -> None:
+        pass
+
+    def wait_for_load_state(self, state: str = "load", **kwargs) -> None:
+        pass
+
+    def _compile(self, action: str, selector: str) -> bool:
+        try:
+            compile_selector(selector)
+        except UnsupportedSelector as exc:
+            self._issue(action, selector, str(exc), severity="warning")
+            return False
+        return True
+
+    def _resolve(self, action: str, selector: str) -> Element | None:
+        if not self._compile(action, selector):
+            return None
+        matches = select_all(self.document, selector)
+        if not matches:
+            self._issue(action, selector, "No element matches this selector.")
+            return None
+        element = matches[0]
+        if len(matches) > 1:
+            # page.fill/check/click act on the first match, which may not be
+            # the element the config meant.
+            self._issue(
+                action,
+                selector,
+                f"Selector matches {len(matches)} elements; "
+                f"the first, {element.describe()}, is used.",
+                severity="warning",
+            )
+        if element.disabled:
+            self._issue(action, selector, f"{element.describe()} is disabled.")
+            return None
+        return element
+
+    def _set_checked(self, action: str, selector: str, checked: bool) -> None:
+        element = self._resolve(action, selector)
+        if element is None:
+            return
+        if element.tag != "input" or element.input_type not in CHECKABLE_TYPES:
+            self._issue(action, selector, f"{element.describe()} is not a checkbox or radio.")
+            return
+        if element.input_type == "radio" and not checked:
+            self._issue(action, selector, "Radio buttons cannot be unchecked.")
+            return
+        if element.input_type == "radio":
+            form = element.closest("form") or self.document
+            for node in form.iter():
+                if _same_radio_group(node, element):
+                    node.checked = False
+        element.checked = checked
+
+    def _check_required(self, form: Element) -> None:
+        for element in form.iter():
+            if "required" not in element.attrs or element.disabled:
+                continue
+            if element.tag == "input" and element.input_type in CHECKABLE_TYPES:
+                missing = not element.checked
+                if element.input_type == "radio":
+                    missing = not any(
+                        node.checked for node in form.iter() if _same_radio_group(node, element)
+                    )
+                reason = "is required but not checked"
+            elif element.tag == "select":
+                missing = not element.selected_value()
+                reason = "is required but no option is selected"
+            elif element.tag in ("input", "textarea"):
+                missing = not element.value
+                reason = "is required but empty"
+            else:
+                continue
+            if missing:
+                self._issue("submit", None, f"{element.describe()} {reason}.")
+
+    def _issue(
+        self, action: str, selector: str | None, message: str, severity: str = "error"
+    ) -> None:
+        self.issues.append(ValidationIssue(action, selector, message, severity))
+
+
+def _same_radio_group(node: Element, radio: Element) -> bool:
+    return (
+        node.tag == "input"
+        and node.input_type == "radio"
+        and node.attrs.get("name") == radio.attrs.get("name")
+    )
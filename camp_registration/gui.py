@@ -1,14 +1,125 @@
 from __future__ import annotations
 
+import math
+import queue
+import re
 import sys
+import threading
 import tkinter as tk
 from pathlib import Path
-from tkinter import filedialog, messagebox, ttk
+from tkinter import filedialog, font as tkfont, messagebox, ttk
+from typing import Callable, Sequence
 
 if __package__ in {None, ""}:
     sys.path.append(str(Path(__file__).resolve().parents[1]))
 
-from camp_registration.registry import CampRegistry, DEFAULT_SESSIONS
+from camp_registration.registry import CampRegistry, Camper, DEFAULT_SESSIONS
+from camp_registration.streaming import is_ndjson
+
+
+FILE_TYPES = [
+    ("JSON files", "*.json"),
+    ("NDJSON files", "*.ndjson *.jsonl"),
+    ("All files", "*"),
+]
+LOAD_POLL_MS = 50
+FILTER_DELAY_MS = 150
+AGE_QUERY = re.compile(r"(\d+)(?:\s*-\s*(\d+))?")
+
+
+def load_registry(path: Path | str) -> CampRegistry:
+    registry = CampRegistry()
+    if is_ndjson(path):
+        registry.load_from_ndjson(path)
+    else:
+        registry.load_from_json(path)
+    return registry
+
+
+def filter_campers(registry: CampRegistry, query: str) -> Sequence[Camper]:
+    # A session name, an age ("12") or an age range ("10-12") is answered from
+    # the registry indexes; anything else matches names case-insensitively.
+    query = query.strip()
+    if not query:
+        return registry.campers
+    if query.lower() in registry.allowed_sessions:
+        return registry.by_session(query)
+    match = AGE_QUERY.fullmatch(query)
+    if match:
+        low, high = int(match[1]), int(match[2] or match[1])
+        return registry.by_age_range(min(low, high), max(low, high))
+    needle = query.casefold()
+    return [camper for camper in registry.campers if needle in camper.name.casefold()]
+
+
+def format_camper(camper: Camper) -> str:
+    return f"{camper.name} (age {camper.age}) - {camper.session}"
+
+
+class VirtualList:
+    # A Listbox that only ever holds the rows currently on screen. The
+    # scrollbar is driven from `first` and len(rows), and scrolling re-renders
+    # the window, so showing 100k campers costs the same as showing ten.
+
+    def __init__(
+        self, parent: tk.Misc, format_row: Callable[[object], str], height: int = 8
+    ) -> None:
+        self.format_row = format_row
+        self.rows: Sequence[object] = ()
+        self.first = 0
+        self.listbox = tk.Listbox(parent, height=height)
+        self.scrollbar = ttk.Scrollbar(parent, orient=tk.VERTICAL, command=self._scroll)
+        self._font = tkfont.Font(root=parent, font=self.listbox.cget("font"))
+        self.listbox.bind("<Configure>", lambda event: self.render())
+        self.listbox.bind("<MouseWheel>", self._on_wheel)
+        self.listbox.bind("<Button-4>", lambda event: self._scroll_by(-3))
+        self.listbox.bind("<Button-5>", lambda event: self._scroll_by(3))
+
+    def show(self, rows: Sequence[object], first: int = 0) -> None:
+        self.rows = rows
+        self.first = first
+        self.render()
+
+    def render(self) -> None:
+        visible = self._visible_rows()
+        self.first = max(0, min(self.first, len(self.rows) - visible))
+        window = self.rows[self.first : self.first + visible]
+        self.listbox.delete(0, tk.END)
+        if window:
+            self.listbox.insert(tk.END, *map(self.format_row, window))
+        total = len(self.rows)
+        if total <= visible:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(self.first / total, (self.first + visible) / total)
+
+    def _visible_rows(self) -> int:
+        # Tk draws each listbox line at linespace + 1 pixels.
+        inset = 2 * (
+            int(self.listbox.cget("borderwidth"))
+            + int(self.listbox.cget("highlightthickness"))
+        )
+        line = self._font.metrics("linespace") + 1
+        return max(1, math.ceil((self.listbox.winfo_height() - inset) / line))
+
+    def _scroll(self, action: str, amount: str, unit: str | None = None) -> None:
+        if action == "moveto":
+            self.first = int(float(amount) * len(self.rows))
+            self.render()
+        elif unit == "pages":
+            self._scroll_by(int(amount) * self._visible_rows())
+        else:
+            self._scroll_by(int(amount))
+
+    def _scroll_by(self, rows: int) -> str:
+        self.first += rows
+        self.render()
+        return "break"
+
+    def _on_wheel(self, event: tk.Event) -> str:
+        # Windows reports multiples of 120 per notch, macOS small deltas.
+        steps = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self._scroll_by(-3 * steps)
 
 
 class CampRegistrationApp:
@@ -18,6 +129,7 @@ class CampRegistrationApp:
         self.root.title("Camp Registration")
         self.root.geometry("640x420")
         self.root.minsize(560, 380)
+        self._filter_job: str | None = None
 
         self._build_layout()
 
@@ -60,26 +172,34 @@ class CampRegistrationApp:
         list_frame = ttk.LabelFrame(content, text="Registered campers")
         list_frame.pack(fill=tk.BOTH, expand=True)
 
-        self.campers_list = tk.Listbox(list_frame, height=8)
-        self.campers_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=8, pady=8)
+        filter_row = ttk.Frame(list_frame)
+        filter_row.pack(fill=tk.X, padx=8, pady=(8, 0))
+        ttk.Label(filter_row, text="Filter").pack(side=tk.LEFT)
+        self.filter_value = tk.StringVar()
+        self.filter_value.trace_add("write", lambda *_: self._schedule_filter())
+        ttk.Entry(filter_row, textvariable=self.filter_value).pack(
+            side=tk.LEFT, fill=tk.X, expand=True, padx=(8, 0)
+        )
 
-        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL)
-        scrollbar.config(command=self.campers_list.yview)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y, pady=8)
-        self.campers_list.config(yscrollcommand=scrollbar.set)
+        self.campers_list = VirtualList(list_frame, format_camper)
+        self.campers_list.listbox.pack(
+            side=tk.LEFT, fill=tk.BOTH, expand=True, padx=8, pady=8
+        )
+        self.campers_list.scrollbar.pack(side=tk.RIGHT, fill=tk.Y, pady=8)
 
         actions = ttk.Frame(self.root, padding=(16, 8))
         actions.pack(fill=tk.X)
 
-        ttk.Button(actions, text="Load from JSON", command=self._load_json).pack(
-            side=tk.LEFT, padx=4
-        )
-        ttk.Button(actions, text="Export to JSON", command=self._export_json).pack(
-            side=tk.LEFT, padx=4
-        )
-        ttk.Button(actions, text="Clear", command=self._clear_list).pack(
-            side=tk.RIGHT, padx=4
-        )
+        # Disabled while a file loads, since the load replaces the roster.
+        self.busy_buttons = [
+            register_button,
+            ttk.Button(actions, text="Load from JSON", command=self._load_json),
+            ttk.Button(actions, text="Export to JSON", command=self._export_json),
+            ttk.Button(actions, text="Clear", command=self._clear_list),
+        ]
+        for button in self.busy_buttons[1:3]:
+            button.pack(side=tk.LEFT, padx=4)
+        self.busy_buttons[3].pack(side=tk.RIGHT, padx=4)
 
         self.status_value = tk.StringVar(value="Ready")
         status = ttk.Label(self.root, textvariable=self.status_value, anchor=tk.W)
@@ -102,47 +222,84 @@ class CampRegistrationApp:
             messagebox.showerror("Unable to register", str(exc))
             return
 
-        self._add_camper_to_list(camper)
+        self._refresh_list(keep_position=True)
         self.status_value.set(f"Registered {camper.name} for {camper.session}.")
         self.name_entry.delete(0, tk.END)
         self.age_entry.delete(0, tk.END)
         self.name_entry.focus_set()
 
-    def _add_camper_to_list(self, camper) -> None:
-        self.campers_list.insert(
-            tk.END, f"{camper.name} (age {camper.age}) - {camper.session}"
-        )
+    def _refresh_list(self, keep_position: bool = False) -> None:
+        query = self.filter_value.get()
+        rows = filter_campers(self.registry, query)
+        first = self.campers_list.first if keep_position else 0
+        self.campers_list.show(rows, first)
+        if query.strip():
+            self.status_value.set(
+                f"Showing {len(rows)} of {len(self.registry.campers)} campers."
+            )
+
+    def _schedule_filter(self) -> None:
+        # Wait for a pause in typing before searching a large roster.
+        if self._filter_job is not None:
+            self.root.after_cancel(self._filter_job)
+        self._filter_job = self.root.after(FILTER_DELAY_MS, self._apply_filter)
+
+    def _apply_filter(self) -> None:
+        self._filter_job = None
+        self._refresh_list()
 
     def _load_json(self) -> None:
         path = filedialog.askopenfilename(
             title="Load campers",
-            filetypes=[("JSON files", "*.json"), ("All files", "*")],
+            filetypes=FILE_TYPES,
         )
         if not path:
             return
 
+        # Parse on a worker thread into a fresh registry; Tk is only touched
+        # from the main thread, which polls for the result.
+        results: queue.Queue = queue.Queue(maxsize=1)
+        threading.Thread(
+            target=_load_in_background, args=(path, results), daemon=True
+        ).start()
+        self._set_busy(True)
+        self.status_value.set(f"Loading {Path(path).name}...")
+        self.root.after(LOAD_POLL_MS, self._finish_load, results)
+
+    def _finish_load(self, results: queue.Queue) -> None:
         try:
-            self.registry.load_from_json(path)
-        except (OSError, ValueError) as exc:
-            messagebox.showerror("Unable to load", str(exc))
+            registry, error = results.get_nowait()
+        except queue.Empty:
+            self.root.after(LOAD_POLL_MS, self._finish_load, results)
             return
 
-        self.campers_list.delete(0, tk.END)
-        for camper in self.registry.list_campers():
-            self._add_camper_to_list(camper)
+        self._set_busy(False)
+        if error is not None:
+            messagebox.showerror("Unable to load", str(error))
+            self.status_value.set("Ready")
+            return
+        self.registry = registry
         self.status_value.set(f"Loaded {len(self.registry.campers)} campers.")
+        self._refresh_list()
+
+    def _set_busy(self, busy: bool) -> None:
+        for button in self.busy_buttons:
+            button.state(["disabled"] if busy else ["!disabled"])
 
     def _export_json(self) -> None:
         path = filedialog.asksaveasfilename(
             title="Export campers",
             defaultextension=".json",
-            filetypes=[("JSON files", "*.json"), ("All files", "*")],
+            filetypes=FILE_TYPES,
         )
         if not path:
             return
 
         try:
-            self.registry.export_json(path)
+            if is_ndjson(path):
+                self.registry.export_ndjson(path)
+            else:
+                self.registry.export_json(path)
         except OSError as exc:
             messagebox.showerror("Unable to export", str(exc))
             return
@@ -150,11 +307,18 @@ class CampRegistrationApp:
         self.status_value.set(f"Exported {len(self.registry.campers)} campers.")
 
     def _clear_list(self) -> None:
-        self.registry.campers.clear()
-        self.campers_list.delete(0, tk.END)
+        self.registry.clear()
+        self._refresh_list()
         self.status_value.set("Cleared all campers.")
 
 
+def _load_in_background(path: str, results: queue.Queue) -> None:
+    try:
+        results.put((load_registry(path), None))
+    except Exception as exc:
+        results.put((None, exc))
+
+
 def main() -> None:
     root = tk.Tk()
     style = ttk.Style(root)
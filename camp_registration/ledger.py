@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+import time
+from typing import Any
+
+# "submitting" is written just before the submit click. If it is the last
+# record for a key the run died mid-submit, so the form may have gone through
+# and the entry must not be sent again without a manual check.
+SUBMITTING = "submitting"
+OK = "ok"
+FAILED = "failed"
+UNCERTAIN = "uncertain"
+DONE_STATUSES = {OK, SUBMITTING, UNCERTAIN}
+
+
+def config_key(config_dict: dict[str, Any]) -> str:
+    # Expanded configs carry the camper's values, so hashing what a config
+    # submits identifies one camper's submission to one form.
+    payload = json.dumps(config_dict, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SubmissionLedger:
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        self.entries: dict[str, dict[str, Any]] = {}
+        self._load()
+        # Kept open so each record is a single buffered write plus flush; the
+        # ledger does not fsync, trading power-loss safety for a fast loop.
+        self._fp = self.path.open("a", encoding="utf-8")
+
+    def __enter__(self) -> SubmissionLedger:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def status(self, key: str) -> str | None:
+        entry = self.entries.get(key)
+        return None if entry is None else entry["status"]
+
+    def is_done(self, key: str) -> bool:
+        return self.status(key) in DONE_STATUSES
+
+    def record(self, key: str, status: str, **details: Any) -> None:
+        entry = {"key": key, "status": status, "at": round(time.time(), 3), **details}
+        self.entries[key] = entry
+        self._fp.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self._fp.flush()
+
+    def counts(self) -> dict[str, int]:
+        counts: dict[str, int] = {}
+        for entry in self.entries.values():
+            counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+        return counts
+
+    def close(self) -> None:
+        self._fp.close()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        good_offset = 0
+        with self.path.open("rb") as fp:
+            for line in fp:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                self.entries[entry["key"]] = entry
+                good_offset += len(line)
+        if good_offset != self.path.stat().st_size:
+            # Same rule as the registry journal: drop a torn last line.
+            with self.path.open("r+b") as fp:
+                fp.truncate(good_offset)
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import bisect
+from contextlib import contextmanager
+import functools
+import json
+import logging
+import os
+from pathlib import Path
+import sys
+import threading
+import time
+from typing import Any, Callable, Iterator, Protocol
+
+
+# Upper bounds in seconds, from a cached registry lookup up to a slow page load.
+DEFAULT_BUCKETS = (
+    0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+REGISTRY_METRIC = "camp_registry_operation_seconds"
+FORM_STEP_METRIC = "camp_form_step_seconds"
+
+
+class Sink(Protocol):
+    def observe(self, metric: str, seconds: float, labels: dict[str, str]) -> None: ...
+
+    def flush(self) -> None: ...
+
+
+@contextmanager
+def timer(sink: Sink, metric: str, **labels: str) -> Iterator[None]:
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        sink.observe(metric, time.perf_counter() - started, dict(labels, outcome=outcome))
+
+
+def timed(operation: str) -> Callable:
+    # Times a method of an object with a `metrics` attribute. With no sink set
+    # the only cost is one attribute check per call.
+    def decorate(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            sink = self.metrics
+            if sink is None:
+                return method(self, *args, **kwargs)
+            with timer(sink, REGISTRY_METRIC, operation=operation):
+                return method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+class _Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self, buckets: int) -> None:
+        self.counts = [0] * (buckets + 1)
+        self.total = 0.0
+        self.count = 0
+
+
+class HistogramSink:
+    # Aggregates observations into count/sum/bucket histograms per metric and
+    # label set; subclasses decide where snapshots are written.
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._histograms: dict[tuple[str, tuple[tuple[str, str], ...]], _Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, metric: str, seconds: float, labels: dict[str, str]) -> None:
+        key = (metric, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(len(self.buckets))
+            histogram.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            histogram.total += seconds
+            histogram.count += 1
+
+    def snapshot(self) -> dict[str, list[dict[str, Any]]]:
+        metrics: dict[str, list[dict[str, Any]]] = {}
+        with self._lock:
+            for (metric, labels), histogram in sorted(self._histograms.items()):
+                cumulative, buckets = 0, {}
+                for bound, count in zip((*self.buckets, "+Inf"), histogram.counts):
+                    cumulative += count
+                    buckets[str(bound)] = cumulative
+                metrics.setdefault(metric, []).append(
+                    {
+                        "labels": dict(labels),
+                        "count": histogram.count,
+                        "sum": round(histogram.total, 6),
+                        "buckets": buckets,
+                    }
+                )
+        return metrics
+
+    def to_prometheus(self) -> str:
+        lines = []
+        for metric, series in self.snapshot().items():
+            lines.append(f"# TYPE {metric} histogram")
+            for entry in series:
+                labels = entry["labels"]
+                for bound, count in entry["buckets"].items():
+                    lines.append(f"{metric}_bucket{_labels(labels, le=bound)} {count}")
+                lines.append(f"{metric}_sum{_labels(labels)} {entry['sum']}")
+                lines.append(f"{metric}_count{_labels(labels)} {entry['count']}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def flush(self) -> None:
+        pass
+
+
+class PrometheusFileSink(HistogramSink):
+    # For node_exporter's textfile collector: flush() atomically rewrites the
+    # file with the current histograms.
+
+    def __init__(
+        self, path: Path | str, buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> None:
+        super().__init__(buckets)
+        self.path = Path(path)
+
+    def flush(self) -> None:
+        _write_atomic(self.path, self.to_prometheus())
+
+
+class JsonFileSink(HistogramSink):
+    def __init__(
+        self, path: Path | str, buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> None:
+        super().__init__(buckets)
+        self.path = Path(path)
+
+    def flush(self) -> None:
+        _write_atomic(self.path, json.dumps(self.snapshot(), indent=2) + "\n")
+
+
+class LogSink:
+    # One log line per observation, for ad-hoc tracing rather than dashboards.
+
+    def __init__(
+        self, logger: logging.Logger | None = None, level: int = logging.INFO
+    ) -> None:
+        self.logger = logger or logging.getLogger("camp_registration.metrics")
+        self.level = level
+
+    def observe(self, metric: str, seconds: float, labels: dict[str, str]) -> None:
+        if self.logger.isEnabledFor(self.level):
+            fields = " ".join(f"{key}={value}" for key, value in sorted(labels.items()))
+            self.logger.log(self.level, "%s %s ms=%.3f", metric, fields, seconds * 1000)
+
+    def flush(self) -> None:
+        pass
+
+
+def sink_for_path(target: str) -> HistogramSink | LogSink:
+    # "-" logs to stderr; otherwise the suffix picks the format.
+    if target == "-":
+        logger = logging.getLogger("camp_registration.metrics")
+        if not logger.handlers:
+            handler = logging.StreamHandler(sys.stderr)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+        return LogSink(logger)
+    path = Path(target)
+    if path.suffix.lower() == ".json":
+        return JsonFileSink(path)
+    return PrometheusFileSink(path)
+
+
+def _labels(labels: dict[str, str], **extra: str) -> str:
+    merged = {**labels, **extra}
+    if not merged:
+        return ""
+    body = ",".join(f'{key}="{_escape(str(value))}"' for key, value in merged.items())
+    return "{" + body + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
@@ -1,54 +1,715 @@
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass, field
-import json
+from array import array
+from bisect import bisect_left, insort
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from itertools import chain
 from pathlib import Path
-from typing import Iterable
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator
 
+from camp_registration.metrics import Sink, timed
+from camp_registration.sessions import DEFAULT_SESSIONS
+from camp_registration.storage import JournalStorage
+from camp_registration.streaming import (
+    iter_json_array,
+    iter_ndjson,
+    write_json_array,
+    write_ndjson,
+)
 
-DEFAULT_SESSIONS = ("archery", "canoeing", "hiking", "arts")
+if TYPE_CHECKING:
+    from camp_registration.duplicates import DuplicateIndex
 
 
-@dataclass(frozen=True)
+class DuplicateCamperError(ValueError):
+    pass
+
+
+class PossibleDuplicateError(DuplicateCamperError):
+    pass
+
+
+class ChangesUnavailableError(ValueError):
+    pass
+
+
+# Cancelled roster slots tracked before the indexes are rebuilt from scratch.
+REINDEX_AFTER = 1024
+
+
+@dataclass(frozen=True, slots=True)
 class Camper:
     name: str
     age: int
     session: str
 
+    def to_dict(self) -> dict[str, Any]:
+        # Much cheaper than dataclasses.asdict, which deep-copies every field.
+        return {"name": self.name, "age": self.age, "session": self.session}
+
+
+@dataclass(frozen=True, slots=True)
+class Change:
+    # One camper-level change. `op` is "register", "waitlist", "promote" (off
+    # the waitlist into the session) or "cancel"; promotions carry the
+    # sequence number of the cancellation or capacity change that caused them.
+    seq: int
+    op: str
+    camper: Camper
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"seq": self.seq, "op": self.op, **self.camper.to_dict()}
+
+
+def validate_camper(
+    name: str, age: int, session: str, allowed_sessions: Iterable[str]
+) -> Camper:
+    cleaned_name = name.strip()
+    if not cleaned_name:
+        raise ValueError("Camper name is required.")
+    if age < 7 or age > 17:
+        raise ValueError("Camper age must be between 7 and 17.")
+    normalized_session = session.strip().lower()
+    if normalized_session not in allowed_sessions:
+        raise ValueError(
+            f"Session '{session}' is not available."
+        )
+    return Camper(cleaned_name, age, normalized_session)
+
+
+def possible_duplicate(camper: Camper, other: Camper) -> PossibleDuplicateError:
+    return PossibleDuplicateError(
+        f"Camper '{camper.name}' looks like '{other.name}' (age {other.age}), "
+        f"who is already registered for {camper.session}."
+    )
+
+
+def name_key(name: str) -> str:
+    return " ".join(name.split()).casefold()
+
+
+class _Waitlist:
+    # One session's waitlist, first come first served. Each camper holds a
+    # ticket, so membership is a dict lookup and a position is the distance
+    # from the front ticket, less the tickets cancelled in between.
+    __slots__ = ("_queue", "_tickets", "_cancelled", "_issued")
+
+    def __init__(self, campers: Iterable[Camper] = ()) -> None:
+        self._queue: deque[tuple[int, str, Camper]] = deque()
+        self._tickets: dict[str, tuple[int, Camper]] = {}
+        # Sorted tickets of campers removed from the middle of the queue.
+        self._cancelled: list[int] = []
+        self._issued = 0
+        for camper in campers:
+            self.append(camper)
+
+    def __len__(self) -> int:
+        return len(self._tickets)
+
+    def __iter__(self) -> Iterator[Camper]:
+        tickets = self._tickets
+        for ticket, key, camper in self._queue:
+            entry = tickets.get(key)
+            if entry is not None and entry[0] == ticket:
+                yield camper
+
+    def get(self, key: str) -> Camper | None:
+        entry = self._tickets.get(key)
+        return None if entry is None else entry[1]
+
+    def position(self, key: str) -> int | None:
+        entry = self._tickets.get(key)
+        if entry is None:
+            return None
+        ticket = entry[0]
+        return ticket - self._queue[0][0] - bisect_left(self._cancelled, ticket) + 1
+
+    def append(self, camper: Camper) -> None:
+        key = name_key(camper.name)
+        self._queue.append((self._issued, key, camper))
+        self._tickets[key] = (self._issued, camper)
+        self._issued += 1
+
+    def popleft(self) -> Camper:
+        _, key, camper = self._queue.popleft()
+        del self._tickets[key]
+        self._trim()
+        return camper
+
+    def remove(self, camper: Camper) -> bool:
+        key = name_key(camper.name)
+        entry = self._tickets.get(key)
+        if entry is None or entry[1] != camper:
+            return False
+        del self._tickets[key]
+        insort(self._cancelled, entry[0])
+        if len(self._cancelled) > max(64, len(self._tickets)):
+            self._queue = deque(self._live())
+            self._cancelled = []
+        self._trim()
+        return True
+
+    def _live(self) -> Iterator[tuple[int, str, Camper]]:
+        tickets = self._tickets
+        for item in self._queue:
+            entry = tickets.get(item[1])
+            if entry is not None and entry[0] == item[0]:
+                yield item
+
+    def _trim(self) -> None:
+        # Keeps a waiting camper at the front, so position() can count from it.
+        cancelled = self._cancelled
+        while cancelled and self._queue and self._queue[0][0] == cancelled[0]:
+            self._queue.popleft()
+            del cancelled[0]
+
 
 @dataclass
 class CampRegistry:
     allowed_sessions: set[str] = field(default_factory=lambda: set(DEFAULT_SESSIONS))
     campers: list[Camper] = field(default_factory=list)
+    capacities: dict[str, int] = field(default_factory=dict)
+    storage: JournalStorage | None = field(default=None, repr=False, compare=False)
+    thread_safe: bool = field(default=False, repr=False, compare=False)
+    # Optional metrics sink; operations are timed only when one is set.
+    metrics: Sink | None = field(default=None, repr=False, compare=False)
+    # Optional near-duplicate name check on registration; see duplicates.py.
+    duplicates: DuplicateIndex | None = field(default=None, repr=False, compare=False)
+    # How many recent changes changes_since() can replay from memory.
+    change_log_size: int = field(default=10_000, repr=False, compare=False)
+    sequence: int = field(default=0, init=False, compare=False)
+    # Index buckets hold roster slots in compact arrays rather than Camper
+    # references, so they stay small and work with any roster container. A
+    # camper's roster position is its slot less the slots cancelled before it
+    # since the indexes were last rebuilt (_removed, sorted).
+    _session_index: dict[str, array] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _age_index: dict[int, array] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _name_index: dict[str, array] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _removed: list[int] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+    _waitlists: dict[str, _Waitlist] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _lock: Any = field(default=None, init=False, repr=False, compare=False)
+    # (record, op, camper) per change; the record's "seq" is filled in when it
+    # is persisted. Changes at or before _changes_floor are not in the log.
+    _changes: deque[tuple[dict[str, Any], str, Camper]] = field(
+        default_factory=deque, init=False, repr=False, compare=False
+    )
+    _changes_floor: int = field(default=0, init=False, repr=False, compare=False)
+    _subscribers: list[Callable[[Change], None]] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+    _unnotified: list[tuple[dict[str, Any], str, Camper]] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
 
-    def register_camper(self, name: str, age: int, session: str) -> Camper:
-        cleaned_name = name.strip()
-        if not cleaned_name:
-            raise ValueError("Camper name is required.")
-        if age < 7 or age > 17:
-            raise ValueError("Camper age must be between 7 and 17.")
-        normalized_session = session.strip().lower()
-        if normalized_session not in self.allowed_sessions:
-            raise ValueError(
-                f"Session '{session}' is not available."
-            )
+    def __post_init__(self) -> None:
+        self._lock = threading.RLock() if self.thread_safe else nullcontext()
+        self._reindex()
+        self._index_duplicates()
+        self.refresh()
 
-        camper = Camper(cleaned_name, age, normalized_session)
-        self.campers.append(camper)
+    @classmethod
+    def open(cls, path: Path | str, **kwargs: Any) -> CampRegistry:
+        return cls(storage=JournalStorage(path), **kwargs)
+
+    def refresh(self) -> None:
+        with self._transaction():
+            pass
+
+    @timed("register")
+    def register_camper(
+        self, name: str, age: int, session: str, allow_similar: bool = False
+    ) -> Camper:
+        camper = validate_camper(name, age, session, self.allowed_sessions)
+        with self._transaction():
+            self._check_duplicate(camper, allow_similar)
+            record = self._placement_record(camper)
+            self._apply(record)
+            self._persist([record])
+        return camper
+
+    @timed("register_many")
+    def register_many(
+        self, entries: Iterable[tuple[str, int, str]], allow_similar: bool = False
+    ) -> list[Camper | ValueError]:
+        # Registers a batch in one transaction and one journal append (a group
+        # commit). Each entry gets its Camper or the ValueError that rejected it.
+        results: list[Camper | ValueError] = []
+        with self._transaction():
+            records = []
+            for name, age, session in entries:
+                try:
+                    camper = validate_camper(name, age, session, self.allowed_sessions)
+                    self._check_duplicate(camper, allow_similar)
+                except ValueError as exc:
+                    results.append(exc)
+                    continue
+                record = self._placement_record(camper)
+                self._apply(record)
+                records.append(record)
+                results.append(camper)
+            self._persist(records)
+        return results
+
+    @timed("cancel")
+    def cancel_camper(self, name: str, session: str) -> Camper:
+        session = session.strip().lower()
+        key = name_key(name)
+        with self._transaction():
+            for position in self._positions(self._name_index.get(key, ())):
+                camper = self.campers[position]
+                if camper.session == session:
+                    break
+            else:
+                waiting = self._waitlists.get(session)
+                camper = None if waiting is None else waiting.get(key)
+            if camper is None:
+                raise ValueError(
+                    f"Camper '{name.strip()}' is not registered for {session}."
+                )
+
+            record = {"op": "cancel", "camper": camper.to_dict()}
+            self._apply(record)
+            self._persist([record])
         return camper
 
+    def set_capacity(self, session: str, capacity: int | None) -> None:
+        session = session.strip().lower()
+        if session not in self.allowed_sessions:
+            raise ValueError(f"Session '{session}' is not available.")
+        if capacity is not None and capacity < 0:
+            raise ValueError("Session capacity cannot be negative.")
+
+        record = {"op": "capacity", "session": session, "capacity": capacity}
+        with self._transaction():
+            self._apply(record)
+            self._persist([record])
+
+    def changes_since(self, seq: int) -> list[Change]:
+        # Changes after `seq`, oldest first. The log is scanned from its newest
+        # end, so the cost follows the size of the delta, not the roster.
+        with self._transaction():
+            floor = self._changes_floor
+            if seq < floor:
+                raise ChangesUnavailableError(
+                    f"Changes since sequence {seq} are no longer available (the "
+                    f"change log starts at {floor}); export the full roster instead."
+                )
+            if seq > self.sequence:
+                raise ChangesUnavailableError(
+                    f"Sequence {seq} is ahead of this registry (at {self.sequence})."
+                )
+            changes = []
+            for record, op, camper in reversed(self._changes):
+                if record["seq"] <= seq:
+                    break
+                changes.append(Change(record["seq"], op, camper))
+        changes.reverse()
+        return changes
+
+    def subscribe(self, callback: Callable[[Change], None]) -> Callable[[], None]:
+        # Callbacks run after each change is persisted, outside the journal
+        # lock, including for changes picked up from other processes. Returns
+        # a function that unsubscribes.
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback)
+
+    def is_full(self, session: str) -> bool:
+        capacity = self.capacities.get(session)
+        return capacity is not None and self.enrolled_count(session) >= capacity
+
+    def enrolled_count(self, session: str) -> int:
+        return len(self._session_index.get(session, ()))
+
+    def waitlist(self, session: str) -> list[Camper]:
+        return list(self._waitlists.get(session.strip().lower(), ()))
+
+    def waitlist_position(self, name: str, session: str) -> int | None:
+        waiting = self._waitlists.get(session.strip().lower())
+        return None if waiting is None else waiting.position(name_key(name))
+
     def list_campers(self) -> list[Camper]:
         return list(self.campers)
 
+    def by_session(self, session: str) -> list[Camper]:
+        slots = self._session_index.get(session.strip().lower(), ())
+        return [self.campers[position] for position in self._positions(slots)]
+
+    def by_age_range(self, low: int, high: int) -> list[Camper]:
+        slots = sorted(
+            chain.from_iterable(
+                self._age_index.get(age, []) for age in range(low, high + 1)
+            )
+        )
+        return [self.campers[position] for position in self._positions(slots)]
+
+    def find_by_name(self, name: str) -> list[Camper]:
+        slots = self._name_index.get(name_key(name), ())
+        return [self.campers[position] for position in self._positions(slots)]
+
+    def is_registered(self, name: str, session: str) -> bool:
+        session = session.strip().lower()
+        key = name_key(name)
+        if any(
+            self.campers[position].session == session
+            for position in self._positions(self._name_index.get(key, ()))
+        ):
+            return True
+        waiting = self._waitlists.get(session)
+        return waiting is not None and waiting.get(key) is not None
+
+    def session_counts(self) -> dict[str, int]:
+        return {
+            session: len(positions)
+            for session, positions in sorted(self._session_index.items())
+            if positions
+        }
+
+    def clear(self) -> None:
+        self._load(())
+
+    @timed("export")
     def export_json(self, path: Path | str) -> None:
-        path = Path(path)
-        payload = [asdict(camper) for camper in self.campers]
-        path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        write_json_array(path, (camper.to_dict() for camper in self.campers))
 
+    @timed("export")
+    def export_ndjson(self, path: Path | str) -> None:
+        write_ndjson(path, (camper.to_dict() for camper in self.campers))
+
+    @timed("load")
     def load_from_json(self, path: Path | str) -> None:
-        path = Path(path)
-        data = json.loads(path.read_text(encoding="utf-8"))
-        self.campers = [Camper(**entry) for entry in data]
+        self._load(Camper(**entry) for entry in iter_json_array(path))
+
+    @timed("load")
+    def load_from_ndjson(self, path: Path | str) -> None:
+        self._load(Camper(**entry) for entry in iter_ndjson(path))
+
+    @timed("export")
+    def save_snapshot(self, path: Path | str) -> None:
+        # Binary format (see snapshot.py): roster, waitlists and capacities.
+        from camp_registration.snapshot import dump_snapshot
 
+        with Path(path).open("wb") as fp:
+            dump_snapshot(fp, self._state())
+
+    @timed("load")
+    def load_snapshot(self, path: Path | str) -> None:
+        from camp_registration.snapshot import open_snapshot
+
+        with open_snapshot(path) as snapshot:
+            campers, waitlists = self._roster(snapshot), snapshot.waitlists()
+            capacities = snapshot.capacities
+        self._load(campers, waitlists, capacities)
+
+    @timed("seed")
     def seed(self, campers: Iterable[Camper]) -> None:
-        self.campers.extend(campers)
+        campers = list(campers)
+        with self._transaction():
+            records = []
+            for camper in campers:
+                record = self._placement_record(camper)
+                self._apply(record)
+                records.append(record)
+            self._persist(records)
+
+    def _load(
+        self,
+        campers: Iterable[Camper],
+        waitlists: dict[str, list[Camper]] | None = None,
+        capacities: dict[str, int] | None = None,
+    ) -> None:
+        roster = self._roster(campers)
+        with self._transaction():
+            self.campers = roster
+            self._waitlists = {
+                session: _Waitlist(waiting)
+                for session, waiting in (waitlists or {}).items()
+            }
+            if capacities is not None:
+                # A snapshot carries the full set of limits; JSON exports have
+                # none, so the session limits already set are kept.
+                self.capacities.clear()
+                self.capacities.update(capacities)
+            self._reindex()
+            self._index_duplicates()
+            self._checkpoint()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        # Every change runs under the in-process lock (thread_safe mode) and the
+        # journal's file lock, after catching up on whatever other processes
+        # appended since we last looked. Writers therefore merge instead of
+        # overwriting each other, and validation sees the latest roster.
+        with self._lock:
+            try:
+                if self.storage is None:
+                    yield
+                    return
+                with self.storage.lock():
+                    self._sync()
+                    yield
+            finally:
+                self._notify()
+
+    def _check_duplicate(self, camper: Camper, allow_similar: bool = False) -> None:
+        if self.is_registered(camper.name, camper.session):
+            raise DuplicateCamperError(
+                f"Camper '{camper.name}' is already registered for {camper.session}."
+            )
+        if self.duplicates is None or allow_similar:
+            return
+        matches = self.duplicates.matches(camper)
+        if matches:
+            raise possible_duplicate(camper, matches[0].other)
+
+    def _placement_record(self, camper: Camper) -> dict[str, Any]:
+        op = "waitlist" if self.is_full(camper.session) else "register"
+        return {"op": op, "camper": camper.to_dict()}
+
+    def _add(self, camper: Camper) -> None:
+        self.campers.append(camper)
+        self._index(camper, len(self.campers) - 1 + len(self._removed))
+
+    def _index(self, camper: Camper, slot: int) -> None:
+        for index, key in self._index_keys(camper):
+            bucket = index.get(key)
+            if bucket is None:
+                bucket = index[key] = array("I")
+            bucket.append(slot)
+
+    def _unindex(self, camper: Camper, slot: int) -> None:
+        # Buckets are filled in slot order, so they stay sorted.
+        for index, key in self._index_keys(camper):
+            bucket = index[key]
+            del bucket[bisect_left(bucket, slot)]
+            if not bucket:
+                del index[key]
+
+    def _index_keys(self, camper: Camper) -> tuple[tuple[dict, Any], ...]:
+        return (
+            (self._session_index, camper.session),
+            (self._age_index, camper.age),
+            (self._name_index, name_key(camper.name)),
+        )
+
+    def _position(self, slot: int) -> int:
+        return slot - bisect_left(self._removed, slot)
+
+    def _positions(self, slots: Iterable[int]) -> Iterable[int]:
+        # Roster positions for sorted slots, walking the cancelled slots once.
+        removed = self._removed
+        if not removed:
+            return slots
+        positions = []
+        shift = 0
+        for slot in slots:
+            while shift < len(removed) and removed[shift] < slot:
+                shift += 1
+            positions.append(slot - shift)
+        return positions
+
+    def _roster(self, campers: Iterable[Camper]) -> list[Camper]:
+        # Keep whatever container the registry was built with (a plain list or
+        # a ColumnarCampers store) when the roster is replaced wholesale.
+        return type(self.campers)(campers)
+
+    def _reindex(self) -> None:
+        self._session_index = {}
+        self._age_index = {}
+        self._name_index = {}
+        self._removed = []
+        for position, camper in enumerate(self.campers):
+            self._index(camper, position)
+
+    @timed("persist")
+    def _persist(self, records: list[dict[str, Any]]) -> None:
+        for record in records:
+            self.sequence += 1
+            record["seq"] = self.sequence
+        self._trim_changes()
+        if self.storage is None or not records:
+            return
+        try:
+            self.storage.append(records)
+        except BaseException:
+            # The records were applied in memory but may not be on disk.
+            for record in records:
+                del record["seq"]
+            self._resync()
+            raise
+        if self.storage.needs_snapshot:
+            self.storage.write_snapshot(self._state())
+
+    def _checkpoint(self) -> None:
+        # The roster was replaced wholesale, which the change log cannot
+        # express; readers behind this point start over from a full export.
+        self.sequence += 1
+        self._reset_changes()
+        if self.storage is not None:
+            try:
+                self.storage.write_snapshot(self._state())
+            except BaseException:
+                self._resync()
+                raise
+
+    def _state(self) -> dict[str, Any]:
+        return {
+            "seq": self.sequence,
+            "campers": self.campers,
+            "capacities": dict(self.capacities),
+            "waitlists": {
+                session: list(waiting)
+                for session, waiting in self._waitlists.items()
+                if waiting
+            },
+        }
+
+    @timed("sync")
+    def _sync(self) -> None:
+        state, records = self.storage.read_changes()
+        if state is not None:
+            self._restore(state)
+        self._replay(records)
+
+    def _resync(self) -> None:
+        # A journal write failed after its changes were applied in memory.
+        # Rebuild from what is actually on disk, so nothing that was not
+        # saved stays visible or ends up in a later snapshot.
+        pending, self._unnotified = self._unnotified, []
+        state, records = self.storage.load()
+        if state is None:
+            state = {"seq": 0, "campers": (), "capacities": {}, "waitlists": {}}
+        self._restore(state)
+        self._replay(records)
+        # Replayed changes were already reported; only those picked up from
+        # other writers earlier in the transaction are still due.
+        self._unnotified = pending
+
+    def _restore(self, state: dict[str, Any]) -> None:
+        self.campers = self._roster(state["campers"])
+        self.sequence = state["seq"]
+        # Replace rather than merge, so limits another process removed
+        # before compacting stay removed.
+        self.capacities.clear()
+        self.capacities.update(state["capacities"])
+        self._waitlists = {
+            session: _Waitlist(waiting) for session, waiting in state["waitlists"].items()
+        }
+        self._reindex()
+        self._index_duplicates()
+        self._reset_changes()
+
+    def _replay(self, records: list[dict[str, Any]]) -> None:
+        for record in records:
+            if record["seq"] <= self.sequence:
+                continue
+            self._apply(record)
+            self.sequence = record["seq"]
+        self._trim_changes()
+
+    def _apply(self, record: dict[str, Any]) -> None:
+        op = record["op"]
+        if op == "register":
+            camper = Camper(**record["camper"])
+            self._add(camper)
+            self._log_change(record, op, camper)
+        elif op == "waitlist":
+            camper = Camper(**record["camper"])
+            waiting = self._waitlists.get(camper.session)
+            if waiting is None:
+                waiting = self._waitlists[camper.session] = _Waitlist()
+            waiting.append(camper)
+            self._log_change(record, op, camper)
+        elif op == "cancel":
+            camper = Camper(**record["camper"])
+            promoted = self._remove(camper)
+            self._log_change(record, op, camper)
+            self._log_promotions(record, promoted)
+            if self.duplicates is not None:
+                self.duplicates.remove(camper)
+        elif op == "capacity":
+            if record["capacity"] is None:
+                self.capacities.pop(record["session"], None)
+            else:
+                self.capacities[record["session"]] = record["capacity"]
+            self._log_promotions(record, self._promote(record["session"]))
+
+    def _log_change(self, record: dict[str, Any], op: str, camper: Camper) -> None:
+        if self.duplicates is not None and op in ("register", "waitlist"):
+            self.duplicates.add(camper)
+        self._changes.append((record, op, camper))
+        if self._subscribers:
+            self._unnotified.append((record, op, camper))
+
+    def _log_promotions(self, record: dict[str, Any], promoted: list[Camper]) -> None:
+        for camper in promoted:
+            self._log_change(record, "promote", camper)
+
+    def _index_duplicates(self) -> None:
+        if self.duplicates is None:
+            return
+        self.duplicates.clear()
+        for camper in chain(self.campers, *self._waitlists.values()):
+            self.duplicates.add(camper)
+
+    def _trim_changes(self) -> None:
+        # Runs once sequence numbers are assigned, so the floor is exact.
+        # Sequence numbers only grow along the log, so the last change
+        # dropped carries the new floor.
+        excess = len(self._changes) - self.change_log_size
+        if excess > 0:
+            for _ in range(excess - 1):
+                self._changes.popleft()
+            self._changes_floor = self._changes.popleft()[0]["seq"]
+
+    def _reset_changes(self) -> None:
+        self._changes.clear()
+        self._changes_floor = self.sequence
+
+    def _notify(self) -> None:
+        pending, self._unnotified = self._unnotified, []
+        for record, op, camper in pending:
+            if "seq" not in record:
+                continue  # its transaction failed before the change was persisted
+            change = Change(record["seq"], op, camper)
+            for callback in list(self._subscribers):
+                callback(change)
+
+    def _remove(self, camper: Camper) -> list[Camper]:
+        waiting = self._waitlists.get(camper.session)
+        if waiting is not None and waiting.remove(camper):
+            return []
+        for slot in self._name_index.get(name_key(camper.name), ()):
+            if self.campers[self._position(slot)] == camper:
+                break
+        else:
+            raise ValueError(f"Camper '{camper.name}' is not on the roster.")
+        # Later campers shift down one place; rather than renumbering every
+        # index, the slot is recorded and positions are adjusted on lookup.
+        del self.campers[self._position(slot)]
+        self._unindex(camper, slot)
+        insort(self._removed, slot)
+        if len(self._removed) > REINDEX_AFTER:
+            self._reindex()
+        return self._promote(camper.session)
+
+    def _promote(self, session: str) -> list[Camper]:
+        waiting = self._waitlists.get(session)
+        promoted = []
+        while waiting and not self.is_full(session):
+            camper = waiting.popleft()
+            self._add(camper)
+            promoted.append(camper)
+        return promoted
@@ -0,0 +1,385 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http import HTTPStatus
+import json
+import time
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from camp_registration.registry import CampRegistry, Camper, DuplicateCamperError
+
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+MAX_BATCH = 256
+LATENCY_WINDOW = 10_000
+EXPORT_CHUNK = 1000
+MAX_BODY = 1024 * 1024
+
+
+class HttpError(Exception):
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    query: dict[str, list[str]]
+    headers: dict[str, str]
+    body: bytes
+
+    def param(self, name: str, default: str | None = None) -> str | None:
+        values = self.query.get(name)
+        return values[0] if values else default
+
+    def int_param(self, name: str, default: int) -> int:
+        value = self.param(name)
+        if value is None:
+            return default
+        try:
+            return int(value)
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, f"'{name}' must be an integer.") from None
+
+
+@dataclass
+class _PendingRegistration:
+    entry: tuple[str, int, str]
+    future: asyncio.Future
+
+
+@dataclass
+class LatencyStats:
+    samples: dict[str, deque[float]] = field(default_factory=dict)
+
+    def record(self, route: str, seconds: float) -> None:
+        window = self.samples.get(route)
+        if window is None:
+            window = self.samples[route] = deque(maxlen=LATENCY_WINDOW)
+        window.append(seconds)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        return {
+            route: {
+                "count": len(window),
+                "p50_ms": round(percentile(window, 50) * 1000, 3),
+                "p99_ms": round(percentile(window, 99) * 1000, 3),
+            }
+            for route, window in sorted(self.samples.items())
+        }
+
+
+def percentile(values, q: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, round(q / 100 * (len(ordered) - 1))))
+    return ordered[rank]
+
+
+class RegistrationServer:
+    def __init__(self, registry: CampRegistry, max_batch: int = MAX_BATCH) -> None:
+        self.registry = registry
+        self.max_batch = max_batch
+        self.latency = LatencyStats()
+        self.batch_sizes: deque[int] = deque(maxlen=LATENCY_WINDOW)
+        self._queue: asyncio.Queue[_PendingRegistration] | None = None
+        # Held while a group commit runs in a worker thread so readers never see
+        # the roster mid-update.
+        self._registry_lock: asyncio.Lock | None = None
+        self._committer: asyncio.Task | None = None
+        # Commits get their own thread so a busy default executor can never
+        # starve the fsync that every pending registration is waiting on.
+        self._commit_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="registry-commit"
+        )
+        self._server: asyncio.base_events.Server | None = None
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> None:
+        self._queue = asyncio.Queue()
+        self._registry_lock = asyncio.Lock()
+        self._committer = asyncio.create_task(self._commit_loop())
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+
+    async def serve_forever(self) -> None:
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+        self._committer.cancel()
+        try:
+            await self._committer
+        except asyncio.CancelledError:
+            pass
+        self._commit_executor.shutdown(wait=True)
+
+    async def register(self, name: str, age: int, session: str) -> Camper:
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_PendingRegistration((name, age, session), future))
+        return await future
+
+    async def _commit_loop(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            async with self._registry_lock:
+                try:
+                    results = await asyncio.get_running_loop().run_in_executor(
+                        self._commit_executor,
+                        self.registry.register_many,
+                        [item.entry for item in batch],
+                    )
+                except Exception as exc:
+                    results = [exc] * len(batch)
+            self.batch_sizes.append(len(batch))
+
+            for item, result in zip(batch, results):
+                if item.future.done():
+                    continue
+                if isinstance(result, Exception):
+                    item.future.set_exception(result)
+                else:
+                    item.future.set_result(result)
+
+    async def _catch_up(self) -> None:
+        # Picks up changes the CLI or other processes journaled since our last
+        # write, so reads are never stale. Call with _registry_lock held.
+        if self.registry.storage is None:
+            return
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                self._commit_executor, self.registry.refresh
+            )
+        except OSError as exc:
+            raise HttpError(
+                HTTPStatus.INTERNAL_SERVER_ERROR, f"Could not read the registry: {exc}"
+            ) from None
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except HttpError as exc:
+                    await _send_json(writer, exc.status, {"error": str(exc)}, close=True)
+                    break
+                if request is None:
+                    break
+                started = time.perf_counter()
+                keep_alive = request.headers.get("connection", "").lower() != "close"
+                route = f"{request.method} {request.path}"
+                try:
+                    await self._dispatch(request, writer, keep_alive)
+                except HttpError as exc:
+                    await _send_json(
+                        writer, exc.status, {"error": str(exc)}, close=not keep_alive
+                    )
+                self.latency.record(route, time.perf_counter() - started)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(
+        self, request: Request, writer: asyncio.StreamWriter, keep_alive: bool
+    ) -> None:
+        routes = {
+            ("POST", "/campers"): self._post_camper,
+            ("GET", "/campers"): self._get_campers,
+            ("GET", "/counts"): self._get_counts,
+            ("GET", "/metrics"): self._get_metrics,
+        }
+        if (request.method, request.path) == ("GET", "/export"):
+            await self._export(writer, keep_alive)
+            return
+        handler = routes.get((request.method, request.path))
+        if handler is None:
+            raise HttpError(HTTPStatus.NOT_FOUND, f"No route for {request.method} {request.path}.")
+        status, payload = await handler(request)
+        await _send_json(writer, status, payload, close=not keep_alive)
+
+    async def _post_camper(self, request: Request) -> tuple[HTTPStatus, Any]:
+        try:
+            data = json.loads(request.body or b"{}")
+            entry = (data["name"], data["age"], data["session"])
+        except (ValueError, KeyError, TypeError):
+            entry = (None, None, None)
+        name, age, session = entry
+        # No coercion: null or a number is not a name, and 12.9 or true
+        # (a bool is an int) is not an age.
+        if not (isinstance(name, str) and type(age) is int and isinstance(session, str)):
+            raise HttpError(
+                HTTPStatus.BAD_REQUEST,
+                "Body must be JSON with a string name, whole-number age and string "
+                "session.",
+            )
+
+        try:
+            camper = await self.register(*entry)
+        except DuplicateCamperError as exc:
+            raise HttpError(HTTPStatus.CONFLICT, str(exc)) from None
+        except ValueError as exc:
+            raise HttpError(HTTPStatus.BAD_REQUEST, str(exc)) from None
+        except OSError as exc:
+            # The group commit could not write the journal (disk full, fsync
+            # failure); the registration was not saved.
+            raise HttpError(
+                HTTPStatus.INTERNAL_SERVER_ERROR,
+                f"Could not save the registration: {exc}",
+            ) from None
+
+        async with self._registry_lock:
+            position = self.registry.waitlist_position(camper.name, camper.session)
+        payload = dict(
+            camper.to_dict(),
+            status="enrolled" if position is None else "waitlisted",
+        )
+        if position is not None:
+            payload["position"] = position
+        return HTTPStatus.CREATED, payload
+
+    async def _get_campers(self, request: Request) -> tuple[HTTPStatus, Any]:
+        offset = max(0, request.int_param("offset", 0))
+        limit = min(MAX_PAGE_SIZE, max(0, request.int_param("limit", DEFAULT_PAGE_SIZE)))
+        session = request.param("session")
+        async with self._registry_lock:
+            await self._catch_up()
+            if session is None:
+                total = len(self.registry.campers)
+                page = self.registry.campers[offset : offset + limit]
+            else:
+                matches = self.registry.by_session(session)
+                total = len(matches)
+                page = matches[offset : offset + limit]
+        return HTTPStatus.OK, {
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "campers": [camper.to_dict() for camper in page],
+        }
+
+    async def _get_counts(self, request: Request) -> tuple[HTTPStatus, Any]:
+        registry = self.registry
+        async with self._registry_lock:
+            await self._catch_up()
+            counts = {
+                session: {
+                    "enrolled": registry.enrolled_count(session),
+                    "capacity": registry.capacities.get(session),
+                    "waitlisted": len(registry.waitlist(session)),
+                }
+                for session in sorted(registry.allowed_sessions)
+            }
+        return HTTPStatus.OK, counts
+
+    async def _get_metrics(self, request: Request) -> tuple[HTTPStatus, Any]:
+        batches = list(self.batch_sizes)
+        return HTTPStatus.OK, {
+            "latency": self.latency.summary(),
+            "group_commits": {
+                "count": len(batches),
+                "mean_batch_size": round(sum(batches) / len(batches), 2) if batches else 0,
+                "max_batch_size": max(batches, default=0),
+            },
+        }
+
+    async def _export(self, writer: asyncio.StreamWriter, keep_alive: bool) -> None:
+        async with self._registry_lock:
+            await self._catch_up()
+            campers = self.registry.list_campers()
+        writer.write(
+            _head(HTTPStatus.OK, "application/x-ndjson", close=not keep_alive)
+            + b"Transfer-Encoding: chunked\r\n\r\n"
+        )
+        for start in range(0, len(campers), EXPORT_CHUNK):
+            chunk = "".join(
+                json.dumps(camper.to_dict()) + "\n"
+                for camper in campers[start : start + EXPORT_CHUNK]
+            ).encode("utf-8")
+            writer.write(f"{len(chunk):x}\r\n".encode("ascii") + chunk + b"\r\n")
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Request | None:
+    request_line = await reader.readline()
+    if not request_line.strip():
+        return None
+    try:
+        method, target, _version = request_line.decode("latin-1").split()
+    except ValueError:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "Malformed request line.") from None
+
+    headers: dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length", "0"))
+    except ValueError:
+        length = -1
+    if length < 0:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length.")
+    if length > MAX_BODY:
+        raise HttpError(
+            HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+            f"Request body is larger than {MAX_BODY} bytes.",
+        )
+    body = await reader.readexactly(length) if length else b""
+
+    url = urlsplit(target)
+    return Request(method.upper(), url.path, parse_qs(url.query), headers, body)
+
+
+def _head(status: HTTPStatus, content_type: str, close: bool) -> bytes:
+    return (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Connection: {'close' if close else 'keep-alive'}\r\n"
+    ).encode("latin-1")
+
+
+async def _send_json(
+    writer: asyncio.StreamWriter, status: HTTPStatus, payload: Any, close: bool
+) -> None:
+    body = json.dumps(payload).encode("utf-8")
+    writer.write(
+        _head(status, "application/json", close)
+        + f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1")
+        + body
+    )
+    await writer.drain()
+
+
+async def serve(registry: CampRegistry, host: str, port: int) -> None:
+    server = RegistrationServer(registry)
+    await server.start(host, port)
+    print(f"Serving camp registrations on http://{host}:{server.port}")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
@@ -0,0 +1,2 @@
+# Kept in its own module so the CLI can show them without importing the registry.
+DEFAULT_SESSIONS = ("archery", "canoeing", "hiking", "arts")
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+import mmap
+from pathlib import Path
+import struct
+from typing import Any, BinaryIO, Iterable, Iterator, overload
+
+from camp_registration.registry import Camper
+
+
+# Layout, all little-endian:
+#   header
+#   session table: per session, capacity (-1 for none), name length, name
+#   padding to 8 bytes
+#   records: fixed width, enrolled campers in roster order, then waitlisted
+#            campers in queue order
+#   name pool: every camper name in UTF-8, addressed by (offset, length)
+MAGIC = b"CAMPSNAP"
+VERSION = 1
+# magic, version, flags, sequence, enrolled, waitlisted, sessions,
+# records offset, names offset, names size
+_HEADER = struct.Struct("<8sHHqQQIQQQ")
+_SESSION = struct.Struct("<iH")
+# name offset, name length, session code, age
+_RECORD = struct.Struct("<QIHBx")
+# Every name is ASCII, so the pool decodes in one go and slices by byte offset.
+_ASCII_NAMES = 1
+# Records unpacked per read while iterating.
+_CHUNK_RECORDS = 4096
+
+
+def dump_snapshot(fp: BinaryIO, state: dict[str, Any]) -> None:
+    # `state` as CampRegistry._state() returns it: seq, campers, capacities
+    # and waitlists, with Camper objects.
+    capacities = state.get("capacities", {})
+    waitlists = state.get("waitlists", {})
+    codes: dict[str, int] = {}
+    for session in capacities:
+        codes.setdefault(session, len(codes))
+
+    pool = bytearray()
+    records = bytearray()
+    enrolled = waitlisted = 0
+    for waiting, campers in ((False, state["campers"]), (True, _queued(waitlists))):
+        for camper in campers:
+            code = codes.setdefault(camper.session, len(codes))
+            name = camper.name.encode("utf-8")
+            records += _RECORD.pack(len(pool), len(name), code, camper.age)
+            pool += name
+            if waiting:
+                waitlisted += 1
+            else:
+                enrolled += 1
+
+    sessions = bytearray()
+    for session in codes:
+        encoded = session.encode("utf-8")
+        capacity = capacities.get(session)
+        sessions += _SESSION.pack(-1 if capacity is None else capacity, len(encoded))
+        sessions += encoded
+    sessions += bytes(-(_HEADER.size + len(sessions)) % 8)
+
+    records_offset = _HEADER.size + len(sessions)
+    names_offset = records_offset + len(records)
+    fp.write(
+        _HEADER.pack(
+            MAGIC,
+            VERSION,
+            _ASCII_NAMES if pool.isascii() else 0,
+            state.get("seq", 0),
+            enrolled,
+            waitlisted,
+            len(codes),
+            records_offset,
+            names_offset,
+            len(pool),
+        )
+    )
+    fp.write(sessions)
+    fp.write(records)
+    fp.write(pool)
+
+
+def open_snapshot(path: Path | str) -> Snapshot:
+    with Path(path).open("rb") as fp:
+        try:
+            buffer = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise ValueError(f"{path}: not a camp registry snapshot.") from None
+    return Snapshot(buffer, path)
+
+
+def is_snapshot(path: Path | str) -> bool:
+    with Path(path).open("rb") as fp:
+        return fp.read(len(MAGIC)) == MAGIC
+
+
+class Snapshot(Sequence):
+    # Read-only view of a snapshot's enrolled campers. Only the header and
+    # session table are parsed up front; records are unpacked, and Camper
+    # objects built, as they are read.
+
+    def __init__(self, buffer: Any, path: Path | str = "<buffer>") -> None:
+        self._buffer = buffer
+        try:
+            (
+                magic,
+                version,
+                flags,
+                self.sequence,
+                self._enrolled,
+                self._waitlisted,
+                session_count,
+                self._records_offset,
+                self._names_offset,
+                names_size,
+            ) = _HEADER.unpack_from(buffer, 0)
+        except struct.error:
+            magic, version = b"", 0
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a camp registry snapshot.")
+        if version != VERSION:
+            raise ValueError(f"{path}: unsupported snapshot version {version}.")
+        if self._names_offset + names_size > len(buffer) or (
+            self._records_offset + (self._enrolled + self._waitlisted) * _RECORD.size
+            != self._names_offset
+        ):
+            raise ValueError(f"{path}: snapshot is truncated or corrupt.")
+
+        self.sessions: list[str] = []
+        self.capacities: dict[str, int] = {}
+        offset = _HEADER.size
+        for _ in range(session_count):
+            capacity, length = _SESSION.unpack_from(buffer, offset)
+            offset += _SESSION.size
+            session = bytes(buffer[offset : offset + length]).decode("utf-8")
+            offset += length
+            self.sessions.append(session)
+            if capacity >= 0:
+                self.capacities[session] = capacity
+
+        self._ascii = bool(flags & _ASCII_NAMES)
+        self._names_size = names_size
+        self._names: str | None = None
+
+    def __enter__(self) -> Snapshot:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def __len__(self) -> int:
+        return self._enrolled
+
+    @overload
+    def __getitem__(self, index: int) -> Camper: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Camper]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return list(self._campers(start, max(start, stop)))
+            return [self[position] for position in range(start, stop, step)]
+        position = index + len(self) if index < 0 else index
+        if not 0 <= position < len(self):
+            raise IndexError("snapshot index out of range")
+        offset, length, code, age = _RECORD.unpack_from(
+            self._buffer, self._records_offset + position * _RECORD.size
+        )
+        start = self._names_offset + offset
+        name = bytes(self._buffer[start : start + length]).decode("utf-8")
+        return Camper(name, age, self.sessions[code])
+
+    def __iter__(self) -> Iterator[Camper]:
+        return self._campers(0, self._enrolled)
+
+    def __repr__(self) -> str:
+        return f"Snapshot({len(self)} campers, sequence {self.sequence})"
+
+    def waitlists(self) -> dict[str, list[Camper]]:
+        waitlists: dict[str, list[Camper]] = {}
+        end = self._enrolled + self._waitlisted
+        for camper in self._campers(self._enrolled, end):
+            waitlists.setdefault(camper.session, []).append(camper)
+        return waitlists
+
+    def state(self) -> dict[str, Any]:
+        # The inverse of dump_snapshot, with every camper read.
+        return {
+            "seq": self.sequence,
+            "campers": list(self),
+            "capacities": dict(self.capacities),
+            "waitlists": self.waitlists(),
+        }
+
+    def _campers(self, start: int, stop: int) -> Iterator[Camper]:
+        buffer, sessions = self._buffer, self.sessions
+        base = self._names_offset
+        # ASCII names are decoded in one go, on the first read through.
+        if self._ascii and self._names is None and stop > start:
+            pool = buffer[base : base + self._names_size]
+            self._names = bytes(pool).decode("ascii")
+        names = self._names
+        for chunk in range(start, stop, _CHUNK_RECORDS):
+            end = min(stop, chunk + _CHUNK_RECORDS)
+            first = self._records_offset + chunk * _RECORD.size
+            last = self._records_offset + end * _RECORD.size
+            records = _RECORD.iter_unpack(buffer[first:last])
+            if names is not None:
+                for offset, length, code, age in records:
+                    yield Camper(names[offset : offset + length], age, sessions[code])
+                continue
+            for offset, length, code, age in records:
+                name = bytes(buffer[base + offset : base + offset + length])
+                yield Camper(name.decode("utf-8"), age, sessions[code])
+
+
+def _queued(waitlists: dict[str, Iterable[Camper]]) -> Iterator[Camper]:
+    for waiting in waitlists.values():
+        yield from waiting
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sqlite3
+from typing import Any, Iterable, Iterator
+
+from camp_registration.registry import (
+    Camper,
+    DEFAULT_SESSIONS,
+    DuplicateCamperError,
+    name_key,
+    validate_camper,
+)
+from camp_registration.streaming import (
+    iter_json_array,
+    iter_ndjson,
+    write_json_array,
+    write_ndjson,
+)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS campers (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    age INTEGER NOT NULL,
+    session TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS campers_session ON campers (session);
+CREATE INDEX IF NOT EXISTS campers_age ON campers (age);
+CREATE INDEX IF NOT EXISTS campers_name_key ON campers (name_key);
+"""
+
+INSERT = "INSERT INTO campers (name, name_key, age, session) VALUES (?, ?, ?, ?)"
+SELECT = "SELECT name, age, session FROM campers"
+
+
+class SqliteCampRegistry:
+    def __init__(
+        self,
+        path: Path | str = ":memory:",
+        allowed_sessions: Iterable[str] = DEFAULT_SESSIONS,
+    ) -> None:
+        self.path = path
+        self.allowed_sessions = set(allowed_sessions)
+        self.connection = sqlite3.connect(str(path))
+        if str(path) != ":memory:":
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self) -> SqliteCampRegistry:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM campers").fetchone()[0]
+
+    def close(self) -> None:
+        self.connection.close()
+
+    @property
+    def campers(self) -> list[Camper]:
+        return self.list_campers()
+
+    def register_camper(self, name: str, age: int, session: str) -> Camper:
+        camper = validate_camper(name, age, session, self.allowed_sessions)
+        if self.is_registered(camper.name, camper.session):
+            raise DuplicateCamperError(
+                f"Camper '{camper.name}' is already registered for {camper.session}."
+            )
+        with self.connection:
+            self.connection.execute(INSERT, _row(camper))
+        return camper
+
+    def register_many(
+        self, entries: Iterable[tuple[str, int, str]]
+    ) -> list[Camper | ValueError]:
+        # Like CampRegistry.register_many, in one transaction. BEGIN IMMEDIATE
+        # takes the write lock before the duplicate checks, so no other
+        # connection can insert the same camper in between.
+        results: list[Camper | ValueError] = []
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            for name, age, session in entries:
+                try:
+                    camper = validate_camper(name, age, session, self.allowed_sessions)
+                    if self.is_registered(camper.name, camper.session):
+                        raise DuplicateCamperError(
+                            f"Camper '{camper.name}' is already registered for "
+                            f"{camper.session}."
+                        )
+                except ValueError as exc:
+                    results.append(exc)
+                    continue
+                self.connection.execute(INSERT, _row(camper))
+                results.append(camper)
+        return results
+
+    def cancel_camper(self, name: str, session: str) -> Camper:
+        session = session.strip().lower()
+        row = self.connection.execute(
+            "SELECT id, name, age, session FROM campers "
+            "WHERE name_key = ? AND session = ? ORDER BY id LIMIT 1",
+            (name_key(name), session),
+        ).fetchone()
+        if row is None:
+            raise ValueError(f"Camper '{name.strip()}' is not registered for {session}.")
+        with self.connection:
+            self.connection.execute("DELETE FROM campers WHERE id = ?", (row[0],))
+        return Camper(*row[1:])
+
+    def list_campers(self) -> list[Camper]:
+        return list(self.iter_campers())
+
+    def iter_campers(self) -> Iterator[Camper]:
+        return self._query(f"{SELECT} ORDER BY id")
+
+    def by_session(self, session: str) -> list[Camper]:
+        return list(
+            self._query(
+                f"{SELECT} WHERE session = ? ORDER BY id", (session.strip().lower(),)
+            )
+        )
+
+    def by_age_range(self, low: int, high: int) -> list[Camper]:
+        return list(
+            self._query(f"{SELECT} WHERE age BETWEEN ? AND ? ORDER BY id", (low, high))
+        )
+
+    def find_by_name(self, name: str) -> list[Camper]:
+        return list(
+            self._query(
+                f"{SELECT} WHERE name_key = ? ORDER BY id", (name_key(name),)
+            )
+        )
+
+    def is_registered(self, name: str, session: str) -> bool:
+        row = self.connection.execute(
+            "SELECT 1 FROM campers WHERE name_key = ? AND session = ? LIMIT 1",
+            (name_key(name), session.strip().lower()),
+        ).fetchone()
+        return row is not None
+
+    def session_counts(self) -> dict[str, int]:
+        rows = self.connection.execute(
+            "SELECT session, COUNT(*) FROM campers GROUP BY session ORDER BY session"
+        )
+        return dict(rows)
+
+    def clear(self) -> None:
+        with self.connection:
+            self.connection.execute("DELETE FROM campers")
+
+    def seed(self, campers: Iterable[Camper]) -> None:
+        with self.connection:
+            self.connection.executemany(INSERT, (_row(camper) for camper in campers))
+
+    def export_json(self, path: Path | str) -> None:
+        write_json_array(path, (camper.to_dict() for camper in self.iter_campers()))
+
+    def export_ndjson(self, path: Path | str) -> None:
+        write_ndjson(path, (camper.to_dict() for camper in self.iter_campers()))
+
+    def load_from_json(self, path: Path | str) -> None:
+        self._load(iter_json_array(path))
+
+    def load_from_ndjson(self, path: Path | str) -> None:
+        self._load(iter_ndjson(path))
+
+    def _load(self, entries: Iterable[dict[str, Any]]) -> None:
+        with self.connection:
+            self.connection.execute("DELETE FROM campers")
+            self.connection.executemany(
+                INSERT, (_row(Camper(**entry)) for entry in entries)
+            )
+
+    def _query(self, sql: str, params: tuple = ()) -> Iterator[Camper]:
+        for name, age, session in self.connection.execute(sql, params):
+            yield Camper(name, age, session)
+
+
+def _row(camper: Camper) -> tuple[str, str, int, str]:
+    return (camper.name, name_key(camper.name), camper.age, camper.session)
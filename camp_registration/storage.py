@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+if TYPE_CHECKING:
+    from camp_registration.snapshot import Snapshot
+
+
+class JournalStorage:
+    def __init__(self, path: Path | str, snapshot_every: int = 1000) -> None:
+        self.path = Path(path)
+        self.snapshot_path = self.path.with_name(self.path.name + ".snapshot")
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self.snapshot_every = snapshot_every
+        self.pending = 0
+        self._offset = 0
+        self._snapshot_id: tuple[int, int, int] | None = None
+        self._lock_file = None
+        self._lock_depth = 0
+
+    @property
+    def needs_snapshot(self) -> bool:
+        return self.pending >= self.snapshot_every
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        # Advisory lock shared by every process using this journal. Writers hold
+        # it across catch-up, validation and append, so no change is lost.
+        if self._lock_depth == 0:
+            self._lock_file = self.lock_path.open("a")
+            if fcntl is not None:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+        self._lock_depth += 1
+        try:
+            yield
+        finally:
+            self._lock_depth -= 1
+            if self._lock_depth == 0:
+                self._lock_file.close()
+                self._lock_file = None
+
+    def load(self) -> tuple[dict[str, Any] | None, list[dict[str, Any]]]:
+        state = None
+        self._snapshot_id = self._current_snapshot_id()
+        if self._snapshot_id is not None:
+            state = self._read_snapshot()
+
+        self._offset = 0
+        self.pending = 0
+        return state, self._read_tail()
+
+    def read_changes(self) -> tuple[dict[str, Any] | None, list[dict[str, Any]]]:
+        # Another process compacted the journal since we last looked, so our
+        # offset is meaningless; start over from its snapshot.
+        if (
+            self._current_snapshot_id() != self._snapshot_id
+            or self._journal_size() < self._offset
+        ):
+            return self.load()
+        return None, self._read_tail()
+
+    def append(self, records: Iterable[dict[str, Any]]) -> None:
+        lines = "".join(
+            json.dumps(record, separators=(",", ":")) + "\n" for record in records
+        )
+        if not lines:
+            return
+        data = lines.encode("utf-8")
+        with self.path.open("ab") as fp:
+            fp.write(data)
+            _fsync(fp)
+        self._offset += len(data)
+        self.pending += lines.count("\n")
+
+    def open_snapshot(self) -> Snapshot | None:
+        # The snapshot, opened for lazy reading, when it is the whole state:
+        # nothing was journaled after it and it is in the binary format.
+        from camp_registration.snapshot import is_snapshot, open_snapshot
+
+        if self._journal_size() or not self.snapshot_path.exists():
+            return None
+        if not is_snapshot(self.snapshot_path):
+            return None
+        return open_snapshot(self.snapshot_path)
+
+    def write_snapshot(self, state: dict[str, Any]) -> None:
+        # The snapshot records the last sequence number it covers, so a crash
+        # before the journal is truncated never replays a change twice.
+        from camp_registration.snapshot import dump_snapshot
+
+        tmp_path = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+        with tmp_path.open("wb") as fp:
+            dump_snapshot(fp, state)
+            _fsync(fp)
+        os.replace(tmp_path, self.snapshot_path)
+        with self.path.open("w", encoding="utf-8") as fp:
+            _fsync(fp)
+        self._snapshot_id = self._current_snapshot_id()
+        self._offset = 0
+        self.pending = 0
+
+    def _read_snapshot(self) -> dict[str, Any]:
+        from camp_registration.snapshot import is_snapshot, open_snapshot
+
+        if is_snapshot(self.snapshot_path):
+            with open_snapshot(self.snapshot_path) as snapshot:
+                return snapshot.state()
+        # Journals compacted before the binary format have a JSON snapshot.
+        from camp_registration.registry import Camper
+
+        state = json.loads(self.snapshot_path.read_text(encoding="utf-8"))
+        return {
+            "seq": state["seq"],
+            "campers": [Camper(**entry) for entry in state["campers"]],
+            "capacities": state.get("capacities", {}),
+            "waitlists": {
+                session: [Camper(**entry) for entry in waiting]
+                for session, waiting in state.get("waitlists", {}).items()
+            },
+        }
+
+    def _read_tail(self) -> list[dict[str, Any]]:
+        records: list[dict[str, Any]] = []
+        if not self.path.exists():
+            return records
+
+        good_offset = self._offset
+        with self.path.open("rb") as fp:
+            fp.seek(self._offset)
+            for line in fp:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    break
+                good_offset += len(line)
+        if good_offset != self._journal_size():
+            # Drop a torn tail left by a crash mid-write so the next append
+            # starts on a clean line.
+            with self.path.open("r+b") as fp:
+                fp.truncate(good_offset)
+                _fsync(fp)
+
+        self._offset = good_offset
+        self.pending += len(records)
+        return records
+
+    def _journal_size(self) -> int:
+        try:
+            return self.path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def _current_snapshot_id(self) -> tuple[int, int, int] | None:
+        try:
+            stat = self.snapshot_path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def _fsync(fp) -> None:
+    fp.flush()
+    os.fsync(fp.fileno())
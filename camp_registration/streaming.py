@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+
+NDJSON_SUFFIXES = {".ndjson", ".jsonl"}
+CHUNK_SIZE = 1 << 16
+WRITE_BATCH = 1000
+
+_decoder = json.JSONDecoder()
+
+
+def is_ndjson(path: Path | str) -> bool:
+    return Path(path).suffix.lower() in NDJSON_SUFFIXES
+
+
+def write_ndjson(path: Path | str, records: Iterable[dict[str, Any]]) -> int:
+    count = 0
+    with Path(path).open("w", encoding="utf-8") as fp:
+        batch: list[str] = []
+        for record in records:
+            batch.append(json.dumps(record) + "\n")
+            count += 1
+            if len(batch) >= WRITE_BATCH:
+                fp.write("".join(batch))
+                batch.clear()
+        fp.write("".join(batch))
+    return count
+
+
+def iter_ndjson(path: Path | str) -> Iterator[dict[str, Any]]:
+    with Path(path).open("r", encoding="utf-8") as fp:
+        for line_number, line in enumerate(fp, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as exc:
+                raise ValueError(f"{path}: line {line_number}: {exc}") from exc
+
+
+def write_json_array(path: Path | str, records: Iterable[dict[str, Any]]) -> int:
+    # Produces the same text as json.dumps(list(records), indent=2) without ever
+    # holding the whole list or the whole document in memory.
+    count = 0
+    with Path(path).open("w", encoding="utf-8") as fp:
+        batch: list[str] = []
+        for record in records:
+            entry = json.dumps(record, indent=2).replace("\n", "\n  ")
+            batch.append(("[\n  " if count == 0 else ",\n  ") + entry)
+            count += 1
+            if len(batch) >= WRITE_BATCH:
+                fp.write("".join(batch))
+                batch.clear()
+        fp.write("".join(batch))
+        fp.write("[]" if count == 0 else "\n]")
+    return count
+
+
+def iter_json_array(
+    path: Path | str, chunk_size: int = CHUNK_SIZE
+) -> Iterator[dict[str, Any]]:
+    with Path(path).open("r", encoding="utf-8") as fp:
+        buffer = ""
+        position = 0
+        eof = False
+
+        def fill() -> bool:
+            nonlocal buffer, position, eof
+            chunk = fp.read(chunk_size)
+            if not chunk:
+                eof = True
+                return False
+            buffer = buffer[position:] + chunk
+            position = 0
+            return True
+
+        def skip_whitespace() -> str:
+            nonlocal position
+            while True:
+                while position < len(buffer) and buffer[position].isspace():
+                    position += 1
+                if position < len(buffer):
+                    return buffer[position]
+                if not fill():
+                    return ""
+
+        if skip_whitespace() != "[":
+            raise ValueError(f"{path}: expected a JSON array")
+        position += 1
+        if skip_whitespace() == "]":
+            return
+
+        while True:
+            while True:
+                try:
+                    record, end = _decoder.raw_decode(buffer, position)
+                except ValueError:
+                    if eof or not fill():
+                        raise ValueError(f"{path}: invalid JSON array entry") from None
+                    continue
+                # A value that runs to the end of the buffer (e.g. a number) may
+                # continue in the next chunk.
+                if end == len(buffer) and not eof and fill():
+                    continue
+                break
+            position = end
+            yield record
+
+            token = skip_whitespace()
+            position += 1
+            if token == "]":
+                return
+            if token != ",":
+                raise ValueError(f"{path}: expected ',' or ']' in JSON array")
+            skip_whitespace()
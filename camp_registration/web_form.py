@@ -1,9 +1,88 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
+import hashlib
 import json
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field, replace
 from pathlib import Path
+import re
+import sys
+import time
+from typing import Any, Awaitable, Callable, Generator, Iterable, Iterator, Mapping
+
+from camp_registration.form_simulator import SimulatedPage, ValidationIssue
+from camp_registration.ledger import (
+    FAILED,
+    OK,
+    SUBMITTING,
+    UNCERTAIN,
+    SubmissionLedger,
+    config_key,
+)
+from camp_registration.metrics import FORM_STEP_METRIC, Sink, sink_for_path, timer
+from camp_registration.streaming import is_ndjson, iter_json_array, iter_ndjson
+
+
+PLACEHOLDER = re.compile(r"\{(\w+)\}")
+# Placeholders every camper in a registry export can fill.
+ROSTER_PLACEHOLDERS = ("name", "first_name", "last_name", "age", "session")
+
+# Sets every field, checkbox and select in one round trip. Values go through
+# the prototype setters so frameworks that wrap them (React) notice the change,
+# and input/change events fire as they would for typing. Checkboxes and radios
+# are clicked instead, since React tracks them through the click event.
+# Returns the indexes of items it could not apply; those are retried with
+# regular page calls.
+FAST_FILL_SCRIPT = """
+(items) => {
+  const setters = {
+    INPUT: Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, "value").set,
+    TEXTAREA: Object.getOwnPropertyDescriptor(HTMLTextAreaElement.prototype, "value").set,
+    SELECT: Object.getOwnPropertyDescriptor(HTMLSelectElement.prototype, "value").set,
+  };
+  const failed = [];
+  items.forEach((item, index) => {
+    try {
+      const element = document.querySelector(item.selector);
+      if (!element || element.disabled) {
+        failed.push(index);
+        return;
+      }
+      if (item.kind === "fill") {
+        const setter = setters[element.tagName];
+        if (!setter || element.type === "checkbox" || element.type === "radio") {
+          failed.push(index);
+          return;
+        }
+        setter.call(element, item.value);
+      } else if (item.kind === "check") {
+        if (element.type !== "checkbox" && element.type !== "radio") {
+          failed.push(index);
+          return;
+        }
+        if (element.checked !== item.checked) element.click();
+        if (element.checked !== item.checked) failed.push(index);
+        return;
+      } else {
+        const option = element.tagName === "SELECT" && Array.from(element.options).find(
+          (candidate) => candidate.value === item.value || candidate.label === item.value
+        );
+        if (!option) {
+          failed.push(index);
+          return;
+        }
+        setters.SELECT.call(element, option.value);
+      }
+      element.dispatchEvent(new Event("input", { bubbles: true }));
+      element.dispatchEvent(new Event("change", { bubbles: true }));
+    } catch (error) {
+      failed.push(index);
+    }
+  });
+  return failed;
+}
+"""
 
 
 @dataclass
@@ -29,6 +108,9 @@ class ActionStep:
     kind: str
     selector: str | None = None
     wait_ms: int | None = None
+    url: str | None = None
+    state: str | None = None
+    timeout_ms: int | None = None
 
 
 @dataclass
@@ -40,22 +122,230 @@ class FormConfig:
     submit_selector: str | None = None
     wait_after_submit_ms: int = 2000
     actions: list[ActionStep] = field(default_factory=list)
+    # When any success condition is set, the run waits for it after submitting
+    # instead of sleeping for wait_after_submit_ms.
+    success_selector: str | None = None
+    success_url: str | None = None
+    success_response: str | None = None
+    success_timeout_ms: int | None = None
+    # Set fields, checkboxes and selects with one in-page script instead of a
+    # page call per element.
+    fast_fill: bool = False
+
+    @property
+    def has_success_condition(self) -> bool:
+        return bool(self.success_selector or self.success_url or self.success_response)
+
+
+class ConfigError(ValueError):
+    pass
+
+
+# Action kind -> ActionStep attributes it needs.
+ACTION_KINDS: dict[str, tuple[str, ...]] = {
+    "click": ("selector",),
+    "wait": (),
+    "wait_for_selector": ("selector",),
+    "wait_for_url": ("url",),
+    "wait_for_load_state": (),
+    "wait_for_response": ("url",),
+}
+LOAD_STATES = {"load", "domcontentloaded", "networkidle"}
+SELECTOR_STATES = {"attached", "detached", "visible", "hidden"}
+_CONFIG_KEYS = set(FormConfig.__dataclass_fields__)
+_WHITESPACE = re.compile(r"\s+")
+
+# resolved path -> ((mtime_ns, size), sha256, config)
+_config_cache: dict[Path, tuple[tuple[int, int], str, FormConfig]] = {}
+
+
+def load_config(path: Path) -> FormConfig:
+    # Parsed configs are cached per file, so a batch that names the same config
+    # for every camper reads and validates it once. A touched but unchanged
+    # file is recognised by its hash. Cached configs are shared: derive
+    # variants with dataclasses.replace instead of mutating them.
+    path = Path(path).resolve()
+    stat = path.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _config_cache.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[2]
+
+    raw = path.read_bytes()
+    digest = hashlib.sha256(raw).hexdigest()
+    if cached is not None and cached[1] == digest:
+        _config_cache[path] = (stamp, digest, cached[2])
+        return cached[2]
+
+    try:
+        data = json.loads(raw)
+    except ValueError as exc:
+        raise ConfigError(f"{path}: not valid JSON ({exc}).") from None
+    config = parse_config(data, source=str(path))
+    _config_cache[path] = (stamp, digest, config)
+    return config
+
+
+def parse_config(data: Any, source: str = "config") -> FormConfig:
+    def fail(where: str, message: str) -> ConfigError:
+        return ConfigError(f"{source}: {where}: {message}")
+
+    if not isinstance(data, dict):
+        raise fail("top level", "must be a JSON object.")
+    _check_keys(data, _CONFIG_KEYS, "top level", fail)
+    url = _optional_str(data, "url", "", fail)
+    if url is None:
+        raise fail("url", "is required.")
 
+    actions = [
+        _parse_action(item, f"actions[{index}]", fail)
+        for index, item in enumerate(_list(data, "actions", fail))
+    ]
+    for index, action in enumerate(actions):
+        if action.kind == "wait_for_response" and (
+            index == 0 or actions[index - 1].kind != "click"
+        ):
+            raise fail(f"actions[{index}]", "wait_for_response must follow a click.")
 
-def _load_config(path: Path) -> FormConfig:
-    data = json.loads(path.read_text(encoding="utf-8"))
-    fields = [FormField(**item) for item in data.get("fields", [])]
-    checkboxes = [CheckboxField(**item) for item in data.get("checkboxes", [])]
-    selects = [SelectField(**item) for item in data.get("selects", [])]
-    actions = [ActionStep(**item) for item in data.get("actions", [])]
     return FormConfig(
-        url=data["url"],
-        fields=fields,
-        checkboxes=checkboxes,
-        selects=selects,
-        submit_selector=data.get("submit_selector"),
-        wait_after_submit_ms=data.get("wait_after_submit_ms", 2000),
+        url=url,
+        fields=_parse_items(data, "fields", FormField, fail),
+        checkboxes=_parse_items(data, "checkboxes", CheckboxField, fail),
+        selects=_parse_items(data, "selects", SelectField, fail),
+        submit_selector=_optional_selector(data, "submit_selector", "", fail),
+        wait_after_submit_ms=_optional_ms(data, "wait_after_submit_ms", "", fail, 2000),
         actions=actions,
+        success_selector=_optional_selector(data, "success_selector", "", fail),
+        success_url=_optional_str(data, "success_url", "", fail),
+        success_response=_optional_str(data, "success_response", "", fail),
+        success_timeout_ms=_optional_ms(data, "success_timeout_ms", "", fail),
+        fast_fill=_optional_bool(data, "fast_fill", "", fail, False),
+    )
+
+
+def _check_keys(data: dict, allowed: set[str], where: str, fail) -> None:
+    unknown = sorted(set(data) - allowed)
+    if unknown:
+        raise fail(where, f"unknown key(s) {', '.join(map(repr, unknown))}.")
+
+
+def _list(data: dict, key: str, fail) -> list:
+    items = data.get(key)
+    if items is None:
+        return []
+    if not isinstance(items, list):
+        raise fail(key, "must be a list.")
+    return items
+
+
+def _parse_items(data: dict, key: str, item_type: type, fail) -> list:
+    # Normalizes each selector and drops exact repeats; the same selector
+    # given two different values is almost certainly a copy-paste slip.
+    parsed: dict[str, tuple[str, Any]] = {}
+    for index, item in enumerate(_list(data, key, fail)):
+        where = f"{key}[{index}]"
+        if not isinstance(item, dict):
+            raise fail(where, "must be an object.")
+        _check_keys(item, set(item_type.__dataclass_fields__), where, fail)
+        selector = _optional_selector(item, "selector", where, fail)
+        if selector is None:
+            raise fail(f"{where}.selector", "is required.")
+        if item_type is CheckboxField:
+            entry = item_type(selector, _optional_bool(item, "checked", where, fail, True))
+        else:
+            value = item.get("value")
+            if not isinstance(value, str):
+                raise fail(f"{where}.value", "must be a string.")
+            entry = item_type(selector, value)
+        previous = parsed.get(selector)
+        if previous is not None and previous[1] != entry:
+            raise fail(where, f"{selector!r} is already set differently by {previous[0]}.")
+        parsed.setdefault(selector, (where, entry))
+    return [entry for _, entry in parsed.values()]
+
+
+def _parse_action(item: Any, where: str, fail) -> ActionStep:
+    if not isinstance(item, dict):
+        raise fail(where, "must be an object.")
+    _check_keys(item, set(ActionStep.__dataclass_fields__), where, fail)
+    kind = item.get("kind")
+    if kind not in ACTION_KINDS:
+        raise fail(
+            f"{where}.kind",
+            f"unknown action kind {kind!r} (expected one of {', '.join(ACTION_KINDS)}).",
+        )
+    action = ActionStep(
+        kind=kind,
+        selector=_optional_selector(item, "selector", where, fail),
+        wait_ms=_optional_ms(item, "wait_ms", where, fail),
+        url=_optional_str(item, "url", where, fail),
+        state=_optional_str(item, "state", where, fail),
+        timeout_ms=_optional_ms(item, "timeout_ms", where, fail),
+    )
+    for name in ACTION_KINDS[kind]:
+        if getattr(action, name) is None:
+            raise fail(where, f"a {kind} action needs '{name}'.")
+    states = {"wait_for_load_state": LOAD_STATES, "wait_for_selector": SELECTOR_STATES}
+    if action.state is not None and action.state not in states.get(kind, ()):
+        raise fail(f"{where}.state", f"{action.state!r} is not valid for {kind}.")
+    return action
+
+
+def _optional_str(data: dict, key: str, where: str, fail) -> str | None:
+    value = data.get(key)
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        raise fail(_location(where, key), "must be a string.")
+    return value.strip() or None
+
+
+def _optional_selector(data: dict, key: str, where: str, fail) -> str | None:
+    value = _optional_str(data, key, where, fail)
+    if value is None:
+        return None
+    try:
+        return normalize_selector(value)
+    except ValueError as exc:
+        raise fail(_location(where, key), f"selector {value!r} {exc}") from None
+
+
+def _optional_bool(data: dict, key: str, where: str, fail, default: bool) -> bool:
+    value = data.get(key)
+    if value is None:
+        return default
+    if not isinstance(value, bool):
+        raise fail(_location(where, key), "must be true or false.")
+    return value
+
+
+def _optional_ms(
+    data: dict, key: str, where: str, fail, default: int | None = None
+) -> int | None:
+    value = data.get(key)
+    if value is None:
+        return default
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        raise fail(_location(where, key), "must be a non-negative integer.")
+    return value
+
+
+def _location(where: str, key: str) -> str:
+    return f"{where}.{key}" if where else key
+
+
+def normalize_selector(selector: str) -> str:
+    # Collapses whitespace outside quoted strings so selectors that differ only
+    # in spacing dedupe; quotes and brackets must balance.
+    parts = re.split(r"""("[^"]*"|'[^']*')""", selector.strip())
+    unquoted = "".join(parts[::2])
+    if '"' in unquoted or "'" in unquoted:
+        raise ValueError("has an unterminated quote.")
+    for opening, closing in ("[]", "()"):
+        if unquoted.count(opening) != unquoted.count(closing):
+            raise ValueError(f"has unbalanced '{opening}{closing}'.")
+    return "".join(
+        part if index % 2 else _WHITESPACE.sub(" ", part) for index, part in enumerate(parts)
     )
 
 
@@ -68,66 +358,668 @@ def config_to_dict(config: FormConfig) -> dict[str, object]:
         "submit_selector": config.submit_selector,
         "wait_after_submit_ms": config.wait_after_submit_ms,
         "actions": [action.__dict__ for action in config.actions],
+        "success_selector": config.success_selector,
+        "success_url": config.success_url,
+        "success_response": config.success_response,
+        "success_timeout_ms": config.success_timeout_ms,
+        "fast_fill": config.fast_fill,
     }
 
 
-def _fill_form(page, config: FormConfig) -> None:
-    page.goto(config.url, wait_until="domcontentloaded")
+def submission_key(config: FormConfig) -> str:
+    # Ledger key for one submission: what is sent and where. Waits, timeouts
+    # and fast_fill are left out so re-running with different settings still
+    # recognizes campers that were already submitted.
+    return config_key(
+        {
+            "url": config.url,
+            "fields": [[item.selector, item.value] for item in config.fields],
+            "checkboxes": [[item.selector, item.checked] for item in config.checkboxes],
+            "selects": [[item.selector, item.value] for item in config.selects],
+        }
+    )
 
-    for field in config.fields:
-        page.fill(field.selector, field.value)
 
-    for checkbox in config.checkboxes:
-        if checkbox.checked:
-            page.check(checkbox.selector)
-        else:
-            page.uncheck(checkbox.selector)
+def camper_placeholders(entry: Mapping[str, object]) -> dict[str, str]:
+    values = {key: str(value) for key, value in entry.items()}
+    if "name" in values:
+        first_name, _, last_name = values["name"].strip().partition(" ")
+        values.setdefault("first_name", first_name)
+        values.setdefault("last_name", last_name.strip())
+    return values
+
+
+def _expand(text: str | None, values: Mapping[str, str]) -> str | None:
+    if text is None or "{" not in text:
+        return text
+
+    def substitute(match: re.Match[str]) -> str:
+        key = match.group(1)
+        if key not in values:
+            raise ValueError(f"Unknown placeholder '{{{key}}}' in {text!r}.")
+        return values[key]
+
+    return PLACEHOLDER.sub(substitute, text)
+
+
+def expand_config(template: FormConfig, values: Mapping[str, str]) -> FormConfig:
+    return replace(
+        template,
+        url=_expand(template.url, values),
+        fields=[
+            replace(
+                item,
+                selector=_expand(item.selector, values),
+                value=_expand(item.value, values),
+            )
+            for item in template.fields
+        ],
+        checkboxes=[
+            replace(item, selector=_expand(item.selector, values))
+            for item in template.checkboxes
+        ],
+        selects=[
+            replace(
+                item,
+                selector=_expand(item.selector, values),
+                value=_expand(item.value, values),
+            )
+            for item in template.selects
+        ],
+        submit_selector=_expand(template.submit_selector, values),
+        actions=[
+            replace(
+                item,
+                selector=_expand(item.selector, values),
+                url=_expand(item.url, values),
+            )
+            for item in template.actions
+        ],
+        success_selector=_expand(template.success_selector, values),
+        success_url=_expand(template.success_url, values),
+        success_response=_expand(template.success_response, values),
+    )
+
+
+def check_roster_template(template: FormConfig) -> None:
+    # Expands the template once with blank camper values, so an unknown
+    # placeholder is reported before any camper is submitted.
+    try:
+        expand_config(template, dict.fromkeys(ROSTER_PLACEHOLDERS, ""))
+    except ValueError as exc:
+        raise ConfigError(str(exc)) from None
 
-    for select in config.selects:
-        page.select_option(select.selector, select.value)
 
-    for action in config.actions:
+def iter_roster_configs(template: FormConfig, roster_path: Path) -> Iterator[FormConfig]:
+    # Streams a registry export (JSON array or NDJSON) and yields one expanded
+    # config per camper, so only the configs currently in flight are in memory.
+    check_roster_template(template)
+    return _roster_configs(template, roster_path)
+
+
+def _roster_configs(template: FormConfig, roster_path: Path) -> Iterator[FormConfig]:
+    if is_ndjson(roster_path):
+        entries = iter_ndjson(roster_path)
+    else:
+        entries = iter_json_array(roster_path)
+    for entry in entries:
+        yield expand_config(template, camper_placeholders(entry))
+
+
+@dataclass
+class PageCall:
+    step: str
+    method: str
+    args: tuple[Any, ...] = ()
+    kwargs: dict[str, Any] = field(default_factory=dict)
+    # (url pattern, timeout_ms): run the call inside page.expect_response so a
+    # response triggered by the call itself cannot be missed.
+    expect_response: tuple[str, int | None] | None = None
+
+
+FormSteps = Generator[PageCall, Any, None]
+
+
+def _form_steps(config: FormConfig) -> FormSteps:
+    # The form is described once as a sequence of page calls; _fill_form and
+    # _fill_form_async drive the same steps against the sync and async
+    # Playwright APIs. Each call's result is sent back into the generator.
+    yield PageCall("goto", "goto", (config.url,), {"wait_until": "domcontentloaded"})
+
+    calls = _element_calls(config)
+    if config.fast_fill and calls:
+        payload = [_fast_fill_item(item) for item in calls]
+        failed = yield PageCall("fast_fill", "evaluate", (FAST_FILL_SCRIPT, payload))
+        # Anything the script could not set (missing, disabled or not yet
+        # rendered) gets Playwright's own waiting and actionability checks.
+        calls = [calls[index] for index in failed or ()]
+    yield from calls
+
+    actions = config.actions
+    for position, action in enumerate(actions):
         if action.kind == "click" and action.selector:
-            page.click(action.selector)
+            following = actions[position + 1] if position + 1 < len(actions) else None
+            expect = None
+            if following is not None and following.kind == "wait_for_response":
+                expect = (following.url, following.timeout_ms)
+            yield PageCall("action", "click", (action.selector,), expect_response=expect)
         elif action.kind == "wait":
-            page.wait_for_timeout(action.wait_ms or 0)
+            yield PageCall("action", "wait_for_timeout", (action.wait_ms or 0,))
+        elif action.kind == "wait_for_selector":
+            yield PageCall(
+                "action",
+                "wait_for_selector",
+                (action.selector,),
+                _timeout({"state": action.state or "visible"}, action.timeout_ms),
+            )
+        elif action.kind == "wait_for_url":
+            yield PageCall(
+                "action", "wait_for_url", (action.url,), _timeout({}, action.timeout_ms)
+            )
+        elif action.kind == "wait_for_load_state":
+            yield PageCall(
+                "action",
+                "wait_for_load_state",
+                (action.state or "networkidle",),
+                _timeout({}, action.timeout_ms),
+            )
+        elif action.kind == "wait_for_response":
+            previous = actions[position - 1] if position else None
+            if previous is None or previous.kind != "click":
+                raise ValueError(
+                    "A wait_for_response action must directly follow the click "
+                    "that triggers the request."
+                )
+        elif action.kind not in ACTION_KINDS:
+            raise ValueError(f"Unknown action kind {action.kind!r}.")
 
     if config.submit_selector:
-        page.click(config.submit_selector)
-        page.wait_for_timeout(config.wait_after_submit_ms)
+        expect = None
+        if config.success_response:
+            expect = (config.success_response, config.success_timeout_ms)
+        yield PageCall(
+            "submit", "click", (config.submit_selector,), expect_response=expect
+        )
+        if config.success_url:
+            yield PageCall(
+                "submit",
+                "wait_for_url",
+                (config.success_url,),
+                _timeout({}, config.success_timeout_ms),
+            )
+        if config.success_selector:
+            yield PageCall(
+                "submit",
+                "wait_for_selector",
+                (config.success_selector,),
+                _timeout({"state": "visible"}, config.success_timeout_ms),
+            )
+        if not config.has_success_condition:
+            yield PageCall("submit", "wait_for_timeout", (config.wait_after_submit_ms,))
+
+
+def _element_calls(config: FormConfig) -> list[PageCall]:
+    calls = [
+        PageCall("fill", "fill", (field.selector, field.value)) for field in config.fields
+    ]
+    for checkbox in config.checkboxes:
+        method = "check" if checkbox.checked else "uncheck"
+        calls.append(PageCall("check", method, (checkbox.selector,)))
+    for select in config.selects:
+        calls.append(PageCall("select", "select_option", (select.selector, select.value)))
+    return calls
+
+
+def _fast_fill_item(call: PageCall) -> dict[str, Any]:
+    if call.step == "fill":
+        return {"kind": "fill", "selector": call.args[0], "value": call.args[1]}
+    if call.step == "check":
+        return {"kind": "check", "selector": call.args[0], "checked": call.method == "check"}
+    return {"kind": "select", "selector": call.args[0], "value": call.args[1]}
 
 
-def run(config_path: Path, headless: bool) -> None:
+def _timeout(kwargs: dict[str, Any], timeout_ms: int | None) -> dict[str, Any]:
+    if timeout_ms is not None:
+        kwargs["timeout"] = timeout_ms
+    return kwargs
+
+
+def _call(page, call: PageCall) -> Any:
+    method = getattr(page, call.method)
+    if call.expect_response is None:
+        return method(*call.args, **call.kwargs)
+    pattern, timeout_ms = call.expect_response
+    with page.expect_response(pattern, **_timeout({}, timeout_ms)) as response:
+        method(*call.args, **call.kwargs)
+    return response.value
+
+
+async def _call_async(page, call: PageCall) -> Any:
+    method = getattr(page, call.method)
+    if call.expect_response is None:
+        return await method(*call.args, **call.kwargs)
+    pattern, timeout_ms = call.expect_response
+    async with page.expect_response(pattern, **_timeout({}, timeout_ms)) as response:
+        await method(*call.args, **call.kwargs)
+    return await response.value
+
+
+def _fill_form(
+    page,
+    config: FormConfig,
+    before_submit: Callable[[], None] | None = None,
+    metrics: Sink | None = None,
+) -> None:
+    steps = _form_steps(config)
+    result = None
+    while True:
+        try:
+            call = steps.send(result)
+        except StopIteration:
+            return
+        if call.step == "submit" and before_submit is not None:
+            before_submit()
+            before_submit = None
+        if metrics is None:
+            result = _call(page, call)
+        else:
+            with timer(metrics, FORM_STEP_METRIC, step=call.step):
+                result = _call(page, call)
+
+
+async def _fill_form_async(
+    page,
+    config: FormConfig,
+    before_submit: Callable[[], None] | None = None,
+    metrics: Sink | None = None,
+) -> None:
+    steps = _form_steps(config)
+    result = None
+    while True:
+        try:
+            call = steps.send(result)
+        except StopIteration:
+            return
+        if call.step == "submit" and before_submit is not None:
+            before_submit()
+            before_submit = None
+        if metrics is None:
+            result = await _call_async(page, call)
+        else:
+            with timer(metrics, FORM_STEP_METRIC, step=call.step):
+                result = await _call_async(page, call)
+
+
+def validate_config(config: FormConfig, html: str) -> list[ValidationIssue]:
+    # Drives the same steps as a real run against a saved copy of the form, so
+    # broken selectors and option values show up without launching a browser.
+    page = SimulatedPage(html)
+    try:
+        _fill_form(page, config)
+    except ValueError as exc:
+        page.issues.append(ValidationIssue("config", None, str(exc)))
+    return page.issues
+
+
+def run(
+    config_path: Path,
+    headless: bool,
+    fast_fill: bool = False,
+    metrics: Sink | None = None,
+) -> None:
     from playwright.sync_api import sync_playwright
 
-    config = _load_config(config_path)
+    config = load_config(config_path)
+    if fast_fill:
+        config = replace(config, fast_fill=True)
 
     with sync_playwright() as playwright:
         browser = playwright.chromium.launch(headless=headless)
         page = browser.new_page()
-        _fill_form(page, config)
+        _fill_form(page, config, metrics=metrics)
         browser.close()
 
 
+@dataclass
+class SubmissionResult:
+    index: int
+    url: str
+    ok: bool
+    elapsed_ms: float
+    error: str | None = None
+    attempts: int = 1
+    skipped: bool = False
+
+
+def _is_transient(exc: Exception) -> bool:
+    # ValueErrors come from the config itself (a misplaced wait_for_response),
+    # so running it again cannot help. Roster placeholders are checked before
+    # the batch starts.
+    return not isinstance(exc, ValueError)
+
+
+async def _run_pool(
+    configs: Iterable[FormConfig],
+    new_context: Callable[[], Awaitable[Any]],
+    concurrency: int,
+    on_result: Callable[[SubmissionResult], None] | None = None,
+    ledger: SubmissionLedger | None = None,
+    retries: int = 0,
+    backoff_s: float = 1.0,
+    metrics: Sink | None = None,
+) -> list[SubmissionResult]:
+    # Configs are pulled lazily through a bounded queue, so a generator of
+    # thousands of configs never has to be materialized up front.
+    queue: asyncio.Queue[tuple[int, FormConfig, str | None] | None] = asyncio.Queue(
+        maxsize=concurrency * 2
+    )
+    results: list[SubmissionResult] = []
+
+    def report(result: SubmissionResult) -> None:
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+
+    async def produce() -> None:
+        try:
+            for index, config in enumerate(configs):
+                key = None
+                if ledger is not None:
+                    key = submission_key(config)
+                    if ledger.is_done(key):
+                        report(_skipped_result(index, config, ledger.status(key)))
+                        continue
+                await queue.put((index, config, key))
+        finally:
+            for _ in range(concurrency):
+                await queue.put(None)
+
+    async def submit(context, page, index: int, config: FormConfig, key: str | None):
+        started = time.perf_counter()
+        attempts = 0
+        while True:
+            attempts += 1
+            submitting = False
+
+            def mark_submitting() -> None:
+                nonlocal submitting
+                submitting = True
+                if ledger is not None:
+                    ledger.record(key, SUBMITTING, url=config.url, attempts=attempts)
+
+            error = None
+            retry = False
+            try:
+                await _fill_form_async(
+                    page, config, before_submit=mark_submitting, metrics=metrics
+                )
+            except Exception as exc:
+                error = f"{type(exc).__name__}: {exc}"
+                # Once the submit click has been issued the form may already
+                # have gone through; retrying could register (and charge) twice.
+                retry = not submitting and attempts <= retries and _is_transient(exc)
+            # Reuse the context, but don't let one camper's session cookies
+            # leak into the next submission.
+            await context.clear_cookies()
+            if not retry:
+                break
+            await asyncio.sleep(backoff_s * 2 ** (attempts - 1))
+
+        if error is None:
+            status = OK
+        elif submitting:
+            status = UNCERTAIN
+            error += " (failed after submit; not retried)"
+        else:
+            status = FAILED
+        if ledger is not None:
+            ledger.record(key, status, url=config.url, attempts=attempts, error=error)
+        return SubmissionResult(
+            index=index,
+            url=config.url,
+            ok=error is None,
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+            error=error,
+            attempts=attempts,
+        )
+
+    async def work() -> None:
+        context = await new_context()
+        try:
+            page = await context.new_page()
+            while (item := await queue.get()) is not None:
+                report(await submit(context, page, *item))
+        finally:
+            await context.close()
+
+    await asyncio.gather(produce(), *(work() for _ in range(concurrency)))
+    return sorted(results, key=lambda result: result.index)
+
+
+def _skipped_result(index: int, config: FormConfig, status: str) -> SubmissionResult:
+    error = None
+    if status != OK:
+        error = "a previous run stopped during submit; check before re-submitting"
+    return SubmissionResult(
+        index=index,
+        url=config.url,
+        ok=error is None,
+        elapsed_ms=0.0,
+        error=error,
+        attempts=0,
+        skipped=True,
+    )
+
+
+async def run_batch_async(
+    configs: Iterable[FormConfig],
+    concurrency: int = 4,
+    headless: bool = True,
+    on_result: Callable[[SubmissionResult], None] | None = None,
+    ledger: SubmissionLedger | None = None,
+    retries: int = 0,
+    backoff_s: float = 1.0,
+    metrics: Sink | None = None,
+) -> list[SubmissionResult]:
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=headless)
+        try:
+            return await _run_pool(
+                configs,
+                browser.new_context,
+                concurrency,
+                on_result,
+                ledger=ledger,
+                retries=retries,
+                backoff_s=backoff_s,
+                metrics=metrics,
+            )
+        finally:
+            await browser.close()
+
+
+def run_batch(
+    configs: Iterable[FormConfig],
+    concurrency: int = 4,
+    headless: bool = True,
+    on_result: Callable[[SubmissionResult], None] | None = None,
+    ledger: SubmissionLedger | None = None,
+    retries: int = 0,
+    backoff_s: float = 1.0,
+    metrics: Sink | None = None,
+) -> list[SubmissionResult]:
+    return asyncio.run(
+        run_batch_async(
+            configs, concurrency, headless, on_result, ledger, retries, backoff_s, metrics
+        )
+    )
+
+
+def _print_result(result: SubmissionResult) -> None:
+    if result.skipped:
+        status = "already submitted" if result.ok else f"SKIPPED ({result.error})"
+        print(f"[{result.index}] {result.url} {status}")
+        return
+    status = "ok" if result.ok else f"FAILED ({result.error})"
+    tries = f" after {result.attempts} attempts" if result.attempts > 1 else ""
+    print(f"[{result.index}] {result.url} {result.elapsed_ms:.0f} ms {status}{tries}")
+
+
+def _validate(configs: Iterable[FormConfig], html: str) -> int:
+    errors = 0
+    for index, config in enumerate(configs):
+        issues = validate_config(config, html)
+        errors += sum(issue.severity == "error" for issue in issues)
+        for issue in issues:
+            print(f"[{index}] {config.url} {issue}")
+    print("Config is valid." if not errors else f"{errors} problem(s) found.")
+    return 1 if errors else 0
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Automate filling a camp registration website form."
     )
-    parser.add_argument("config", type=Path, help="Path to form config JSON")
+    parser.add_argument(
+        "config",
+        type=Path,
+        nargs="+",
+        help="Path to form config JSON (several paths run as a batch)",
+    )
+    parser.add_argument(
+        "--roster",
+        type=Path,
+        help="Registry export (JSON or NDJSON); the config is used as a template "
+        "with {name}, {first_name}, {last_name}, {age} and {session} placeholders "
+        "and submitted once per camper.",
+    )
+    parser.add_argument(
+        "--validate",
+        "--dry-run",
+        dest="validate",
+        type=Path,
+        metavar="HTML",
+        help="Check the config(s) against a saved copy of the form page without "
+        "launching a browser, and report selectors or values that would fail.",
+    )
     parser.add_argument(
         "--headed",
         action="store_true",
         help="Run browser in headed mode (default is headless).",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Browser contexts to run in parallel in batch mode (default: 4).",
+    )
+    parser.add_argument(
+        "--fast-fill",
+        action="store_true",
+        help="Set all fields in one in-page script, falling back to per-element "
+        "calls for anything it cannot set.",
+    )
+    parser.add_argument(
+        "--ledger",
+        type=Path,
+        help="Record each submission's outcome in this file; re-running with the "
+        "same ledger skips campers that were already submitted.",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=2,
+        help="Retry a submission that fails before the submit click this many "
+        "times (default: 2).",
+    )
+    parser.add_argument(
+        "--backoff",
+        type=float,
+        default=1.0,
+        help="Seconds before the first retry, doubling each time (default: 1).",
+    )
+    parser.add_argument(
+        "--metrics",
+        metavar="TARGET",
+        help="Record per-step timings (goto, fill, check, select, action, submit): "
+        "a .prom file (Prometheus text format), a .json file, or '-' to log to stderr.",
+    )
+    parser.add_argument(
+        "--report",
+        type=Path,
+        help="Write per-submission timing and status to this JSON file.",
+    )
     return parser
 
 
 def main(argv: list[str] | None = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
+    if args.roster is not None and len(args.config) != 1:
+        parser.error("--roster takes exactly one template config")
+
+    # Every config is loaded and checked before the browser starts; repeated
+    # paths are parsed once thanks to the load cache.
+    try:
+        loaded = [load_config(path) for path in args.config]
+        if args.roster is not None:
+            configs = iter_roster_configs(loaded[0], args.roster)
+        else:
+            configs = iter(loaded)
+    except (OSError, ConfigError) as exc:
+        print(f"Invalid config: {exc}", file=sys.stderr)
+        return 2
+
+    metrics = sink_for_path(args.metrics) if args.metrics else None
+    if args.roster is None and (
+        len(args.config) == 1
+        and args.report is None
+        and args.ledger is None
+        and args.validate is None
+    ):
+        try:
+            run(
+                args.config[0],
+                headless=not args.headed,
+                fast_fill=args.fast_fill,
+                metrics=metrics,
+            )
+        finally:
+            if metrics is not None:
+                metrics.flush()
+        return 0
+    if args.fast_fill:
+        configs = (replace(config, fast_fill=True) for config in configs)
+    if args.validate is not None:
+        return _validate(configs, args.validate.read_text(encoding="utf-8"))
 
-    run(args.config, headless=not args.headed)
-    return 0
+    ledger = SubmissionLedger(args.ledger) if args.ledger is not None else None
+    try:
+        results = run_batch(
+            configs,
+            concurrency=max(1, args.concurrency),
+            headless=not args.headed,
+            on_result=_print_result,
+            ledger=ledger,
+            retries=max(0, args.retries),
+            backoff_s=args.backoff,
+            metrics=metrics,
+        )
+    finally:
+        if ledger is not None:
+            ledger.close()
+        if metrics is not None:
+            metrics.flush()
+    failures = sum(not result.ok for result in results)
+    print(f"{len(results) - failures} of {len(results)} submissions succeeded.")
+    if args.report is not None:
+        args.report.write_text(
+            json.dumps([asdict(result) for result in results], indent=2),
+            encoding="utf-8",
+        )
+    return 1 if failures else 0
 
 
 if __name__ == "__main__":
@@ -0,0 +1,48 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from camp_registration import bench
+from camp_registration.cli import main
+
+
+def test_cli_bench_writes_json_report(tmp_path: Path, capsys):
+    output = tmp_path / "bench.json"
+
+    assert main(
+        ["bench", "register", "io", "--sizes", "200,400", "--output", str(output)]
+    ) == 0
+
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert json.loads(capsys.readouterr().out) == report
+    assert {"version", "python", "platform", "started_at"} <= set(report)
+    register, io = report["results"]
+    assert [run["campers"] for run in register["runs"]] == [200, 400]
+    assert all(run["campers_per_second"] > 0 for run in register["runs"])
+    assert io["benchmark"] == "json_io"
+    assert all(
+        run["load_peak_bytes"] > 0 and run["file_bytes"] > 0 for run in io["runs"]
+    )
+
+
+def test_browser_benchmarks_are_skipped_without_playwright(monkeypatch):
+    def missing(args):
+        raise ModuleNotFoundError("No module named 'playwright'")
+
+    monkeypatch.setitem(bench.BENCHMARKS, "submission", missing)
+
+    assert bench.run(["submission"], bench.build_parser().parse_args([])) == [
+        {"benchmark": "submission", "skipped": "No module named 'playwright'"}
+    ]
+
+
+@pytest.mark.benchmark
+def test_full_benchmark_suite():
+    # pytest -m benchmark; the report is kept for comparing releases.
+    output = Path(os.environ.get("BENCH_OUTPUT", "bench-results.json"))
+    assert bench.main(["--output", str(output)]) == 0
+
+    results = json.loads(output.read_text(encoding="utf-8"))["results"]
+    assert [result["benchmark"] for result in results if "skipped" not in result]
@@ -0,0 +1,137 @@
+import csv
+from pathlib import Path
+
+import pytest
+
+from camp_registration.bulk_import import import_csv, write_rejects
+from camp_registration.cli import main
+from camp_registration.duplicates import DuplicateIndex
+from camp_registration.registry import CampRegistry
+from camp_registration.sqlite_registry import SqliteCampRegistry
+
+
+def _write_csv(path: Path, rows: list[list[str]]) -> None:
+    with path.open("w", newline="", encoding="utf-8") as fp:
+        csv.writer(fp).writerows(rows)
+
+
+def test_import_csv_validates_like_register_camper(tmp_path: Path):
+    path = tmp_path / "campers.csv"
+    _write_csv(
+        path,
+        [
+            ["Name", "Age", "Session"],
+            ["Alex", "12", "Archery"],
+            ["", "10", "hiking"],
+            ["Sam", "six", "hiking"],
+            ["Jo", "5", "arts"],
+            ["Kim", "10", "fencing"],
+            ["alex", "12", "archery"],
+            ["Lee", "9", "arts"],
+        ],
+    )
+    registry = CampRegistry()
+
+    result = import_csv(registry, path)
+
+    assert result.imported == 2
+    assert [camper.name for camper in registry.campers] == ["Alex", "Lee"]
+    assert [(reject.row, reject.reason) for reject in result.rejects] == [
+        (3, "Camper name is required."),
+        (4, "Camper age must be a whole number."),
+        (5, "Camper age must be between 7 and 17."),
+        (6, "Session 'fencing' is not available."),
+        (7, "Camper 'alex' is already registered for archery."),
+    ]
+
+    write_rejects(tmp_path / "rejects.csv", result.rejects)
+    with (tmp_path / "rejects.csv").open(newline="", encoding="utf-8") as fp:
+        rows = list(csv.reader(fp))
+    assert rows[0] == ["row", "reason", "name", "age", "session"]
+    assert rows[2] == ["4", "Camper age must be a whole number.", "Sam", "six", "hiking"]
+
+
+def test_import_csv_requires_columns(tmp_path: Path):
+    path = tmp_path / "campers.csv"
+    _write_csv(path, [["name", "age"], ["Alex", "12"]])
+
+    with pytest.raises(ValueError, match="missing column"):
+        import_csv(CampRegistry(), path)
+
+
+def test_cli_import_appends_once_and_writes_rejects(tmp_path: Path, capsys):
+    path = tmp_path / "campers.csv"
+    rows = [["name", "age", "session"]]
+    rows += [[f"Camper {i}", str(7 + i % 11), "hiking"] for i in range(500)]
+    rows.append(["Nobody", "30", "hiking"])
+    _write_csv(path, rows)
+    data = tmp_path / "campers.journal"
+
+    assert main(["--data", str(data), "import", str(path)]) == 0
+
+    output = capsys.readouterr().out
+    assert "Imported 500 campers" in output
+    assert "Rejected 1 rows" in output
+    assert (tmp_path / "campers.rejects.csv").exists()
+    assert len(CampRegistry.open(data).campers) == 500
+
+
+def test_import_csv_rejects_similar_names_when_registry_checks(tmp_path: Path):
+    path = tmp_path / "campers.csv"
+    _write_csv(
+        path,
+        [
+            ["name", "age", "session"],
+            ["Alex Smyth", "12", "archery"],
+            ["Jordan Lee", "10", "hiking"],
+            ["Jordan Lea", "10", "hiking"],
+            ["Jordan Lea", "11", "hiking"],
+        ],
+    )
+    registry = CampRegistry(duplicates=DuplicateIndex())
+    registry.register_camper("Alex Smith", 12, "archery")
+
+    result = import_csv(registry, path)
+
+    assert [camper.name for camper in registry.campers] == [
+        "Alex Smith", "Jordan Lee", "Jordan Lea"
+    ]
+    assert [(reject.row, reject.reason) for reject in result.rejects] == [
+        (2, "Camper 'Alex Smyth' looks like 'Alex Smith' (age 12), who is already "
+         "registered for archery."),
+        (4, "Camper 'Jordan Lea' looks like 'Jordan Lee' (age 10), who is already "
+         "registered for hiking."),
+    ]
+    assert import_csv(registry, path, allow_similar=True).imported == 1
+
+
+def test_import_rechecks_campers_registered_since_validation(tmp_path: Path):
+    path = tmp_path / "campers.csv"
+    header = ["name", "age", "session"]
+    _write_csv(path, [header, ["Alex", "12", "archery"], ["Sam", "14", "arts"]])
+    data = tmp_path / "campers.journal"
+    registry = CampRegistry.open(data)
+    # Another writer registers Alex; `registry` has not caught up yet.
+    CampRegistry.open(data).register_camper("Alex", 12, "archery")
+
+    result = import_csv(registry, path)
+
+    assert result.imported == 1
+    assert [(reject.row, reject.reason) for reject in result.rejects] == [
+        (2, "Camper 'Alex' is already registered for archery.")
+    ]
+    assert [camper.name for camper in CampRegistry.open(data).campers] == ["Alex", "Sam"]
+
+
+def test_import_into_sqlite_rejects_duplicates(tmp_path: Path):
+    path = tmp_path / "campers.csv"
+    header = ["name", "age", "session"]
+    _write_csv(path, [header, ["Alex", "12", "archery"], ["Sam", "14", "arts"]])
+    with SqliteCampRegistry(tmp_path / "campers.db") as registry:
+        registry.register_camper("Alex", 12, "archery")
+
+        result = import_csv(registry, path)
+
+        assert result.imported == 1
+        assert [reject.row for reject in result.rejects] == [2]
+        assert [camper.name for camper in registry.campers] == ["Alex", "Sam"]
@@ -0,0 +1,80 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from camp_registration.cabins import Cabin, CabinPlan, assign_cabins, load_plan
+from camp_registration.registry import Camper
+
+
+def _names(assignment):
+    return {
+        roster.cabin.name: [camper.name for camper in roster.campers]
+        for roster in assignment.rosters
+    }
+
+
+def test_assign_cabins_fills_balanced_age_bands():
+    campers = [Camper(f"Camper {i:02d}", 7 + i % 10, "arts") for i in range(20)]
+    plan = CabinPlan([Cabin("Oak", "arts", 12), Cabin("Pine", "arts", 12)])
+
+    assignment = assign_cabins(campers, plan)
+
+    oak, pine = assignment.rosters
+    assert (len(oak.campers), len(pine.campers)) == (10, 10)
+    assert {camper.age for camper in oak.campers} == {7, 8, 9, 10, 11}
+    assert {camper.age for camper in pine.campers} == {12, 13, 14, 15, 16}
+    assert assignment.unassigned == []
+
+
+def test_age_spread_leaves_campers_without_a_fitting_cabin_unassigned():
+    ages = {"Ann": 7, "Bo": 8, "Cy": 8, "Di": 12, "Ed": 13, "Flo": 16}
+    campers = [Camper(name, age, "hiking") for name, age in ages.items()]
+    campers.append(Camper("Gus", 16, "arts"))  # no arts cabins
+    plan = CabinPlan(
+        [Cabin("Oak", "hiking", 3), Cabin("Pine", "hiking", 3)], max_age_spread=1
+    )
+
+    assignment = assign_cabins(campers, plan)
+
+    assert _names(assignment) == {"Oak": ["Ann", "Bo", "Cy"], "Pine": ["Di", "Ed"]}
+    assert [camper.name for camper in assignment.unassigned] == ["Gus", "Flo"]
+
+
+def test_keep_together_moves_campers_to_make_room():
+    campers = [Camper("Sam", 9, "arts"), Camper("Alex", 10, "arts"), Camper("Jo", 11, "arts")]
+    plan = CabinPlan(
+        [Cabin("Oak", "arts", 2), Cabin("Pine", "arts", 1)], together=[["alex", "Jo"]]
+    )
+
+    assert _names(assign_cabins(campers, plan)) == {"Oak": ["Alex", "Jo"], "Pine": ["Sam"]}
+
+    # A group no cabin can hold stays together, unassigned.
+    plan.cabins = [Cabin("Oak", "arts", 1), Cabin("Pine", "arts", 1), Cabin("Elm", "arts", 1)]
+    assignment = assign_cabins(campers, plan)
+    assert [camper.name for camper in assignment.unassigned] == ["Alex", "Jo"]
+
+    plan.together = [["Alex", "Jordan"]]
+    with pytest.raises(ValueError, match="'Jordan' is not enrolled"):
+        assign_cabins(campers, plan)
+
+
+def test_load_plan(tmp_path: Path):
+    path = tmp_path / "cabins.json"
+    path.write_text(
+        json.dumps(
+            {
+                "max_age_spread": 2,
+                "cabins": {"Arts": {"Oak": 8, "Pine": 6}},
+                "together": [["Alex", "Jo"]],
+            }
+        ),
+        encoding="utf-8",
+    )
+    assert load_plan(path) == CabinPlan(
+        [Cabin("Oak", "arts", 8), Cabin("Pine", "arts", 6)], 2, [["Alex", "Jo"]]
+    )
+
+    path.write_text(json.dumps({"cabins": {"arts": {"Oak": 0}}}), encoding="utf-8")
+    with pytest.raises(ValueError, match="capacity of cabin Oak"):
+        load_plan(path)
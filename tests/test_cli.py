@@ -0,0 +1,146 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from camp_registration.cli import main
+
+
+def test_register_then_list_keeps_state(tmp_path: Path, capsys):
+    data = str(tmp_path / "campers.journal")
+
+    assert main(["--data", data, "register", "Alex", "12", "archery"]) == 0
+    assert main(["--data", data, "register", "Sam", "14", "hiking"]) == 0
+    capsys.readouterr()
+
+    assert main(["--data", data, "list", "--format", "json"]) == 0
+    listed = json.loads(capsys.readouterr().out)
+
+    assert [entry["name"] for entry in listed] == ["Alex", "Sam"]
+
+
+def test_capacity_waitlist_and_cancel(tmp_path: Path, capsys):
+    data = str(tmp_path / "campers.journal")
+
+    main(["--data", data, "capacity", "archery", "1"])
+    main(["--data", data, "register", "Alex", "12", "archery"])
+    main(["--data", data, "register", "Sam", "14", "archery"])
+    assert "waitlist at position 1" in capsys.readouterr().out
+
+    main(["--data", data, "list"])
+    output = capsys.readouterr().out
+    assert "archery: 1/1, 1 waitlisted" in output
+    assert "  1. Sam (age 14)" in output
+
+    main(["--data", data, "cancel", "Alex", "archery"])
+    capsys.readouterr()
+    main(["--data", data, "list", "--format", "json"])
+    listed = json.loads(capsys.readouterr().out)
+    assert listed == [
+        {"name": "Sam", "age": 14, "session": "archery", "status": "enrolled"}
+    ]
+
+
+def test_register_errors_exit_nonzero(tmp_path: Path, capsys):
+    data = str(tmp_path / "campers.journal")
+
+    assert main(["--data", data, "register", "Alex", "12", "archery"]) == 0
+    capsys.readouterr()
+    assert main(["--data", data, "register", "alex", "12", "Archery"]) == 1
+    assert capsys.readouterr().err == "Camper 'alex' is already registered for archery.\n"
+    assert main(["--data", data, "register", "Sam", "30", "archery"]) == 1
+    assert "between 7 and 17" in capsys.readouterr().err
+
+
+def test_capacity_and_cancel_errors_exit_nonzero(tmp_path: Path, capsys):
+    data = str(tmp_path / "campers.journal")
+
+    for capacity in ("x", "-1"):
+        with pytest.raises(SystemExit) as exited:
+            main(["--data", data, "capacity", "arts", capacity])
+        assert exited.value.code == 2
+    assert "capacity cannot be negative" in capsys.readouterr().err
+
+    assert main(["--data", data, "capacity", "fencing", "3"]) == 1
+    assert "Session 'fencing' is not available." in capsys.readouterr().err
+    assert main(["--data", data, "cancel", "Nobody", "arts"]) == 1
+    assert "Camper 'Nobody' is not registered for arts." in capsys.readouterr().err
+
+
+def test_export_since_writes_only_new_changes(tmp_path: Path, capsys):
+    data = str(tmp_path / "campers.journal")
+    main(["--data", data, "register", "Alex", "12", "archery"])
+    main(["--data", data, "export", str(tmp_path / "full.json")])
+    assert "at sequence 1." in capsys.readouterr().out
+
+    main(["--data", data, "register", "Sam", "14", "hiking"])
+    main(["--data", data, "cancel", "Alex", "archery"])
+    delta = tmp_path / "delta.ndjson"
+    assert main(["--data", data, "export", str(delta), "--since", "1"]) == 0
+
+    assert "now at sequence 3" in capsys.readouterr().out
+    assert [json.loads(line) for line in delta.read_text().splitlines()] == [
+        {"seq": 2, "op": "register", "name": "Sam", "age": 14, "session": "hiking"},
+        {"seq": 3, "op": "cancel", "name": "Alex", "age": 12, "session": "archery"},
+    ]
+
+
+def test_duplicates_report_and_register_check(tmp_path: Path, capsys):
+    data = tmp_path / "campers.journal"
+    base = ["--data", str(data)]
+    assert main([*base, "register", "Alex Smith", "12", "archery"]) == 0
+    assert main([*base, "register", "Alex Smyth", "12", "archery"]) == 1
+    assert "--allow-similar" in capsys.readouterr().err
+
+    assert main([*base, "register", "--allow-similar", "Alex Smyth", "12", "archery"]) == 0
+    capsys.readouterr()
+
+    assert main([*base, "duplicates"]) == 0
+    out = capsys.readouterr().out
+    assert "Alex Smyth (age 12) looks like Alex Smith (age 12) in archery" in out
+    assert "1 likely duplicates among 2 campers." in out
+
+    assert main([*base, "duplicates", "--format", "json"]) == 0
+    (match,) = json.loads(capsys.readouterr().out)
+    assert (match["camper"]["name"], match["other"]["name"]) == ("Alex Smyth", "Alex Smith")
+
+
+def test_allow_similar_with_sqlite_data(tmp_path: Path, capsys):
+    data = str(tmp_path / "campers.db")
+
+    assert main(["--data", data, "register", "Alex Smith", "12", "archery"]) == 0
+    assert (
+        main(["--data", data, "register", "Alex Smyth", "12", "archery", "--allow-similar"])
+        == 0
+    )
+    capsys.readouterr()
+
+    assert main(["--data", data, "list", "--format", "json"]) == 0
+    listed = json.loads(capsys.readouterr().out)
+    assert [entry["name"] for entry in listed] == ["Alex Smith", "Alex Smyth"]
+
+
+def test_assign_prints_cabin_rosters(tmp_path: Path, capsys):
+    data = tmp_path / "campers.journal"
+    for name, age in (("Alex", "8"), ("Jo", "9"), ("Sam", "14")):
+        assert main(["--data", str(data), "register", name, age, "arts"]) == 0
+    plan = tmp_path / "cabins.json"
+    plan.write_text(
+        json.dumps({"max_age_spread": 2, "cabins": {"arts": {"Oak": 2, "Pine": 2}}}),
+        encoding="utf-8",
+    )
+    capsys.readouterr()
+
+    assert main(["--data", str(data), "assign", str(plan)]) == 0
+    assert capsys.readouterr().out.splitlines() == [
+        "arts / Oak: 2/2, ages 8-9",
+        "  Alex (age 8)",
+        "  Jo (age 9)",
+        "arts / Pine: 1/2, ages 14-14",
+        "  Sam (age 14)",
+        "Assigned 3 of 3 campers to 2 cabins.",
+    ]
+
+    assert main(["--data", str(data), "assign", str(plan), "--format", "json"]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert [len(cabin["campers"]) for cabin in report["cabins"]] == [2, 1]
@@ -0,0 +1,50 @@
+from pathlib import Path
+
+import pytest
+
+from camp_registration.columnar import ColumnarCampers
+from camp_registration.registry import CampRegistry, Camper
+
+
+def test_columnar_sequence_behaves_like_a_list():
+    campers = [Camper("Alex", 12, "archery"), Camper("Zoë", 9, "arts")]
+    store = ColumnarCampers(campers)
+
+    assert len(store) == 2
+    assert store[1] == Camper("Zoë", 9, "arts")
+    assert store[-2:] == campers
+    assert list(store) == campers
+    assert store == campers
+
+    store[0] = Camper("Sam", 14, "hiking")
+    store.insert(0, Camper("Jo", 10, "canoeing"))
+    del store[-1]
+
+    assert list(store) == [Camper("Jo", 10, "canoeing"), Camper("Sam", 14, "hiking")]
+    with pytest.raises(IndexError):
+        store[5]
+
+    store.clear()
+    assert list(store) == []
+
+
+def test_registry_with_columnar_roster(tmp_path: Path):
+    registry = CampRegistry(campers=ColumnarCampers(), capacities={"archery": 1})
+    alex = registry.register_camper("Alex", 12, "archery")
+    registry.register_camper("Sam", 14, "archery")
+    registry.register_camper("Jo", 9, "hiking")
+
+    assert registry.list_campers() == [alex, Camper("Jo", 9, "hiking")]
+    assert registry.by_session("hiking") == [Camper("Jo", 9, "hiking")]
+
+    registry.cancel_camper("Alex", "archery")
+    assert registry.by_session("archery") == [Camper("Sam", 14, "archery")]
+
+    registry.export_json(tmp_path / "campers.json")
+    registry.load_from_json(tmp_path / "campers.json")
+    assert isinstance(registry.campers, ColumnarCampers)
+    assert registry.find_by_name("jo") == [Camper("Jo", 9, "hiking")]
+
+    registry.clear()
+    assert isinstance(registry.campers, ColumnarCampers)
+    assert registry.list_campers() == []
@@ -0,0 +1,104 @@
+from pathlib import Path
+import subprocess
+import sys
+import threading
+
+from camp_registration.registry import CampRegistry
+from camp_registration.storage import JournalStorage
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+WORKER = """
+import sys
+from camp_registration.registry import CampRegistry
+from camp_registration.storage import JournalStorage
+
+path, worker, count = sys.argv[1], int(sys.argv[2]), int(sys.argv[3])
+registry = CampRegistry(storage=JournalStorage(path, snapshot_every=7))
+for index in range(count):
+    registry.register_camper(f"Worker {worker} camper {index}", 7 + index % 11, "hiking")
+"""
+
+
+def test_concurrent_processes_do_not_lose_registrations(tmp_path: Path):
+    path = tmp_path / "campers.journal"
+    workers, per_worker = 8, 25
+
+    processes = [
+        subprocess.Popen(
+            [sys.executable, "-c", WORKER, str(path), str(worker), str(per_worker)],
+            cwd=PROJECT_ROOT,
+        )
+        for worker in range(workers)
+    ]
+    assert [process.wait(timeout=60) for process in processes] == [0] * workers
+
+    registry = CampRegistry.open(path)
+    names = {camper.name for camper in registry.campers}
+    assert len(registry.campers) == workers * per_worker
+    assert names == {
+        f"Worker {worker} camper {index}"
+        for worker in range(workers)
+        for index in range(per_worker)
+    }
+    assert registry.sequence == workers * per_worker
+
+
+def test_writers_merge_changes_from_other_instances(tmp_path: Path):
+    path = tmp_path / "campers.journal"
+    first = CampRegistry(storage=JournalStorage(path, snapshot_every=2))
+    second = CampRegistry.open(path)
+
+    first.register_camper("Alex", 12, "archery")
+    second.register_camper("Sam", 14, "archery")
+    first.register_camper("Jo", 9, "arts")
+    second.set_capacity("archery", 2)
+
+    assert [camper.name for camper in second.campers] == ["Alex", "Sam", "Jo"]
+    first.register_camper("Kim", 10, "archery")
+    assert [camper.name for camper in first.waitlist("archery")] == ["Kim"]
+
+    second.refresh()
+    assert second.waitlist("archery") == first.waitlist("archery")
+    assert CampRegistry.open(path).list_campers() == first.list_campers()
+
+
+def test_sync_replaces_capacities_from_a_new_snapshot(tmp_path: Path):
+    path = tmp_path / "campers.journal"
+    first = CampRegistry(storage=JournalStorage(path, snapshot_every=2))
+    second = CampRegistry.open(path)
+
+    first.set_capacity("archery", 1)
+    first.register_camper("Alex", 12, "archery")
+    first.register_camper("Sam", 14, "archery")
+    second.refresh()
+    assert second.capacities == {"archery": 1}
+    assert [camper.name for camper in second.waitlist("archery")] == ["Sam"]
+
+    # Removing the limit is the change that compacts the journal.
+    first.set_capacity("archery", None)
+    assert first.storage.pending == 0
+
+    second.refresh()
+    assert second.capacities == {}
+    assert second.waitlist("archery") == []
+    second.register_camper("Kim", 10, "archery")
+    assert CampRegistry.open(path).capacities == {}
+
+
+def test_thread_safe_registry(tmp_path: Path):
+    registry = CampRegistry.open(tmp_path / "campers.journal", thread_safe=True)
+
+    def register(worker: int) -> None:
+        for index in range(50):
+            registry.register_camper(f"Thread {worker} camper {index}", 12, "arts")
+
+    threads = [threading.Thread(target=register, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(registry.campers) == 400
+    assert registry.session_counts() == {"arts": 400}
+    assert len(CampRegistry.open(tmp_path / "campers.journal").campers) == 400
@@ -0,0 +1,118 @@
+import json
+from pathlib import Path
+import socket
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from camp_registration import cli
+from camp_registration.cli import main, open_registry
+from camp_registration.daemon import RegistryDaemon, run_daemon
+
+
+@pytest.fixture
+def daemon(tmp_path: Path):
+    data = tmp_path / "c.journal"
+    socket_path = tmp_path / "c.sock"
+    server = RegistryDaemon(socket_path, open_registry(data), data.resolve())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield data, socket_path, server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def test_commands_run_through_daemon(daemon, tmp_path: Path, capsys):
+    data, socket_path, server = daemon
+    base = ["--data", str(data), "--socket", str(socket_path)]
+
+    assert main([*base, "register", "Alex", "12", "archery"]) == 0
+    assert main([*base, "register", "Alex", "12", "archery"]) == 1
+    captured = capsys.readouterr()
+    assert "Registered Alex" in captured.out
+    assert "Camper 'Alex' is already registered for archery." in captured.err
+    # The daemon's registry saw the write without reloading the journal.
+    assert [camper.name for camper in server.registry.campers] == ["Alex"]
+
+    assert main([*base, "list", "--format", "json"]) == 0
+    assert [entry["name"] for entry in json.loads(capsys.readouterr().out)] == ["Alex"]
+
+
+def test_daemon_sees_writes_from_other_processes(daemon, capsys):
+    data, socket_path, server = daemon
+    other = open_registry(data)
+    other.register_camper("Sam", 14, "hiking")
+
+    assert main(["--data", str(data), "--socket", str(socket_path), "list"]) == 0
+    assert "Sam (age 14) - hiking" in capsys.readouterr().out
+
+
+def test_daemon_rejects_other_data_path(daemon, tmp_path: Path):
+    data, socket_path, server = daemon
+    response = server.execute(
+        {"argv": ["list"], "cwd": str(tmp_path), "data": str(tmp_path / "other.journal")}
+    )
+    assert response["exit"] == 2
+    assert "this daemon serves" in response["stderr"]
+
+
+def test_relative_paths_resolve_against_client_cwd(daemon, tmp_path: Path, monkeypatch):
+    data, socket_path, server = daemon
+    monkeypatch.chdir(tmp_path)
+    assert main(["--data", str(data), "--socket", str(socket_path), "export", "out.json"]) == 0
+    assert (tmp_path / "out.json").exists()
+
+
+def test_falls_back_when_no_daemon(tmp_path: Path, capsys):
+    data = tmp_path / "c.journal"
+    stale = tmp_path / "c.sock"
+    stale.touch()
+
+    assert main(["--data", str(data), "--socket", str(stale), "register", "Alex", "12", "archery"]) == 0
+    assert "Registered Alex" in capsys.readouterr().out
+
+
+def test_unanswered_request_is_reported_not_rerun(tmp_path: Path, capsys, monkeypatch):
+    data = tmp_path / "c.journal"
+    socket_path = tmp_path / "c.sock"
+    base = ["--data", str(data), "--socket", str(socket_path)]
+    monkeypatch.setattr(cli, "DAEMON_TIMEOUT", 0.2)
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+        listener.bind(str(socket_path))
+        listener.listen()
+        # Accepts connections but never replies, like a wedged daemon.
+        assert main([*base, "register", "Alex", "12", "archery"]) == 1
+        assert "did not answer within 0.2 s" in capsys.readouterr().err
+
+        # Reads the request, then hangs up without an answer.
+        def hang_up():
+            connection, _ = listener.accept()
+            with connection:
+                connection.recv(65536)
+
+        listener.accept()[0].close()  # the first client's connection
+        thread = threading.Thread(target=hang_up)
+        thread.start()
+        assert main([*base, "register", "Sam", "14", "archery"]) == 1
+        thread.join()
+        assert "gave no usable answer" in capsys.readouterr().err
+
+    assert open_registry(data).campers == []
+
+
+def test_refuses_to_start_over_live_daemon(daemon, capsys):
+    data, socket_path, server = daemon
+    assert run_daemon(data, socket_path) == 1
+    assert "already listening" in capsys.readouterr().err
+
+
+def test_cli_import_does_not_load_registry():
+    code = "import sys, camp_registration.cli; print('camp_registration.registry' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,105 @@
+from pathlib import Path
+
+import pytest
+
+from camp_registration.duplicates import (
+    DuplicateIndex,
+    find_duplicates,
+    name_tokens,
+    soundex,
+)
+from camp_registration.registry import (
+    CampRegistry,
+    Camper,
+    DuplicateCamperError,
+    PossibleDuplicateError,
+)
+
+
+def test_soundex_and_name_tokens():
+    assert soundex("robert") == soundex("rupert") == "r163"
+    assert soundex("ashcraft") == "a261"
+    assert soundex("smith") == soundex("smyth")
+    assert name_tokens("  Zoë O'Neil-Smith ") == ["zoe", "oneil", "smith"]
+
+
+@pytest.mark.parametrize(
+    "name", ["alex smith ", "Alex  Smyth", "Alx Smith", "Smith, Alex", "Blex Smith"]
+)
+def test_index_matches_likely_duplicates(name):
+    index = DuplicateIndex()
+    index.add(Camper("Alex Smith", 12, "archery"))
+    index.add(Camper("Sam Jones", 12, "archery"))
+
+    matches = index.matches(Camper(name, 12, "archery"))
+
+    assert [match.other.name for match in matches] == ["Alex Smith"]
+
+
+@pytest.mark.parametrize(
+    "camper",
+    [
+        Camper("Sam Smith", 12, "archery"),  # a sibling
+        Camper("Alex Smith", 13, "archery"),
+        Camper("Alex Smith", 12, "hiking"),
+    ],
+)
+def test_index_ignores_other_campers(camper):
+    index = DuplicateIndex()
+    index.add(Camper("Alex Smith", 12, "archery"))
+    assert index.matches(camper) == []
+
+
+def test_max_age_gap_and_remove():
+    index = DuplicateIndex(max_age_gap=1)
+    alex = Camper("Alex Smith", 12, "archery")
+    index.add(alex)
+    assert len(index.matches(Camper("Alex Smyth", 13, "archery"))) == 1
+
+    index.remove(alex)
+    assert index.matches(Camper("Alex Smyth", 13, "archery")) == []
+
+
+def test_find_duplicates_reports_each_pair_once():
+    campers = [
+        Camper("Alex Smith", 12, "archery"),
+        Camper("Jordan Lee", 10, "hiking"),
+        Camper("Sam Smith", 12, "archery"),
+        Camper("Alex Smyth", 12, "archery"),
+        Camper("Jordan Lea", 10, "hiking"),
+    ]
+
+    report = find_duplicates(campers)
+
+    assert [(match.camper.name, match.other.name) for match in report] == [
+        ("Alex Smyth", "Alex Smith"),
+        ("Jordan Lea", "Jordan Lee"),
+    ]
+    assert report[0].to_dict()["score"] == 0.9
+
+
+def test_registry_rejects_similar_names_when_checking(tmp_path: Path):
+    path = tmp_path / "campers.journal"
+    registry = CampRegistry.open(path, duplicates=DuplicateIndex())
+    registry.register_camper("Alex Smith", 12, "archery")
+
+    with pytest.raises(PossibleDuplicateError, match="looks like 'Alex Smith'"):
+        registry.register_camper("Alex Smyth", 12, "archery")
+    # Exact duplicates keep their own error.
+    with pytest.raises(DuplicateCamperError) as excinfo:
+        registry.register_camper("alex smith", 12, "archery")
+    assert not isinstance(excinfo.value, PossibleDuplicateError)
+
+    twin = registry.register_camper("Alex Smyth", 12, "archery", allow_similar=True)
+    assert twin in registry.campers
+
+    registry.cancel_camper("Alex Smith", "archery")
+    registry.cancel_camper("Alex Smyth", "archery")
+    registry.register_camper("Alix Smith", 12, "archery")
+
+    # A registry reopened from the journal rebuilds its index.
+    reopened = CampRegistry.open(path, duplicates=DuplicateIndex())
+    with pytest.raises(PossibleDuplicateError):
+        reopened.register_camper("Alex Smith", 12, "archery")
+    # Registries without an index only reject exact duplicates.
+    CampRegistry.open(path).register_camper("Alex Smith", 12, "archery")
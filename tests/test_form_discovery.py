@@ -0,0 +1,116 @@
+from pathlib import Path
+
+from camp_registration.form_discovery import discover_file, discover_form, read_chunks
+from camp_registration.form_simulator import parse_html, select_all
+
+
+PAGE = """<!doctype html>
+<html><body>
+<form action="/thanks">
+  <input type="hidden" name="token" value="abc">
+  <label for="camper-name">Camper <b>name</b></label>
+  <input id="camper-name" name="name" value="Alex">
+  <input name="age" type="number" placeholder="Age">
+  <label>Notes <textarea name="notes">Peanut allergy</textarea></label>
+  <input type="checkbox" name="sessions" value="archery" checked>
+  <input type="checkbox" name="sessions" value="hiking">
+  <input type="radio" name="shirt" value="s"><input type="radio" name="shirt" value="m">
+  <select id="session">
+    <option value="">Choose</option>
+    <option value="archery" selected>Archery</option>
+    <option>Hiking</option>
+  </select>
+  <div class="row"><input class="phone"></div>
+  <div class="row"><input class="phone"></div>
+  <input id="code" disabled>
+  <button type="submit">Register</button>
+</form>
+</body></html>
+"""
+
+
+def test_discovers_every_fillable_element_with_unique_selectors():
+    root = parse_html(PAGE)
+    form = discover_form(root)
+
+    assert [(item.kind, item.selector) for item in form.elements] == [
+        ("field", "#camper-name"),
+        ("field", 'input[name="age"]'),
+        ("field", 'textarea[name="notes"]'),
+        ("checkbox", 'input[name="sessions"][value="archery"]'),
+        ("checkbox", 'input[name="sessions"][value="hiking"]'),
+        ("checkbox", 'input[name="shirt"][value="s"]'),
+        ("checkbox", 'input[name="shirt"][value="m"]'),
+        ("select", "#session"),
+        ("field", "html > body > form > div:nth-of-type(1) > input"),
+        ("field", "html > body > form > div:nth-of-type(2) > input"),
+    ]
+    assert form.submit_selector == "html > body > form > button"
+    for item in form.elements:
+        assert len(select_all(root, item.selector)) == 1, item.selector
+
+
+def test_values_labels_and_options():
+    items = {item.selector: item for item in discover_form(parse_html(PAGE)).elements}
+
+    assert items["#camper-name"].value == "Alex"
+    assert items["#camper-name"].label == "Camper name"
+    assert items['input[name="age"]'].label == "Age"
+    assert items['textarea[name="notes"]'].value == "Peanut allergy"
+    assert items['textarea[name="notes"]'].label == "Notes"
+    assert items['input[name="sessions"][value="archery"]'].checked
+    assert items['input[name="shirt"][value="m"]'].radio
+    assert items["#session"].options == ["", "archery", "Hiking"]
+    assert items["#session"].value == "archery"
+
+
+def test_paths_anchor_on_nearest_unique_id_and_avoid_awkward_quotes():
+    root = parse_html(
+        '<div id="a"><p><span><input></span><span><input></span></p></div>'
+        '<input id="a b"><input id="x"><input id="x">'
+        """<input name='say "hi"'><input name="it's \\"">"""
+    )
+    selectors = [item.selector for item in discover_form(root).elements]
+
+    assert selectors == [
+        "#a > p > span:nth-of-type(1) > input",
+        "#a > p > span:nth-of-type(2) > input",
+        'input[id="a b"]',
+        "input:nth-of-type(2)",
+        "input:nth-of-type(3)",
+        """input[name='say "hi"']""",
+        "input:nth-of-type(5)",
+    ]
+    for selector in selectors:
+        assert len(select_all(root, selector)) == 1, selector
+
+
+def test_table_rows_get_the_implicit_tbody():
+    root = parse_html(
+        "<table><tr><td><input></td><td><input></td></tr><tr><td><input></td></tr>"
+        "</table><table><thead><tr><th><input></th></tr></thead>"
+        "<tbody><tr><td><input></td></tr></tbody></table>"
+    )
+    selectors = [item.selector for item in discover_form(root).elements]
+
+    assert selectors == [
+        "table:nth-of-type(1) > tbody > tr:nth-of-type(1) > td:nth-of-type(1) > input",
+        "table:nth-of-type(1) > tbody > tr:nth-of-type(1) > td:nth-of-type(2) > input",
+        "table:nth-of-type(1) > tbody > tr:nth-of-type(2) > td > input",
+        "table:nth-of-type(2) > thead > tr > th > input",
+        "table:nth-of-type(2) > tbody > tr > td > input",
+    ]
+    for selector in selectors:
+        assert len(select_all(root, selector)) == 1, selector
+    assert select_all(root, "table > tr") == []
+
+
+def test_discover_file_streams_large_pages(tmp_path: Path):
+    rows = "".join(f'<tr><td><input name="camper-{i}"></td></tr>' for i in range(5000))
+    path = tmp_path / "page.html"
+    path.write_text(f"<table>{rows}</table>", encoding="utf-8")
+
+    assert len(list(read_chunks(path, chunk_size=4096))) > 1
+    form = discover_file(path)
+    assert len(form.elements) == 5000
+    assert form.elements[-1].selector == 'input[name="camper-4999"]'
@@ -0,0 +1,143 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from camp_registration.form_simulator import (
+    UnsupportedSelector,
+    compile_selector,
+    parse_html,
+    select_all,
+)
+from camp_registration.web_form import (
+    ActionStep,
+    CheckboxField,
+    FormConfig,
+    FormField,
+    SelectField,
+    config_to_dict,
+    main,
+    validate_config,
+)
+
+
+FORM_HTML = """<!doctype html>
+<form action="/thanks" method="post">
+  <fieldset class="camper details">
+    <label>Name <input id="name" name="name" required></label>
+    <input id="age" name="age" type="number">
+    <textarea id="notes" name="notes"></textarea>
+  </fieldset>
+  <input name="sessions" type="checkbox" value="archery">
+  <input name="sessions" type="checkbox" value="hiking">
+  <input id="agree" name="agree" type="checkbox" required>
+  <input id="code" name="code" disabled>
+  <select id="session" name="session">
+    <option value="">Choose one
+    <option value="archery">Archery
+    <option>Hiking
+  </select>
+  <button type="button" class="next">Continue</button>
+  <button type="submit">Register</button>
+</form>
+"""
+
+
+def ids(elements):
+    return [element.attrs.get("id") or element.attrs.get("value") for element in elements]
+
+
+def test_selector_engine_resolves_css_subset():
+    root = parse_html(FORM_HTML)
+
+    assert ids(select_all(root, "#name")) == ["name"]
+    assert ids(select_all(root, "fieldset.camper > input")) == ["age"]
+    assert ids(select_all(root, "fieldset.camper input")) == ["name", "age"]
+    assert ids(select_all(root, ".details textarea, #agree")) == ["notes", "agree"]
+    assert ids(select_all(root, "input[name='sessions'][value=\"hiking\"]")) == ["hiking"]
+    assert ids(select_all(root, "input[type^=check]")) == ["archery", "hiking", "agree"]
+    assert ids(select_all(root, "input:disabled")) == ["code"]
+    assert ids(select_all(root, "#agree + input")) == ["code"]
+    assert ids(select_all(root, "form > input:nth-of-type(2)")) == ["hiking"]
+    assert len(select_all(root, "select option")) == 3
+    assert select_all(root, "#missing") == []
+
+
+@pytest.mark.parametrize("selector", ["text=Register", "#a >> #b", "button:has-text('Go')", "li:nth-child(2)"])
+def test_playwright_only_selectors_are_unsupported(selector):
+    with pytest.raises(UnsupportedSelector):
+        compile_selector(selector)
+
+
+def test_validate_config_reports_every_problem():
+    config = FormConfig(
+        url="https://example.com/register",
+        fields=[
+            FormField("#nmae", "Alex"),
+            FormField("#code", "X1"),
+            FormField("#agree", "yes"),
+        ],
+        checkboxes=[CheckboxField("input[name='sessions']")],
+        selects=[SelectField("#session", "climbing")],
+        actions=[ActionStep(kind="click", selector="text=Continue")],
+        submit_selector="button[type='submit']",
+    )
+
+    issues = validate_config(config, FORM_HTML)
+
+    assert [(issue.action, issue.selector, issue.severity) for issue in issues] == [
+        ("fill", "#nmae", "error"),
+        ("fill", "#code", "error"),
+        ("fill", "#agree", "error"),
+        ("check", "input[name='sessions']", "warning"),
+        ("select_option", "#session", "error"),
+        ("click", "text=Continue", "warning"),
+        ("submit", None, "error"),
+        ("submit", None, "error"),
+    ]
+    assert "No element matches" in issues[0].message
+    assert "is disabled" in issues[1].message
+    assert "not a text input" in issues[2].message
+    assert "matches 2 elements; the first, <input name='sessions'>" in issues[3].message
+    assert "'archery', 'Hiking'" in issues[4].message
+    assert "<input id='name'> is required but empty" in issues[6].message
+    assert "<input id='agree'> is required but not checked" in issues[7].message
+
+
+def test_valid_config_passes_with_fast_fill_falling_back_to_checks():
+    config = FormConfig(
+        url="https://example.com/register",
+        fields=[FormField("#name", "Alex"), FormField("#notes", "Vegetarian")],
+        checkboxes=[
+            CheckboxField("#agree"),
+            CheckboxField("input[name='sessions'][value='hiking']"),
+        ],
+        selects=[SelectField("#session", "Hiking")],
+        actions=[ActionStep(kind="click", selector="button.next")],
+        submit_selector="button[type='submit']",
+        success_selector=".confirmation",
+        fast_fill=True,
+    )
+
+    assert validate_config(config, FORM_HTML) == []
+    config.fields[0].selector = "#nope"
+    assert [issue.selector for issue in validate_config(config, FORM_HTML)] == ["#nope", None]
+
+
+def test_cli_validate_mode(tmp_path: Path, capsys):
+    html = tmp_path / "form.html"
+    html.write_text(FORM_HTML, encoding="utf-8")
+    good = FormConfig(
+        url="https://example.com/register",
+        fields=[FormField("#name", "Alex")],
+        checkboxes=[CheckboxField("#agree")],
+        submit_selector="button[type='submit']",
+    )
+    bad = FormConfig(url="https://example.com/register", fields=[FormField("#x", "y")])
+    for name, config in (("good.json", good), ("bad.json", bad)):
+        (tmp_path / name).write_text(json.dumps(config_to_dict(config)), encoding="utf-8")
+
+    assert main([str(tmp_path / "good.json"), "--validate", str(html)]) == 0
+    assert "Config is valid." in capsys.readouterr().out
+    assert main([str(tmp_path / "bad.json"), "--dry-run", str(html)]) == 1
+    assert "'#x': No element matches" in capsys.readouterr().out
@@ -0,0 +1,41 @@
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("tkinter")
+
+from camp_registration.gui import filter_campers, load_registry
+from camp_registration.registry import CampRegistry
+
+
+@pytest.fixture
+def registry() -> CampRegistry:
+    registry = CampRegistry()
+    registry.register_camper("Alex Rivera", 12, "archery")
+    registry.register_camper("Sam Lee", 9, "hiking")
+    registry.register_camper("Alexis Chen", 15, "hiking")
+    return registry
+
+
+@pytest.mark.parametrize(
+    ("query", "names"),
+    [
+        ("", ["Alex Rivera", "Sam Lee", "Alexis Chen"]),
+        ("  Hiking ", ["Sam Lee", "Alexis Chen"]),
+        ("12", ["Alex Rivera"]),
+        ("15-9", ["Alex Rivera", "Sam Lee", "Alexis Chen"]),
+        ("alex", ["Alex Rivera", "Alexis Chen"]),
+        ("LEE", ["Sam Lee"]),
+        ("nobody", []),
+    ],
+)
+def test_filter_campers(registry: CampRegistry, query: str, names: list[str]):
+    assert [camper.name for camper in filter_campers(registry, query)] == names
+
+
+def test_load_registry_reads_json_and_ndjson(registry: CampRegistry, tmp_path: Path):
+    registry.export_json(tmp_path / "campers.json")
+    registry.export_ndjson(tmp_path / "campers.ndjson")
+
+    for name in ("campers.json", "campers.ndjson"):
+        assert load_registry(tmp_path / name).campers == registry.campers
@@ -0,0 +1,40 @@
+from pathlib import Path
+
+from camp_registration.ledger import SubmissionLedger, config_key
+
+
+def test_ledger_replays_last_status_per_key(tmp_path: Path):
+    path = tmp_path / "run.ledger"
+    with SubmissionLedger(path) as ledger:
+        ledger.record("a", "failed", error="timeout")
+        ledger.record("a", "ok")
+        ledger.record("b", "submitting")
+        ledger.record("c", "failed")
+
+    reopened = SubmissionLedger(path)
+    reopened.close()
+
+    assert reopened.status("a") == "ok"
+    assert reopened.is_done("a") and reopened.is_done("b")
+    assert not reopened.is_done("c")
+    assert reopened.status("missing") is None
+    assert reopened.counts() == {"ok": 1, "submitting": 1, "failed": 1}
+
+
+def test_ledger_drops_torn_tail(tmp_path: Path):
+    path = tmp_path / "run.ledger"
+    with SubmissionLedger(path) as ledger:
+        ledger.record("a", "ok")
+    with path.open("a", encoding="utf-8") as fp:
+        fp.write('{"key": "b", "sta')
+
+    with SubmissionLedger(path) as ledger:
+        assert ledger.status("b") is None
+        ledger.record("b", "ok")
+
+    assert SubmissionLedger(path).counts() == {"ok": 2}
+
+
+def test_config_key_ignores_key_order():
+    assert config_key({"url": "x", "fields": []}) == config_key({"fields": [], "url": "x"})
+    assert config_key({"url": "x"}) != config_key({"url": "y"})
@@ -0,0 +1,118 @@
+import json
+import logging
+from pathlib import Path
+
+import pytest
+
+from camp_registration.cli import main
+from camp_registration.metrics import (
+    FORM_STEP_METRIC,
+    REGISTRY_METRIC,
+    HistogramSink,
+    JsonFileSink,
+    LogSink,
+    PrometheusFileSink,
+    sink_for_path,
+)
+from camp_registration.registry import CampRegistry, Camper
+from camp_registration.web_form import FormConfig, FormField, _fill_form
+
+
+def series(sink, metric):
+    return {
+        tuple(sorted(entry["labels"].items())): entry
+        for entry in sink.snapshot().get(metric, [])
+    }
+
+
+def test_histogram_buckets_are_cumulative():
+    sink = HistogramSink(buckets=(0.01, 0.1))
+    for seconds in (0.005, 0.01, 0.05, 2.0):
+        sink.observe("op_seconds", seconds, {"operation": "x"})
+
+    (entry,) = sink.snapshot()["op_seconds"]
+
+    assert entry["count"] == 4
+    assert entry["sum"] == pytest.approx(2.065)
+    assert entry["buckets"] == {"0.01": 2, "0.1": 3, "+Inf": 4}
+
+
+def test_registry_operations_are_timed(tmp_path: Path):
+    sink = HistogramSink()
+    registry = CampRegistry.open(tmp_path / "campers.journal", metrics=sink)
+    registry.register_camper("Alex", 12, "archery")
+    with pytest.raises(ValueError):
+        registry.register_camper("Alex", 12, "archery")
+    registry.seed([Camper("Sam", 14, "hiking")])
+    registry.export_json(tmp_path / "campers.json")
+    registry.load_from_json(tmp_path / "campers.json")
+
+    timed = series(sink, REGISTRY_METRIC)
+
+    assert timed[(("operation", "register"), ("outcome", "ok"))]["count"] == 1
+    assert timed[(("operation", "register"), ("outcome", "error"))]["count"] == 1
+    for operation in ("seed", "export", "load", "persist", "sync"):
+        assert timed[(("operation", operation), ("outcome", "ok"))]["count"] >= 1
+
+
+class Page:
+    def __getattr__(self, method):
+        return lambda *args, **kwargs: None
+
+
+def test_fill_form_steps_are_timed():
+    sink = HistogramSink()
+    config = FormConfig(
+        url="https://example.com",
+        fields=[FormField("#a", "1"), FormField("#b", "2")],
+        submit_selector="button",
+        wait_after_submit_ms=0,
+    )
+
+    _fill_form(Page(), config, metrics=sink)
+
+    counts = {
+        dict(labels)["step"]: entry["count"]
+        for labels, entry in series(sink, FORM_STEP_METRIC).items()
+    }
+    assert counts == {"goto": 1, "fill": 2, "submit": 2}
+
+
+def test_file_sinks_write_prometheus_and_json(tmp_path: Path):
+    prom = PrometheusFileSink(tmp_path / "camp.prom", buckets=(0.5,))
+    prom.observe(REGISTRY_METRIC, 0.25, {"operation": "say \"hi\""})
+    prom.flush()
+    text = (tmp_path / "camp.prom").read_text(encoding="utf-8")
+
+    assert text.splitlines() == [
+        f"# TYPE {REGISTRY_METRIC} histogram",
+        f'{REGISTRY_METRIC}_bucket{{operation="say \\"hi\\"",le="0.5"}} 1',
+        f'{REGISTRY_METRIC}_bucket{{operation="say \\"hi\\"",le="+Inf"}} 1',
+        f'{REGISTRY_METRIC}_sum{{operation="say \\"hi\\""}} 0.25',
+        f'{REGISTRY_METRIC}_count{{operation="say \\"hi\\""}} 1',
+    ]
+
+    sink = sink_for_path(str(tmp_path / "camp.json"))
+    assert isinstance(sink, JsonFileSink)
+    sink.observe("x_seconds", 1.0, {})
+    sink.flush()
+    assert json.loads((tmp_path / "camp.json").read_text())["x_seconds"][0]["count"] == 1
+
+
+def test_log_sink_writes_one_line_per_observation(caplog):
+    caplog.set_level(logging.INFO, logger="camp_registration.metrics")
+
+    LogSink().observe(FORM_STEP_METRIC, 0.0125, {"step": "fill", "outcome": "ok"})
+
+    assert caplog.messages == [f"{FORM_STEP_METRIC} outcome=ok step=fill ms=12.500"]
+
+
+def test_cli_metrics_option(tmp_path: Path):
+    data = tmp_path / "campers.journal"
+    prom = tmp_path / "cli.prom"
+
+    argv = ["--data", str(data), "--metrics", str(prom), "register", "Alex", "12", "archery"]
+    assert main(argv) == 0
+
+    text = prom.read_text(encoding="utf-8")
+    assert f'{REGISTRY_METRIC}_count{{operation="register",outcome="ok"}} 1' in text
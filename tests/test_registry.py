@@ -1,9 +1,16 @@
 from pathlib import Path
 import json
+import random
 
 import pytest
 
-from camp_registration.registry import CampRegistry, Camper
+from camp_registration.registry import (
+    CampRegistry,
+    Camper,
+    Change,
+    ChangesUnavailableError,
+    DuplicateCamperError,
+)
 
 
 def test_register_camper_success():
@@ -41,3 +48,162 @@ def test_export_and_load(tmp_path: Path):
     assert loaded.list_campers() == registry.list_campers()
     payload = json.loads(output_path.read_text(encoding="utf-8"))
     assert payload[0]["name"] == "Alex"
+
+
+def test_index_queries():
+    registry = CampRegistry()
+    alex = registry.register_camper("Alex", 12, "archery")
+    sam = registry.register_camper("Sam", 14, "hiking")
+    registry.seed([Camper("alex  ", 9, "arts")])
+
+    assert registry.by_session("Archery") == [alex]
+    assert registry.by_age_range(9, 12) == [alex, Camper("alex  ", 9, "arts")]
+    assert registry.find_by_name(" ALEX") == [alex, Camper("alex  ", 9, "arts")]
+    assert registry.session_counts() == {"archery": 1, "arts": 1, "hiking": 1}
+    assert registry.is_registered("sam", "hiking")
+    assert not registry.is_registered("sam", "archery")
+
+    registry.clear()
+
+    assert registry.by_session("hiking") == []
+    assert registry.session_counts() == {}
+    assert sam not in registry.list_campers()
+
+
+def test_register_rejects_duplicate_in_same_session():
+    registry = CampRegistry()
+    registry.register_camper("Alex Smith", 12, "archery")
+
+    with pytest.raises(DuplicateCamperError, match="already registered"):
+        registry.register_camper(" alex  smith", 12, "Archery")
+
+    registry.register_camper("Alex Smith", 12, "hiking")
+    assert len(registry.campers) == 2
+
+
+def test_capacity_waitlist_and_promotion():
+    registry = CampRegistry(capacities={"archery": 2})
+    registry.register_camper("Alex", 12, "archery")
+    sam = registry.register_camper("Sam", 14, "archery")
+    jo = registry.register_camper("Jo", 9, "archery")
+    kim = registry.register_camper("Kim", 10, "archery")
+
+    assert registry.enrolled_count("archery") == 2
+    assert registry.is_full("archery")
+    assert registry.waitlist("archery") == [jo, kim]
+    assert registry.waitlist_position("kim", "archery") == 2
+
+    with pytest.raises(DuplicateCamperError):
+        registry.register_camper("Jo", 9, "archery")
+
+    registry.cancel_camper("alex", "archery")
+
+    assert registry.by_session("archery") == [sam, jo]
+    assert registry.waitlist("archery") == [kim]
+
+    registry.cancel_camper("Kim", "archery")
+    registry.set_capacity("archery", None)
+    assert not registry.is_full("archery")
+
+    with pytest.raises(ValueError, match="not registered"):
+        registry.cancel_camper("Kim", "archery")
+
+
+def test_changes_since_returns_only_the_delta():
+    registry = CampRegistry()
+    registry.set_capacity("archery", 1)
+    registry.register_camper("Alex", 12, "archery")
+    start = registry.sequence
+    registry.register_camper("Sam", 14, "archery")
+    registry.register_camper("Kim", 10, "hiking")
+    registry.cancel_camper("Alex", "archery")
+
+    assert registry.changes_since(start) == [
+        Change(start + 1, "waitlist", Camper("Sam", 14, "archery")),
+        Change(start + 2, "register", Camper("Kim", 10, "hiking")),
+        Change(start + 3, "cancel", Camper("Alex", 12, "archery")),
+        Change(start + 3, "promote", Camper("Sam", 14, "archery")),
+    ]
+    assert registry.changes_since(registry.sequence) == []
+    with pytest.raises(ChangesUnavailableError, match="ahead"):
+        registry.changes_since(registry.sequence + 1)
+
+
+def test_changes_since_spans_processes_and_compaction(tmp_path: Path):
+    path = tmp_path / "campers.journal"
+    reader = CampRegistry.open(path)
+    writer = CampRegistry.open(path)
+    writer.register_camper("Alex", 12, "archery")
+
+    assert [change.camper.name for change in reader.changes_since(0)] == ["Alex"]
+
+    # A compaction the reader did not see drops the history before it.
+    writer.storage.snapshot_every = 1
+    writer.register_camper("Sam", 14, "hiking")
+    with pytest.raises(ChangesUnavailableError, match="full roster"):
+        reader.changes_since(1)
+    assert reader.changes_since(reader.sequence) == []
+
+
+def test_change_log_is_bounded_and_reset_by_wholesale_loads():
+    registry = CampRegistry(change_log_size=2)
+    for name in ("Alex", "Sam", "Kim"):
+        registry.register_camper(name, 12, "archery")
+
+    assert [change.camper.name for change in registry.changes_since(1)] == ["Sam", "Kim"]
+    with pytest.raises(ChangesUnavailableError):
+        registry.changes_since(0)
+
+    registry.clear()
+    with pytest.raises(ChangesUnavailableError):
+        registry.changes_since(3)
+    assert registry.changes_since(registry.sequence) == []
+
+
+def test_subscribers_see_committed_changes():
+    registry = CampRegistry()
+    seen = []
+    unsubscribe = registry.subscribe(seen.append)
+
+    registry.register_many([("Alex", 12, "archery"), ("Bo", 3, "archery")])
+    with pytest.raises(DuplicateCamperError):
+        registry.register_camper("Alex", 12, "archery")
+    unsubscribe()
+    registry.register_camper("Sam", 14, "hiking")
+
+    assert seen == [Change(1, "register", Camper("Alex", 12, "archery"))]
+
+
+@pytest.mark.parametrize("reindex_after", [2, 1024])
+def test_indexes_and_waitlists_stay_exact_across_cancellations(
+    monkeypatch, reindex_after
+):
+    monkeypatch.setattr("camp_registration.registry.REINDEX_AFTER", reindex_after)
+    rng = random.Random(7)
+    registry = CampRegistry(capacities={"archery": 15, "arts": 10})
+    for step in range(400):
+        session = rng.choice(["archery", "arts", "hiking"])
+        name = f"Camper {rng.randrange(60)}"
+        if rng.random() < 0.6:
+            if not registry.is_registered(name, session):
+                registry.register_camper(name, rng.randrange(7, 18), session)
+        elif registry.is_registered(name, session):
+            registry.cancel_camper(name, session)
+        if step % 50 == 0:
+            registry.set_capacity("arts", rng.randrange(5, 15))
+
+    fresh = CampRegistry(campers=list(registry.campers))
+    for session in ("archery", "arts", "hiking"):
+        assert registry.by_session(session) == fresh.by_session(session)
+        waiting = registry.waitlist(session)
+        for position, camper in enumerate(waiting, start=1):
+            assert registry.waitlist_position(camper.name, session) == position
+        for index in range(60):
+            name = f"Camper {index}"
+            assert registry.is_registered(name, session) == (
+                fresh.is_registered(name, session)
+                or any(camper.name == name for camper in waiting)
+            )
+    assert registry.by_age_range(9, 13) == fresh.by_age_range(9, 13)
+    assert registry.find_by_name("Camper 3") == fresh.find_by_name("Camper 3")
+    assert registry.session_counts() == fresh.session_counts()
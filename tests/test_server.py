@@ -0,0 +1,194 @@
+import asyncio
+import http.client
+import json
+from pathlib import Path
+import socket
+
+from camp_registration.registry import CampRegistry
+from camp_registration.server import MAX_BODY, RegistrationServer, percentile
+from camp_registration.storage import JournalStorage
+
+
+def _request(port: int, method: str, path: str, payload=None):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    try:
+        body = None if payload is None else json.dumps(payload)
+        connection.request(method, path, body=body)
+        response = connection.getresponse()
+        data = response.read()
+        if response.getheader("Content-Type") == "application/json":
+            data = json.loads(data)
+        return response.status, data
+    finally:
+        connection.close()
+
+
+def _run(registry: CampRegistry, scenario):
+    async def main():
+        server = RegistrationServer(registry)
+        await server.start("127.0.0.1", 0)
+        try:
+            return await scenario(server)
+        finally:
+            await server.close()
+
+    return asyncio.run(main())
+
+
+def test_concurrent_registrations_are_group_committed(tmp_path: Path):
+    path = tmp_path / "campers.journal"
+    registry = CampRegistry.open(path)
+
+    async def scenario(server):
+        responses = await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    _request,
+                    server.port,
+                    "POST",
+                    "/campers",
+                    {"name": f"Camper {index}", "age": 7 + index % 11, "session": "arts"},
+                )
+                for index in range(40)
+            )
+        )
+        metrics = await asyncio.to_thread(_request, server.port, "GET", "/metrics")
+        return responses, metrics
+
+    responses, (status, metrics) = _run(registry, scenario)
+
+    assert {status for status, _ in responses} == {201}
+    assert status == 200
+    assert metrics["group_commits"]["count"] <= 40
+    assert sum(registry.session_counts().values()) == 40
+    assert metrics["latency"]["POST /campers"]["count"] == 40
+    assert metrics["latency"]["POST /campers"]["p99_ms"] >= 0
+    assert len(CampRegistry.open(path).campers) == 40
+
+
+def test_list_counts_export_and_errors():
+    registry = CampRegistry(capacities={"archery": 1})
+    for index in range(5):
+        registry.register_camper(f"Hiker {index}", 12, "hiking")
+
+    async def scenario(server):
+        port = server.port
+        calls = [
+            ("POST", "/campers", {"name": "Alex", "age": 12, "session": "archery"}),
+            ("POST", "/campers", {"name": "Sam", "age": 12, "session": "archery"}),
+            ("POST", "/campers", {"name": "alex", "age": 12, "session": "archery"}),
+            ("POST", "/campers", {"name": "Jo", "age": 4, "session": "arts"}),
+            ("POST", "/campers", {"name": "Jo"}),
+            ("POST", "/campers", {"name": None, "age": 12, "session": "arts"}),
+            ("POST", "/campers", {"name": "Jo", "age": 12.9, "session": "arts"}),
+            ("POST", "/campers", {"name": "Jo", "age": True, "session": "arts"}),
+            ("POST", "/campers", {"name": "Jo", "age": 12, "session": ["arts"]}),
+            ("POST", "/campers", ["Jo", 12, "arts"]),
+            ("GET", "/campers?session=hiking&offset=1&limit=2", None),
+            ("GET", "/counts", None),
+            ("GET", "/export", None),
+            ("GET", "/missing", None),
+        ]
+        return [await asyncio.to_thread(_request, port, *call) for call in calls]
+
+    results = _run(registry, scenario)
+
+    assert results[0] == (
+        201,
+        {"name": "Alex", "age": 12, "session": "archery", "status": "enrolled"},
+    )
+    assert results[1][1]["status"] == "waitlisted" and results[1][1]["position"] == 1
+    assert results[2][0] == 409
+    assert results[3][0] == 400 and "between 7 and 17" in results[3][1]["error"]
+    assert [status for status, _ in results[4:10]] == [400] * 6
+    page = results[10][1]
+    assert page["total"] == 5
+    assert [camper["name"] for camper in page["campers"]] == ["Hiker 1", "Hiker 2"]
+    assert results[11][1]["archery"] == {"enrolled": 1, "capacity": 1, "waitlisted": 1}
+    exported = [json.loads(line) for line in results[12][1].decode().splitlines()]
+    assert len(exported) == 6
+    assert results[13][0] == 404
+
+
+def test_reads_pick_up_changes_from_other_writers(tmp_path: Path):
+    path = tmp_path / "campers.journal"
+    registry = CampRegistry.open(path)
+    registry.register_camper("Alex", 12, "archery")
+
+    async def scenario(server):
+        other = CampRegistry.open(path)
+        other.register_camper("Sam", 14, "archery")
+        other.set_capacity("archery", 5)
+        campers = await asyncio.to_thread(_request, server.port, "GET", "/campers")
+        counts = await asyncio.to_thread(_request, server.port, "GET", "/counts")
+        return campers[1], counts[1]
+
+    campers, counts = _run(registry, scenario)
+
+    assert [camper["name"] for camper in campers["campers"]] == ["Alex", "Sam"]
+    assert counts["archery"] == {"enrolled": 2, "capacity": 5, "waitlisted": 0}
+
+
+class FullDisk(JournalStorage):
+    full = True
+
+    def append(self, records):
+        if self.full:
+            raise OSError(28, "No space left on device")
+        super().append(records)
+
+
+def test_storage_errors_are_reported_as_500(tmp_path: Path):
+    path = tmp_path / "campers.journal"
+    registry = CampRegistry(storage=FullDisk(path))
+
+    async def scenario(server):
+        port = server.port
+        payload = {"name": "Alex", "age": 12, "session": "archery"}
+        failed = await asyncio.to_thread(_request, port, "POST", "/campers", payload)
+        counts = await asyncio.to_thread(_request, port, "GET", "/counts")
+        registry.storage.full = False
+        retried = await asyncio.to_thread(_request, port, "POST", "/campers", payload)
+        return failed, counts, retried
+
+    (status, body), (_, counts), (retry_status, _) = _run(registry, scenario)
+
+    assert status == 500
+    assert "No space left on device" in body["error"]
+    assert counts["archery"]["enrolled"] == 0
+    assert retry_status == 201
+    assert [camper.name for camper in CampRegistry.open(path).campers] == ["Alex"]
+
+
+def _raw_request(port: int, data: bytes) -> bytes:
+    with socket.create_connection(("127.0.0.1", port), timeout=10) as connection:
+        connection.sendall(data)
+        chunks = []
+        while chunk := connection.recv(65536):
+            chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def test_bad_content_length_is_rejected():
+    async def scenario(server):
+        return [
+            await asyncio.to_thread(
+                _raw_request,
+                server.port,
+                f"POST /campers HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode(),
+            )
+            for length in ("-5", "abc", str(MAX_BODY + 1))
+        ]
+
+    negative, invalid, too_large = _run(CampRegistry(), scenario)
+
+    assert negative.startswith(b"HTTP/1.1 400 ")
+    assert b"Invalid Content-Length" in negative
+    assert invalid.startswith(b"HTTP/1.1 400 ")
+    assert too_large.startswith(b"HTTP/1.1 413 ")
+
+
+def test_percentile():
+    assert percentile([], 50) == 0.0
+    assert percentile(range(1, 101), 50) == 51
+    assert percentile(range(1, 101), 99) == 99
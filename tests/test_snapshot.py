@@ -0,0 +1,112 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from camp_registration.cli import main
+from camp_registration.registry import CampRegistry, Camper
+from camp_registration.snapshot import open_snapshot
+from camp_registration.storage import JournalStorage
+
+
+def _registry() -> CampRegistry:
+    registry = CampRegistry()
+    registry.set_capacity("archery", 2)
+    for name, age, session in [
+        ("Alex", 12, "archery"),
+        ("Zoë Müller", 11, "archery"),
+        ("Sam", 14, "archery"),
+        ("Jo", 9, "arts"),
+        ("Renée", 10, "archery"),
+    ]:
+        registry.register_camper(name, age, session)
+    return registry
+
+
+def test_snapshot_round_trip_matches_json(tmp_path: Path):
+    registry = _registry()
+    registry.export_json(tmp_path / "campers.json")
+    registry.save_snapshot(tmp_path / "campers.snapshot")
+
+    from_json = CampRegistry()
+    from_json.load_from_json(tmp_path / "campers.json")
+    from_snapshot = CampRegistry()
+    from_snapshot.load_snapshot(tmp_path / "campers.snapshot")
+
+    assert list(from_snapshot.campers) == list(from_json.campers)
+    assert list(from_snapshot.campers) == list(registry.campers)
+    assert from_snapshot.waitlist("archery") == registry.waitlist("archery")
+    assert from_snapshot.capacities == {"archery": 2}
+
+
+def test_snapshot_reads_campers_lazily(tmp_path: Path):
+    path = tmp_path / "campers.snapshot"
+    registry = _registry()
+    registry.save_snapshot(path)
+
+    with open_snapshot(path) as snapshot:
+        assert len(snapshot) == 3
+        assert snapshot[1] == Camper("Zoë Müller", 11, "archery")
+        assert snapshot[-1] == Camper("Jo", 9, "arts")
+        assert snapshot[::2] == [snapshot[0], snapshot[2]]
+        assert list(snapshot) == list(registry.campers)
+        assert [c.name for c in snapshot.waitlists()["archery"]] == ["Sam", "Renée"]
+        with pytest.raises(IndexError):
+            snapshot[3]
+
+
+def test_invalid_snapshot_is_rejected(tmp_path: Path):
+    path = tmp_path / "campers.snapshot"
+    path.write_bytes(b"[]")
+    with pytest.raises(ValueError):
+        open_snapshot(path)
+
+    _registry().save_snapshot(path)
+    path.write_bytes(path.read_bytes()[:-4])
+    with pytest.raises(ValueError, match="truncated"):
+        CampRegistry().load_snapshot(path)
+
+
+def test_journal_reads_legacy_json_snapshot(tmp_path: Path):
+    path = tmp_path / "campers.journal"
+    path.with_name("campers.journal.snapshot").write_text(
+        json.dumps(
+            {
+                "seq": 2,
+                "campers": [{"name": "Alex", "age": 12, "session": "archery"}],
+                "capacities": {"archery": 1},
+                "waitlists": {
+                    "archery": [{"name": "Sam", "age": 14, "session": "archery"}]
+                },
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    registry = CampRegistry.open(path)
+
+    assert registry.list_campers() == [Camper("Alex", 12, "archery")]
+    assert registry.waitlist("archery") == [Camper("Sam", 14, "archery")]
+    assert registry.sequence == 2
+
+
+def test_list_streams_from_compacted_journal(tmp_path: Path, capsys, monkeypatch):
+    path = tmp_path / "campers.journal"
+    registry = CampRegistry(storage=JournalStorage(path, snapshot_every=6))
+    registry.set_capacity("archery", 2)
+    for camper in _registry().campers:
+        registry.register_camper(camper.name, camper.age, camper.session)
+    registry.register_camper("Sam", 14, "archery")
+    registry.register_camper("Renée", 10, "archery")
+    assert path.read_bytes() == b""
+
+    outputs = []
+    for _ in range(2):
+        for output_format in ("text", "json"):
+            assert main(["--data", str(path), "list", "--format", output_format]) == 0
+            outputs.append(capsys.readouterr().out)
+        # Without a usable snapshot, list loads the whole registry.
+        monkeypatch.setattr(JournalStorage, "open_snapshot", lambda self: None)
+
+    assert outputs[:2] == outputs[2:]
+    assert "archery: 2/2, 2 waitlisted" in outputs[0]
@@ -0,0 +1,37 @@
+from pathlib import Path
+
+import pytest
+
+from camp_registration.registry import Camper
+from camp_registration.sqlite_registry import SqliteCampRegistry
+
+
+def test_register_and_query(tmp_path: Path):
+    with SqliteCampRegistry(tmp_path / "campers.db") as registry:
+        alex = registry.register_camper(" Alex ", 12, "Archery")
+        registry.seed([Camper("Sam", 14, "hiking"), Camper("alex", 9, "archery")])
+
+        assert alex == Camper("Alex", 12, "archery")
+        assert len(registry) == 3
+        assert registry.by_session("archery") == [alex, Camper("alex", 9, "archery")]
+        assert registry.by_age_range(10, 14) == [alex, Camper("Sam", 14, "hiking")]
+        assert len(registry.find_by_name("ALEX")) == 2
+        assert registry.session_counts() == {"archery": 2, "hiking": 1}
+
+        with pytest.raises(ValueError, match="not available"):
+            registry.register_camper("Jo", 10, "unknown")
+
+    with SqliteCampRegistry(tmp_path / "campers.db") as reopened:
+        assert len(reopened) == 3
+
+
+def test_export_and_load(tmp_path: Path):
+    registry = SqliteCampRegistry()
+    registry.seed([Camper("Alex", 12, "archery"), Camper("Sam", 14, "hiking")])
+    registry.export_json(tmp_path / "campers.json")
+
+    loaded = SqliteCampRegistry()
+    loaded.register_camper("Jo", 10, "arts")
+    loaded.load_from_json(tmp_path / "campers.json")
+
+    assert loaded.list_campers() == registry.list_campers()
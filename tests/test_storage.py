@@ -0,0 +1,114 @@
+from pathlib import Path
+
+import pytest
+
+from camp_registration.registry import CampRegistry, Camper
+from camp_registration.storage import JournalStorage
+
+
+def test_journal_replays_registrations(tmp_path: Path):
+    path = tmp_path / "campers.journal"
+    registry = CampRegistry.open(path)
+    registry.register_camper("Alex", 12, "archery")
+    registry.seed([Camper("Sam", 14, "hiking"), Camper("Jo", 9, "arts")])
+
+    reopened = CampRegistry.open(path)
+
+    assert reopened.list_campers() == registry.list_campers()
+    assert reopened.sequence == registry.sequence == 3
+
+
+def test_snapshot_compacts_journal(tmp_path: Path):
+    path = tmp_path / "campers.journal"
+    registry = CampRegistry(storage=JournalStorage(path, snapshot_every=2))
+    registry.register_camper("Alex", 12, "archery")
+    registry.register_camper("Sam", 14, "hiking")
+    registry.register_camper("Jo", 9, "arts")
+
+    assert path.with_name("campers.journal.snapshot").exists()
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 1
+
+    reopened = CampRegistry.open(path)
+    assert [camper.name for camper in reopened.campers] == ["Alex", "Sam", "Jo"]
+
+
+def test_load_from_json_writes_snapshot(tmp_path: Path):
+    source = CampRegistry()
+    source.seed([Camper("Alex", 12, "archery")])
+    source.export_json(tmp_path / "campers.json")
+
+    path = tmp_path / "campers.journal"
+    registry = CampRegistry.open(path)
+    registry.register_camper("Sam", 14, "hiking")
+    registry.load_from_json(tmp_path / "campers.json")
+
+    assert CampRegistry.open(path).list_campers() == [Camper("Alex", 12, "archery")]
+
+
+def test_torn_tail_is_discarded(tmp_path: Path):
+    path = tmp_path / "campers.journal"
+    registry = CampRegistry.open(path)
+    registry.register_camper("Alex", 12, "archery")
+    with path.open("a", encoding="utf-8") as fp:
+        fp.write('{"op": "register", "cam')
+
+    reopened = CampRegistry.open(path)
+    reopened.register_camper("Sam", 14, "hiking")
+
+    names = [camper.name for camper in CampRegistry.open(path).campers]
+    assert names == ["Alex", "Sam"]
+
+
+def test_journal_replays_waitlist_and_cancellations(tmp_path: Path):
+    path = tmp_path / "campers.journal"
+    registry = CampRegistry.open(path)
+    registry.set_capacity("hiking", 1)
+    registry.register_camper("Alex", 12, "hiking")
+    registry.register_camper("Sam", 14, "hiking")
+    registry.register_camper("Jo", 9, "hiking")
+    registry.cancel_camper("Alex", "hiking")
+
+    reopened = CampRegistry.open(path)
+
+    assert reopened.capacities == {"hiking": 1}
+    assert [camper.name for camper in reopened.campers] == ["Sam"]
+    assert [camper.name for camper in reopened.waitlist("hiking")] == ["Jo"]
+
+    compacted = CampRegistry(storage=JournalStorage(path, snapshot_every=1))
+    compacted.register_camper("Kim", 10, "arts")
+
+    reopened = CampRegistry.open(path)
+    assert [camper.name for camper in reopened.waitlist("hiking")] == ["Jo"]
+    assert reopened.session_counts() == {"arts": 1, "hiking": 1}
+
+
+class FlakyStorage(JournalStorage):
+    fail = False
+
+    def append(self, records):
+        if self.fail:
+            raise OSError(28, "No space left on device")
+        super().append(records)
+
+
+def test_failed_append_leaves_memory_matching_disk(tmp_path: Path):
+    path = tmp_path / "campers.journal"
+    registry = CampRegistry(storage=FlakyStorage(path))
+    registry.register_camper("Alex", 12, "archery")
+    changes = []
+    registry.subscribe(changes.append)
+
+    registry.storage.fail = True
+    with pytest.raises(OSError):
+        registry.register_camper("Sam", 14, "archery")
+    with pytest.raises(OSError):
+        registry.register_many([("Jo", 9, "arts")])
+
+    assert [camper.name for camper in registry.campers] == ["Alex"]
+    assert registry.sequence == 1
+    assert changes == []
+
+    registry.storage.fail = False
+    registry.register_camper("Sam", 14, "archery")
+    assert [change.seq for change in changes] == [2]
+    assert CampRegistry.open(path).list_campers() == registry.list_campers()
@@ -0,0 +1,63 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from camp_registration.registry import CampRegistry, Camper
+from camp_registration.streaming import (
+    iter_json_array,
+    iter_ndjson,
+    write_json_array,
+    write_ndjson,
+)
+
+
+def test_json_array_writer_matches_json_dumps(tmp_path: Path):
+    records = [{"name": "Alex", "age": 12, "session": "archery", "tags": [1, 2]}] * 3
+    path = tmp_path / "campers.json"
+
+    write_json_array(path, iter(records))
+    assert path.read_text(encoding="utf-8") == json.dumps(records, indent=2)
+
+    write_json_array(path, [])
+    assert path.read_text(encoding="utf-8") == "[]"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_iter_json_array_across_chunk_boundaries(tmp_path: Path, chunk_size: int):
+    records = [{"name": f"Camper {i}", "age": 7 + i % 11, "n": 10**i} for i in range(20)]
+    path = tmp_path / "campers.json"
+    path.write_text(json.dumps(records, indent=2), encoding="utf-8")
+
+    assert list(iter_json_array(path, chunk_size=chunk_size)) == records
+
+    path.write_text(" [ ] ", encoding="utf-8")
+    assert list(iter_json_array(path, chunk_size=chunk_size)) == []
+
+
+def test_iter_json_array_rejects_malformed_input(tmp_path: Path):
+    path = tmp_path / "campers.json"
+    path.write_text('[{"name": "Alex"} {"name": "Sam"}]', encoding="utf-8")
+
+    with pytest.raises(ValueError, match="expected ','"):
+        list(iter_json_array(path))
+
+
+def test_ndjson_round_trip(tmp_path: Path):
+    registry = CampRegistry()
+    registry.seed([Camper("Alex", 12, "archery"), Camper("Sam", 14, "hiking")])
+    path = tmp_path / "campers.ndjson"
+
+    registry.export_ndjson(path)
+    assert list(iter_ndjson(path)) == [
+        {"name": "Alex", "age": 12, "session": "archery"},
+        {"name": "Sam", "age": 14, "session": "hiking"},
+    ]
+
+    loaded = CampRegistry()
+    loaded.load_from_ndjson(path)
+    assert loaded.list_campers() == registry.list_campers()
+    assert loaded.by_session("hiking") == [Camper("Sam", 14, "hiking")]
+
+    write_ndjson(path, [])
+    assert path.read_text(encoding="utf-8") == ""
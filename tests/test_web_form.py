@@ -1,14 +1,34 @@
+import asyncio
+from contextlib import contextmanager
+from dataclasses import replace
 import json
+import os
 from pathlib import Path
+from types import SimpleNamespace
 
+import pytest
+
+from camp_registration.ledger import SubmissionLedger
+from camp_registration.registry import CampRegistry, Camper
 from camp_registration.web_form import (
     CheckboxField,
     FormConfig,
     FormField,
     ActionStep,
+    ConfigError,
     SelectField,
-    _load_config,
+    FAST_FILL_SCRIPT,
+    _fill_form,
+    load_config,
+    _run_pool,
+    camper_placeholders,
     config_to_dict,
+    expand_config,
+    iter_roster_configs,
+    main,
+    parse_config,
+    run_batch,
+    submission_key,
 )
 
 
@@ -27,7 +47,7 @@ def test_config_to_dict_round_trip(tmp_path: Path):
     path = tmp_path / "config.json"
     path.write_text(json.dumps(payload), encoding="utf-8")
 
-    loaded = _load_config(path)
+    loaded = load_config(path)
 
     assert loaded.url == config.url
     assert loaded.fields == config.fields
@@ -36,3 +56,525 @@ def test_config_to_dict_round_trip(tmp_path: Path):
     assert loaded.submit_selector == config.submit_selector
     assert loaded.wait_after_submit_ms == config.wait_after_submit_ms
     assert loaded.actions == config.actions
+
+
+class RecordingPage:
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, method):
+        def record(*args, **kwargs):
+            self.calls.append((method, args, kwargs))
+
+        return record
+
+    @contextmanager
+    def expect_response(self, pattern, **kwargs):
+        self.calls.append(("expect_response", (pattern,), kwargs))
+        yield SimpleNamespace(value="response")
+        self.calls.append(("response_received", (pattern,), {}))
+
+
+def test_fill_form_issues_page_calls_in_order():
+    config = FormConfig(
+        url="https://example.com/form",
+        fields=[FormField(selector="#name", value="Alex")],
+        checkboxes=[
+            CheckboxField(selector="#agree", checked=True),
+            CheckboxField(selector="#news", checked=False),
+        ],
+        selects=[SelectField(selector="#session", value="archery")],
+        actions=[ActionStep(kind="click", selector=".next"), ActionStep(kind="wait")],
+        submit_selector="button",
+        wait_after_submit_ms=500,
+    )
+    page = RecordingPage()
+
+    _fill_form(page, config)
+
+    assert page.calls == [
+        ("goto", ("https://example.com/form",), {"wait_until": "domcontentloaded"}),
+        ("fill", ("#name", "Alex"), {}),
+        ("check", ("#agree",), {}),
+        ("uncheck", ("#news",), {}),
+        ("select_option", ("#session", "archery"), {}),
+        ("click", (".next",), {}),
+        ("wait_for_timeout", (0,), {}),
+        ("click", ("button",), {}),
+        ("wait_for_timeout", (500,), {}),
+    ]
+
+
+class FastFillPage(RecordingPage):
+    def __init__(self, failed):
+        super().__init__()
+        self.failed = failed
+
+    def evaluate(self, script, items):
+        self.calls.append(("evaluate", (items,), {}))
+        return self.failed
+
+
+def test_fast_fill_sets_elements_in_one_call_and_retries_failures():
+    config = FormConfig(
+        url="https://example.com/form",
+        fields=[FormField("#name", "Alex"), FormField("#late", "rendered later")],
+        checkboxes=[CheckboxField("#news", checked=False)],
+        selects=[SelectField("#session", "archery")],
+        submit_selector="button",
+        fast_fill=True,
+    )
+    page = FastFillPage(failed=[1, 3])
+
+    _fill_form(page, config)
+
+    assert page.calls[1:] == [
+        (
+            "evaluate",
+            (
+                [
+                    {"kind": "fill", "selector": "#name", "value": "Alex"},
+                    {"kind": "fill", "selector": "#late", "value": "rendered later"},
+                    {"kind": "check", "selector": "#news", "checked": False},
+                    {"kind": "select", "selector": "#session", "value": "archery"},
+                ],
+            ),
+            {},
+        ),
+        ("fill", ("#late", "rendered later"), {}),
+        ("select_option", ("#session", "archery"), {}),
+        ("click", ("button",), {}),
+        ("wait_for_timeout", (2000,), {}),
+    ]
+
+
+class FakeAsyncPage:
+    def __init__(self, pool):
+        self.pool = pool
+
+    async def goto(self, url, **kwargs):
+        self.pool.active += 1
+        self.pool.peak = max(self.pool.peak, self.pool.active)
+        await asyncio.sleep(0.01)
+        self.pool.active -= 1
+        if url.endswith("broken"):
+            raise RuntimeError("page crashed")
+
+
+class FakeContext:
+    def __init__(self, pool):
+        self.pool = pool
+
+    async def new_page(self):
+        return FakeAsyncPage(self.pool)
+
+    async def clear_cookies(self):
+        pass
+
+    async def close(self):
+        self.pool.closed += 1
+
+
+class FakePool:
+    def __init__(self):
+        self.active = self.peak = self.created = self.closed = 0
+
+    async def new_context(self):
+        self.created += 1
+        return FakeContext(self)
+
+
+def test_run_pool_limits_concurrency_and_reports_each_submission():
+    pool = FakePool()
+    pulled = []
+
+    def configs():
+        for index in range(10):
+            pulled.append(index)
+            url = "https://example.com/broken" if index == 3 else f"https://example.com/{index}"
+            yield FormConfig(url=url)
+
+    seen = []
+    results = asyncio.run(_run_pool(configs(), pool.new_context, 3, seen.append))
+
+    assert [result.index for result in results] == list(range(10))
+    assert [result.ok for result in results] == [index != 3 for index in range(10)]
+    assert results[3].error == "RuntimeError: page crashed"
+    assert all(result.elapsed_ms >= 0 for result in results)
+    assert len(seen) == 10
+    assert pool.peak == 3
+    assert pool.created == pool.closed == 3
+
+
+class FlakyPage:
+    # goto fails the first `failures[url]` times; clicking submit on a URL
+    # ending in "timeout" fails after the click went out.
+    def __init__(self, failures, clicks):
+        self.failures = failures
+        self.clicks = clicks
+
+    async def goto(self, url, **kwargs):
+        self.url = url
+        if self.failures.get(url, 0):
+            self.failures[url] -= 1
+            raise TimeoutError("navigation timed out")
+
+    async def fill(self, selector, value, **kwargs):
+        pass
+
+    async def click(self, selector, **kwargs):
+        self.clicks.append(self.url)
+        if self.url.endswith("timeout"):
+            raise TimeoutError("no confirmation")
+
+    async def wait_for_timeout(self, ms):
+        pass
+
+
+class FlakyContext(FakeContext):
+    def __init__(self, failures, clicks):
+        self.failures, self.clicks = failures, clicks
+
+    async def new_page(self):
+        return FlakyPage(self.failures, self.clicks)
+
+    async def close(self):
+        pass
+
+
+def test_run_pool_retries_records_ledger_and_resumes(tmp_path: Path):
+    urls = [f"https://example.com/{name}" for name in ("ok", "flaky", "down", "timeout")]
+    configs = [FormConfig(url=url, submit_selector="button") for url in urls]
+    failures = {urls[1]: 1, urls[2]: 5}
+    clicks = []
+
+    async def new_context():
+        return FlakyContext(failures, clicks)
+
+    ledger_path = tmp_path / "run.ledger"
+    with SubmissionLedger(ledger_path) as ledger:
+        results = asyncio.run(
+            _run_pool(configs, new_context, 2, ledger=ledger, retries=2, backoff_s=0)
+        )
+
+    assert [(result.ok, result.attempts) for result in results] == [
+        (True, 1),
+        (True, 2),
+        (False, 3),
+        (False, 1),
+    ]
+    assert "not retried" in results[3].error
+    assert sorted(clicks) == sorted([urls[0], urls[1], urls[3]])
+
+    failures[urls[2]] = 0
+    clicks.clear()
+    with SubmissionLedger(ledger_path) as ledger:
+        assert ledger.status(submission_key(configs[3])) == "uncertain"
+        results = asyncio.run(_run_pool(configs, new_context, 2, ledger=ledger))
+
+    assert [result.skipped for result in results] == [True, True, False, True]
+    assert results[2].ok
+    assert not results[3].ok
+    assert clicks == [urls[2]]
+
+
+def test_ledger_skips_campers_when_rerun_with_other_settings(tmp_path: Path):
+    configs = [
+        FormConfig(
+            url="https://example.com/ok",
+            fields=[FormField("#name", name)],
+            submit_selector="button",
+        )
+        for name in ("Alex", "Sam")
+    ]
+    clicks = []
+
+    async def new_context():
+        return FlakyContext({}, clicks)
+
+    ledger_path = tmp_path / "run.ledger"
+    with SubmissionLedger(ledger_path) as ledger:
+        asyncio.run(_run_pool(configs, new_context, 2, ledger=ledger))
+    assert len(clicks) == 2
+
+    rerun = [
+        replace(config, fast_fill=True, wait_after_submit_ms=0, success_timeout_ms=60000)
+        for config in configs
+    ]
+    changed = replace(configs[1], fields=[FormField("#name", "Jo")])
+    with SubmissionLedger(ledger_path) as ledger:
+        results = asyncio.run(_run_pool(rerun + [changed], new_context, 2, ledger=ledger))
+
+    assert [result.skipped for result in results] == [True, True, False]
+    assert len(clicks) == 3
+
+
+FORM_HTML = """<!doctype html>
+<form action="/thanks.html" method="get">
+  <input id="name" name="name">
+  <input id="agree" name="agree" type="checkbox" value="yes">
+  <select id="session" name="session">
+    <option value="archery">Archery</option>
+    <option value="hiking">Hiking</option>
+  </select>
+  <button type="submit">Register</button>
+</form>
+"""
+
+
+def test_run_batch_against_local_form(tmp_path: Path, form_site, chromium):
+    base_url, requests = form_site
+    (tmp_path / "form.html").write_text(FORM_HTML, encoding="utf-8")
+    (tmp_path / "thanks.html").write_text("<p>Thanks!</p>", encoding="utf-8")
+    configs = [
+        FormConfig(
+            url=f"{base_url}/form.html",
+            fields=[FormField(selector="#name", value=name)],
+            checkboxes=[CheckboxField(selector="#agree")],
+            selects=[SelectField(selector="#session", value="hiking")],
+            submit_selector="button[type='submit']",
+            wait_after_submit_ms=200,
+        )
+        for name in ("Alex", "Sam", "Jo")
+    ]
+
+    results = run_batch(configs, concurrency=2)
+
+    assert all(result.ok for result in results)
+    submitted = sorted(path for path in requests if path.startswith("/thanks.html"))
+    assert submitted == [
+        f"/thanks.html?name={name}&agree=yes&session=hiking"
+        for name in ("Alex", "Jo", "Sam")
+    ]
+
+
+def test_roster_expands_template_per_camper(tmp_path: Path):
+    registry = CampRegistry()
+    registry.seed([Camper("Alex Camper", 12, "archery"), Camper("Sam", 14, "hiking")])
+    roster = tmp_path / "campers.ndjson"
+    registry.export_ndjson(roster)
+    template = FormConfig(
+        url="https://example.com/register?session={session}",
+        fields=[
+            FormField(selector="#first", value="{first_name}"),
+            FormField(selector="#last", value="{last_name}"),
+            FormField(selector="#age", value="{age}"),
+        ],
+        checkboxes=[CheckboxField(selector="input[value='{session}']")],
+        selects=[SelectField(selector="#session", value="{session}")],
+    )
+
+    configs = iter_roster_configs(template, roster)
+    first = next(configs)
+
+    assert first.url == "https://example.com/register?session=archery"
+    assert [field.value for field in first.fields] == ["Alex", "Camper", "12"]
+    assert first.checkboxes == [CheckboxField(selector="input[value='archery']")]
+    assert first.selects == [SelectField(selector="#session", value="archery")]
+    assert [field.value for field in next(configs).fields] == ["Sam", "", "14"]
+    assert template.fields[0].value == "{first_name}"
+
+
+def test_unknown_placeholder_is_rejected():
+    template = FormConfig(url="https://example.com", fields=[FormField("#x", "{nmae}")])
+
+    with pytest.raises(ValueError, match="Unknown placeholder"):
+        expand_config(template, camper_placeholders({"name": "Alex"}))
+
+
+def test_cli_rejects_unknown_roster_placeholder_before_submitting(
+    tmp_path: Path, capsys
+):
+    template = tmp_path / "template.json"
+    template.write_text(
+        json.dumps(
+            {"url": "https://example.com", "fields": [{"selector": "#x", "value": "{nmae}"}]}
+        ),
+        encoding="utf-8",
+    )
+    roster = tmp_path / "campers.ndjson"
+    CampRegistry().export_ndjson(roster)
+
+    assert main([str(template), "--roster", str(roster)]) == 2
+    assert "Unknown placeholder '{nmae}'" in capsys.readouterr().err
+
+
+def test_event_driven_waits_replace_fixed_sleeps():
+    config = FormConfig(
+        url="https://example.com/form",
+        actions=[
+            ActionStep(kind="click", selector=".next"),
+            ActionStep(kind="wait_for_response", url="**/api/step2", timeout_ms=5000),
+            ActionStep(kind="wait_for_selector", selector="#step2"),
+            ActionStep(kind="wait_for_url", url="**/step2"),
+            ActionStep(kind="wait_for_load_state", timeout_ms=1000),
+        ],
+        submit_selector="button",
+        success_response="**/api/register",
+        success_selector=".confirmation",
+        success_timeout_ms=8000,
+    )
+    page = RecordingPage()
+
+    _fill_form(page, config)
+
+    assert page.calls[1:] == [
+        ("expect_response", ("**/api/step2",), {"timeout": 5000}),
+        ("click", (".next",), {}),
+        ("response_received", ("**/api/step2",), {}),
+        ("wait_for_selector", ("#step2",), {"state": "visible"}),
+        ("wait_for_url", ("**/step2",), {}),
+        ("wait_for_load_state", ("networkidle",), {"timeout": 1000}),
+        ("expect_response", ("**/api/register",), {"timeout": 8000}),
+        ("click", ("button",), {}),
+        ("response_received", ("**/api/register",), {}),
+        ("wait_for_selector", (".confirmation",), {"state": "visible", "timeout": 8000}),
+    ]
+
+
+def test_wait_for_response_must_follow_a_click():
+    config = FormConfig(
+        url="https://example.com/form",
+        actions=[ActionStep(kind="wait_for_response", url="**/api")],
+    )
+
+    with pytest.raises(ValueError, match="must directly follow the click"):
+        _fill_form(RecordingPage(), config)
+
+
+def test_success_selector_against_local_form(tmp_path: Path, form_site, chromium):
+    base_url, requests = form_site
+    (tmp_path / "form.html").write_text(FORM_HTML, encoding="utf-8")
+    (tmp_path / "thanks.html").write_text(
+        '<p class="confirmation">Thanks!</p>', encoding="utf-8"
+    )
+    config = FormConfig(
+        url=f"{base_url}/form.html",
+        fields=[FormField(selector="#name", value="Alex")],
+        submit_selector="button[type='submit']",
+        success_url="**/thanks.html?*",
+        success_selector=".confirmation",
+        success_timeout_ms=5000,
+    )
+
+    results = run_batch([config], concurrency=1)
+
+    assert results[0].ok, results[0].error
+    assert results[0].elapsed_ms < config.wait_after_submit_ms
+    assert any(path.startswith("/thanks.html?name=Alex") for path in requests)
+
+
+def test_fast_fill_script_against_local_form(tmp_path: Path, form_site, chromium):
+    base_url, requests = form_site
+    (tmp_path / "form.html").write_text(FORM_HTML, encoding="utf-8")
+    (tmp_path / "thanks.html").write_text("<p>Thanks!</p>", encoding="utf-8")
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch()
+        page = browser.new_page()
+        page.goto(f"{base_url}/form.html")
+        # React follows checkboxes through click events, not property writes.
+        page.evaluate(
+            "document.querySelector('#agree').addEventListener("
+            "'click', () => { window.agreeClicked = true; })"
+        )
+        failed = page.evaluate(
+            FAST_FILL_SCRIPT,
+            [
+                {"kind": "fill", "selector": "#name", "value": "Alex"},
+                {"kind": "fill", "selector": "#missing", "value": "ignored"},
+                {"kind": "check", "selector": "#agree", "checked": True},
+                {"kind": "select", "selector": "#session", "value": "Hiking"},
+            ],
+        )
+        clicked = page.evaluate("window.agreeClicked === true")
+        page.click("button[type='submit']")
+        page.wait_for_url("**/thanks.html?*")
+        browser.close()
+
+    assert failed == [1]
+    assert clicked
+    assert "/thanks.html?name=Alex&agree=yes&session=hiking" in requests
+
+
+@pytest.mark.parametrize(
+    "data, message",
+    [
+        ({"fields": []}, "url: is required"),
+        ({"url": "x", "feilds": []}, r"unknown key\(s\) 'feilds'"),
+        ({"url": "x", "fields": [{"value": "Alex"}]}, r"fields\[0\].selector: is required"),
+        ({"url": "x", "fields": [{"selector": "#a", "value": 3}]}, "must be a string"),
+        ({"url": "x", "actions": [{"kind": "clik", "selector": "#a"}]}, "unknown action kind"),
+        ({"url": "x", "actions": [{"kind": "click"}]}, "needs 'selector'"),
+        ({"url": "x", "actions": [{"kind": "wait_for_url"}]}, "needs 'url'"),
+        (
+            {"url": "x", "actions": [{"kind": "wait_for_load_state", "state": "idle"}]},
+            "'idle' is not valid",
+        ),
+        ({"url": "x", "actions": [{"kind": "wait_for_response", "url": "*"}]}, "follow a click"),
+        ({"url": "x", "wait_after_submit_ms": -1}, "non-negative integer"),
+        ({"url": "x", "submit_selector": "button[type='submit'"}, "unbalanced '\\[\\]'"),
+        ({"url": "x", "submit_selector": "input[value='it"}, "unterminated quote"),
+        (
+            {
+                "url": "x",
+                "selects": [
+                    {"selector": "#size", "value": "M"},
+                    {"selector": "#size", "value": "L"},
+                ],
+            },
+            r"selects\[1\]: '#size' is already set differently by selects\[0\]",
+        ),
+    ],
+)
+def test_parse_config_rejects_invalid_configs(data, message):
+    with pytest.raises(ConfigError, match=message):
+        parse_config(data)
+
+
+def test_parse_config_normalizes_and_deduplicates_selectors():
+    config = parse_config(
+        {
+            "url": " https://example.com/form ",
+            "fields": [
+                {"selector": "  form   #name ", "value": "Alex"},
+                {"selector": "form #name", "value": "Alex"},
+                {"selector": "input[value='two  spaces']", "value": "x"},
+            ],
+            "checkboxes": [{"selector": "#agree"}, {"selector": "#agree", "checked": True}],
+            "actions": [{"kind": "wait", "wait_ms": None, "selector": None}],
+        }
+    )
+
+    assert config.url == "https://example.com/form"
+    assert [field.selector for field in config.fields] == [
+        "form #name",
+        "input[value='two  spaces']",
+    ]
+    assert config.checkboxes == [CheckboxField("#agree", True)]
+    assert config.actions == [ActionStep(kind="wait")]
+
+
+def test_load_config_caches_by_file_state(tmp_path: Path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"url": "https://example.com/a"}), encoding="utf-8")
+
+    first = load_config(path)
+    assert load_config(path) is first
+
+    os.utime(path, ns=(0, 0))
+    assert load_config(path) is first
+
+    path.write_text(json.dumps({"url": "https://example.com/bb"}), encoding="utf-8")
+    assert load_config(path).url == "https://example.com/bb"
+
+
+def test_cli_rejects_invalid_config_before_starting_a_browser(tmp_path: Path, capsys):
+    path = tmp_path / "config.json"
+    path.write_text(
+        json.dumps({"url": "x", "actions": [{"kind": "submit"}]}), encoding="utf-8"
+    )
+
+    assert main([str(path)]) == 2
+    assert "actions[0].kind: unknown action kind 'submit'" in capsys.readouterr().err